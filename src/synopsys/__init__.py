@@ -1,7 +1,15 @@
 from .__about__ import __version__
 from .aio import EventBus, Play
 from .api import create_bus, create_event, create_flow
-from .entities import Message, Producer, Reply, Service, SimpleReply, Subscriber
+from .entities import (
+    BatchSubscriber,
+    Message,
+    Producer,
+    Reply,
+    Service,
+    SimpleReply,
+    Subscriber,
+)
 from .types import NULL
 
 __all__ = [
@@ -9,6 +17,7 @@ __all__ = [
     "create_bus",
     "create_event",
     "create_flow",
+    "BatchSubscriber",
     "EventBus",
     "Message",
     "Play",
@@ -0,0 +1,97 @@
+import argparse
+import typing as t
+
+from .runner import LOOPS, load_play, load_pubsub
+
+
+def main(argv: t.Optional[t.List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(prog="synopsys")
+    commands = parser.add_subparsers(dest="command", required=True)
+    run_parser = commands.add_parser("run", help="Run a play")
+    run_parser.add_argument("play", help="Play to run, formatted as 'module:attribute'")
+    run_parser.add_argument(
+        "-w",
+        "--workers",
+        type=int,
+        default=None,
+        help="Run a copy of the play within each worker process",
+    )
+    run_parser.add_argument(
+        "--loop",
+        choices=LOOPS,
+        default="auto",
+        help="Event loop used to run the play. uvloop is used by default when installed",
+    )
+    bridge_parser = commands.add_parser(
+        "bridge", help="Republish messages from a pubsub backend on another one"
+    )
+    bridge_parser.add_argument(
+        "source", help="Source pubsub backend, formatted as 'module:attribute'"
+    )
+    bridge_parser.add_argument(
+        "target", help="Target pubsub backend, formatted as 'module:attribute'"
+    )
+    bridge_parser.add_argument(
+        "-r",
+        "--rule",
+        action="append",
+        required=True,
+        help="Subject to bridge, optionally rewritten, formatted as 'source[=target]'. Can be repeated",
+    )
+    bridge_parser.add_argument(
+        "-q", "--queue", default=None, help="Queue group shared by bridges"
+    )
+    bridge_parser.add_argument(
+        "--max-batch",
+        type=int,
+        default=100,
+        help="Maximum number of messages within a batch",
+    )
+    bridge_parser.add_argument(
+        "--max-wait",
+        type=float,
+        default=0,
+        help="Maximum time in seconds to wait for a batch to be full",
+    )
+    bridge_parser.add_argument(
+        "--max-in-flight",
+        type=int,
+        default=1000,
+        help="Maximum number of messages received but not published yet",
+    )
+    bridge_parser.add_argument(
+        "--report-interval",
+        type=float,
+        default=10,
+        help="Time in seconds between two throughput reports",
+    )
+    bridge_parser.add_argument(
+        "--loop",
+        choices=LOOPS,
+        default="auto",
+        help="Event loop used to run the bridge. uvloop is used by default when installed",
+    )
+    args = parser.parse_args(argv)
+    if args.command == "run":
+        load_play(args.play).main(workers=args.workers, loop=args.loop)
+    elif args.command == "bridge":
+        from .aio.bridge import Bridge, BridgeRule
+
+        rules = [
+            BridgeRule(*rule.split("=", 1)) if "=" in rule else BridgeRule(rule)
+            for rule in args.rule
+        ]
+        bridge = Bridge(
+            load_pubsub(args.source),
+            load_pubsub(args.target),
+            rules,
+            queue=args.queue,
+            max_batch=args.max_batch,
+            max_wait=args.max_wait,
+            max_in_flight=args.max_in_flight,
+        )
+        bridge.main(loop=args.loop, report_interval=args.report_interval)
+
+
+if __name__ == "__main__":
+    main()
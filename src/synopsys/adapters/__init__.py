@@ -1,4 +1,10 @@
 from .codec import PseudoJSONCodec
-from .pubsub import InMemoryPubSub, NATSPubSub
+from .pubsub import InMemoryPubSub, NATSPubSub, Route, RoutingPubSub
 
-__all__ = ["PseudoJSONCodec", "InMemoryPubSub", "NATSPubSub"]
+__all__ = [
+    "PseudoJSONCodec",
+    "InMemoryPubSub",
+    "NATSPubSub",
+    "Route",
+    "RoutingPubSub",
+]
@@ -0,0 +1,3 @@
+from .metrics import MetricsInstrumentation
+
+__all__ = ["MetricsInstrumentation"]
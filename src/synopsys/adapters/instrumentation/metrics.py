@@ -0,0 +1,314 @@
+"""Collect metrics about actors of a play.
+
+Metrics are collected in memory with a low overhead: each hook only updates
+a few integers, and handler latencies are recorded within histograms using
+fixed buckets. Metrics can be read using a snapshot, or rendered using the
+Prometheus text exposition format.
+"""
+import typing as t
+from bisect import bisect_left
+from copy import deepcopy
+from dataclasses import dataclass, field
+from time import perf_counter
+
+from ...entities import Actor, Message
+from ...interfaces.instrumentation import PlayInstrumentation
+
+if t.TYPE_CHECKING:
+    from ...aio.play import Play  # pragma: no cover
+
+
+DEFAULT_BUCKETS = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+"""Default upper bounds (in seconds) of latency histogram buckets."""
+
+
+@dataclass
+class Histogram:
+    """A histogram with fixed buckets."""
+
+    buckets: t.Tuple[float, ...] = DEFAULT_BUCKETS
+    """Upper bounds of buckets, sorted in ascending order."""
+
+    counts: t.List[int] = field(default_factory=list)
+    """Number of observations within each bucket. Last item counts observations above last bucket."""
+
+    count: int = 0
+    """Total number of observations."""
+
+    sum: float = 0
+    """Sum of all observations."""
+
+    def __post_init__(self) -> None:
+        if list(self.buckets) != sorted(self.buckets):
+            raise ValueError("Histogram buckets must be sorted in ascending order")
+        if not self.counts:
+            self.counts = [0] * (len(self.buckets) + 1)
+
+    def observe(self, value: float) -> None:
+        """Record a new observation."""
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def cumulative(self) -> t.List[t.Tuple[float, int]]:
+        """Return a list of (upper bound, cumulative count), ending with infinite upper bound."""
+        total = 0
+        result: t.List[t.Tuple[float, int]] = []
+        for bound, count in zip((*self.buckets, float("inf")), self.counts):
+            total += count
+            result.append((bound, total))
+        return result
+
+    def quantile(self, q: float) -> float:
+        """Estimate a quantile using the upper bound of the bucket holding it.
+
+        Returns 0 when no value was observed, and infinity when quantile
+        is above last bucket.
+        """
+        if not 0 <= q <= 1:
+            raise ValueError("Quantile must be between 0 and 1")
+        if self.count == 0:
+            return 0
+        rank = q * self.count
+        for bound, total in self.cumulative():
+            if total >= rank:
+                return bound
+        return float("inf")  # pragma: no cover
+
+
+@dataclass
+class ActorMetrics:
+    """Metrics collected for a single actor."""
+
+    actor: str
+    """Name of the actor flow."""
+
+    kind: str
+    """Kind of actor, e.g. 'subscriber' or 'service'."""
+
+    received: int = 0
+    """Number of messages received."""
+
+    processed: int = 0
+    """Number of messages processed successfully."""
+
+    failed: int = 0
+    """Number of messages which could not be processed."""
+
+    in_flight: int = 0
+    """Number of messages currently processed."""
+
+    dropped: int = 0
+    """Number of messages dropped by actor predicates before being decoded."""
+
+    latency: Histogram = field(default_factory=Histogram)
+    """Handler latency in seconds, for both processed and failed messages."""
+
+    delivery_delay: Histogram = field(default_factory=Histogram)
+    """Time in seconds elapsed between publication and processing start.
+
+    Only messages published by a bus tracking latency are observed.
+    """
+
+
+class MetricsInstrumentation(PlayInstrumentation):
+    """Play instrumentation collecting per-actor counters, gauges and latency histograms.
+
+    Example:
+
+    ```python
+    metrics = MetricsInstrumentation()
+    play = Play(bus, actors, instrumentation=metrics)
+    ...
+    print(metrics.render_prometheus())
+    ```
+    """
+
+    def __init__(
+        self, buckets: t.Tuple[float, ...] = DEFAULT_BUCKETS, prefix: str = "synopsys"
+    ) -> None:
+        """Create a new metrics instrumentation.
+
+        Arguments:
+            buckets: Upper bounds (in seconds) of latency histogram buckets.
+            prefix: Prefix of metric names when rendered using Prometheus text format.
+        """
+        self.buckets = tuple(buckets)
+        self.prefix = prefix
+        # Actors are not hashable, so metrics are indexed by actor id
+        self._metrics: t.Dict[int, ActorMetrics] = {}
+        # Start time of messages being processed, indexed by (actor id, message id)
+        self._started: t.Dict[t.Tuple[int, int], float] = {}
+
+    def _get_metrics(self, actor: Actor) -> ActorMetrics:
+        try:
+            return self._metrics[id(actor)]
+        except KeyError:
+            flow = getattr(actor, "flow", None)
+            metrics = self._metrics[id(actor)] = ActorMetrics(
+                actor=getattr(flow, "name", type(actor).__name__),
+                kind=_get_kind(actor),
+                latency=Histogram(self.buckets),
+                delivery_delay=Histogram(self.buckets),
+            )
+            return metrics
+
+    def _observe_done(
+        self, actor: Actor, msg: Message[t.Any, t.Any, t.Any, t.Any, t.Any]
+    ) -> ActorMetrics:
+        end = perf_counter()
+        metrics = self._get_metrics(actor)
+        start = self._started.pop((id(actor), id(msg)), None)
+        if start is not None:
+            metrics.in_flight -= 1
+            metrics.latency.observe(end - start)
+        return metrics
+
+    def actor_starting(self, play: "Play", actor: Actor) -> None:
+        self._get_metrics(actor)
+
+    def event_received(
+        self,
+        play: "Play",
+        actor: Actor,
+        msg: Message[t.Any, t.Any, t.Any, t.Any, t.Any],
+    ) -> None:
+        metrics = self._get_metrics(actor)
+        metrics.received += 1
+        metrics.in_flight += 1
+        self._started[(id(actor), id(msg))] = perf_counter()
+
+    def event_delivered(
+        self,
+        play: "Play",
+        actor: Actor,
+        msg: Message[t.Any, t.Any, t.Any, t.Any, t.Any],
+        delay: float,
+    ) -> None:
+        self._get_metrics(actor).delivery_delay.observe(delay)
+
+    def event_processed(
+        self,
+        play: "Play",
+        actor: Actor,
+        msg: Message[t.Any, t.Any, t.Any, t.Any, t.Any],
+    ) -> None:
+        self._observe_done(actor, msg).processed += 1
+
+    def event_processing_failed(
+        self,
+        play: "Play",
+        actor: Actor,
+        msg: Message[t.Any, t.Any, t.Any, t.Any, t.Any],
+        exc: BaseException,
+    ) -> None:
+        self._observe_done(actor, msg).failed += 1
+
+    def event_dropped(self, play: "Play", actor: Actor, subject: str) -> None:
+        self._get_metrics(actor).dropped += 1
+
+    def snapshot(self) -> t.List[ActorMetrics]:
+        """Return a copy of metrics collected for each actor."""
+        return [deepcopy(metrics) for metrics in self._metrics.values()]
+
+    def reset(self) -> None:
+        """Reset all metrics. Messages currently processed are not observed."""
+        self._metrics.clear()
+        self._started.clear()
+
+    def render_prometheus(self) -> str:
+        """Render metrics using Prometheus text exposition format."""
+        prefix = self.prefix
+        snapshot = self.snapshot()
+        lines: t.List[str] = []
+        for name, kind, help, attribute in (
+            (
+                "messages_received_total",
+                "counter",
+                "Number of messages received.",
+                "received",
+            ),
+            (
+                "messages_processed_total",
+                "counter",
+                "Number of messages processed successfully.",
+                "processed",
+            ),
+            (
+                "messages_failed_total",
+                "counter",
+                "Number of messages which could not be processed.",
+                "failed",
+            ),
+            (
+                "messages_dropped_total",
+                "counter",
+                "Number of messages dropped by actor predicates before being decoded.",
+                "dropped",
+            ),
+            (
+                "messages_in_flight",
+                "gauge",
+                "Number of messages currently processed.",
+                "in_flight",
+            ),
+        ):
+            lines.append(f"# HELP {prefix}_{name} {help}")
+            lines.append(f"# TYPE {prefix}_{name} {kind}")
+            for metrics in snapshot:
+                labels = _render_labels(metrics)
+                lines.append(
+                    f"{prefix}_{name}{{{labels}}} {getattr(metrics, attribute)}"
+                )
+        for name, help, attribute in (
+            ("handler_duration_seconds", "Handler latency in seconds.", "latency"),
+            (
+                "delivery_delay_seconds",
+                "Time in seconds elapsed between publication and processing start.",
+                "delivery_delay",
+            ),
+        ):
+            name = f"{prefix}_{name}"
+            lines.append(f"# HELP {name} {help}")
+            lines.append(f"# TYPE {name} histogram")
+            for metrics in snapshot:
+                labels = _render_labels(metrics)
+                histogram: Histogram = getattr(metrics, attribute)
+                for bound, total in histogram.cumulative():
+                    le = "+Inf" if bound == float("inf") else repr(bound)
+                    lines.append(f'{name}_bucket{{{labels},le="{le}"}} {total}')
+                lines.append(f"{name}_sum{{{labels}}} {histogram.sum}")
+                lines.append(f"{name}_count{{{labels}}} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+
+def _get_kind(actor: Actor) -> str:
+    """Get kind of actor, e.g. 'batch_subscriber' for BatchSubscriber."""
+    name = type(actor).__name__
+    return "".join(
+        f"_{char.lower()}" if char.isupper() and idx else char.lower()
+        for idx, char in enumerate(name)
+    )
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _render_labels(metrics: ActorMetrics) -> str:
+    return f'actor="{_escape(metrics.actor)}",kind="{_escape(metrics.kind)}"'
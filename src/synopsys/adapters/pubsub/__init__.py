@@ -1,4 +1,5 @@
 from .memory import InMemoryPubSub
 from .nats import NATSPubSub
+from .routing import Route, RoutingPubSub
 
-__all__ = ["InMemoryPubSub", "NATSPubSub"]
+__all__ = ["InMemoryPubSub", "NATSPubSub", "Route", "RoutingPubSub"]
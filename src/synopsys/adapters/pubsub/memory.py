@@ -1,10 +1,16 @@
 import logging
+import math
 import typing as t
 from contextlib import asynccontextmanager
 from dataclasses import dataclass
 from secrets import token_hex
 
-from anyio import ClosedResourceError, create_memory_object_stream
+from anyio import (
+    ClosedResourceError,
+    create_memory_object_stream,
+    current_time,
+    move_on_after,
+)
 
 from synopsys.entities.syntax import SubjectSyntax
 from synopsys.errors import BusDisconnectedError, SubscriptionClosedError
@@ -41,9 +47,11 @@ class InMemoryMsg(PubSubMsg):
 
 
 class _Observer:
-    def __init__(self, subject: str, syntax: SubjectSyntax) -> None:
+    def __init__(
+        self, subject: str, syntax: SubjectSyntax, max_buffer_size: float = 1
+    ) -> None:
         self._send, self._receive = create_memory_object_stream(
-            max_buffer_size=1, item_type=InMemoryMsg
+            max_buffer_size=max_buffer_size, item_type=InMemoryMsg
         )
         self.subject = subject
         self.syntax = syntax
@@ -139,6 +147,54 @@ class InMemoryPubSub(PubSubBackend):
         finally:
             self.observers.remove(observer)
 
+    @asynccontextmanager
+    async def request_many(
+        self,
+        subject: str,
+        payload: bytes,
+        headers: t.Dict[str, str],
+        max_replies: t.Optional[int] = None,
+        timeout: t.Optional[float] = None,
+    ) -> t.AsyncIterator[t.AsyncIterator[InMemoryMsg]]:
+        """Request an event and iterate over replies.
+
+        Replies are buffered without limit so that responders never wait
+        for the requester.
+        """
+        if self._closed:
+            raise BusDisconnectedError()
+        reply_subject: str = token_hex(16)
+        req = InMemoryMsg(subject, payload, headers, reply_subject)
+        observer = _Observer(reply_subject, self.syntax, max_buffer_size=math.inf)
+        self.observers.append(observer)
+
+        async def iterator() -> t.AsyncIterator[InMemoryMsg]:
+            deadline = None if timeout is None else current_time() + timeout
+            received = 0
+            while max_replies is None or received < max_replies:
+                remaining = None if deadline is None else deadline - current_time()
+                with move_on_after(remaining) as scope:
+                    try:
+                        msg = await observer.receive()
+                    except ClosedResourceError:
+                        raise SubscriptionClosedError()
+                if scope.cancel_called:
+                    return
+                received += 1
+                yield msg
+
+        try:
+            await self.__notify_msg(req)
+            yield iterator()
+        finally:
+            try:
+                await observer._receive.aclose()
+                await observer._send.aclose()
+            except ClosedResourceError:
+                pass
+            finally:
+                self.observers.remove(observer)
+
     @asynccontextmanager
     async def subscribe(
         self, subject: str, queue: t.Optional[str] = None, reply: bool = False
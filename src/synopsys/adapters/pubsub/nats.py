@@ -5,6 +5,7 @@ from dataclasses import dataclass
 
 from nats.aio.client import Client as NATSClient
 from nats.aio.msg import Msg
+from nats.errors import ConnectionClosedError
 
 from synopsys.errors import BusDisconnectedError, SubscriptionClosedError
 from synopsys.interfaces import PubSubBackend, PubSubMsg
@@ -78,6 +79,48 @@ class NATSPubSub(PubSubBackend):
         )
         return NATSMsg(reply)
 
+    @asynccontextmanager
+    async def request_many(
+        self,
+        subject: str,
+        payload: bytes,
+        headers: t.Dict[str, str],
+        max_replies: t.Optional[int] = None,
+        timeout: t.Optional[float] = None,
+    ) -> t.AsyncIterator[t.AsyncIterator[NATSMsg]]:
+        """Send a request on given subject and iterate over replies received on a single inbox."""
+        if self.nc.is_closed or self.nc.is_draining:
+            raise BusDisconnectedError()
+        inbox = self.nc.new_inbox()
+        # Subscribe to inbox before publishing to avoid missing replies
+        sub = await self.nc.subscribe(subject=inbox)
+        loop = asyncio.get_running_loop()
+
+        async def iterator() -> t.AsyncIterator[NATSMsg]:
+            deadline = None if timeout is None else loop.time() + timeout
+            received = 0
+            while max_replies is None or received < max_replies:
+                remaining = None if deadline is None else deadline - loop.time()
+                if remaining is not None and remaining <= 0:
+                    return
+                try:
+                    msg = await sub.next_msg(timeout=remaining)
+                except asyncio.TimeoutError:
+                    return
+                except ConnectionClosedError as exc:
+                    raise SubscriptionClosedError() from exc
+                received += 1
+                yield NATSMsg(msg)
+
+        try:
+            await self.nc.publish(
+                subject=subject, payload=payload, reply=inbox, headers=headers
+            )
+            yield iterator()
+        finally:
+            if not self.nc.is_closed:
+                await sub.unsubscribe()
+
     @asynccontextmanager
     async def subscribe(
         self, subject: str, queue: t.Optional[str] = None, reply: bool = False
@@ -44,6 +44,7 @@ class RedisPubSub(PubSubBackend):
         self._reply_prefix = f"$REPLY.{prefix}"
         self._reply_channel = self.redis.pubsub()
         self._reply_map: t.Dict[str, asyncio.Future[RedisMsg]] = {}
+        self._reply_queues: t.Dict[str, asyncio.Queue[RedisMsg]] = {}
         self._reply_process_task: t.Optional[asyncio.Task[None]] = None
         self._closed = False
 
@@ -55,11 +56,15 @@ class RedisPubSub(PubSubBackend):
         subject = msg.get_subject()
         if not subject:
             return
-        # Check and set reply future
-        if self._reply_map and not self._reply_map[subject].done():
-            self._reply_map[subject].set_result(msg)
-        # Pop reply future
-        self._reply_map.pop(subject, None)
+        # Push reply into queue when several replies are expected
+        queue = self._reply_queues.get(subject)
+        if queue is not None:
+            queue.put_nowait(msg)
+            return
+        # Replies received after requester stopped waiting are dropped
+        future = self._reply_map.pop(subject, None)
+        if future is not None and not future.done():
+            future.set_result(msg)
 
     async def connect(self) -> None:
         """A subscription the a reply channel with random prefix is established
@@ -125,6 +130,49 @@ class RedisPubSub(PubSubBackend):
             if not future.done():
                 future.cancel()
             raise
+        finally:
+            self._reply_map.pop(reply_subject, None)
+
+    @asynccontextmanager
+    async def request_many(
+        self,
+        subject: str,
+        payload: bytes,
+        headers: t.Dict[str, str],
+        max_replies: t.Optional[int] = None,
+        timeout: t.Optional[float] = None,
+    ) -> t.AsyncIterator[t.AsyncIterator[RedisMsg]]:
+        if self._closed:
+            raise BusDisconnectedError()
+        if headers:
+            warnings.warn("Using headers is not supported with redis")
+        reply_token = token_hex(12)
+        reply_subject = f"{self._reply_prefix}.{reply_token}"
+        subject = f"{subject}.{reply_subject}"
+        # Create a new queue and save it in reply queues
+        queue: asyncio.Queue[RedisMsg] = asyncio.Queue()
+        self._reply_queues[reply_subject] = queue
+        loop = asyncio.get_running_loop()
+
+        async def iterator() -> t.AsyncIterator[RedisMsg]:
+            deadline = None if timeout is None else loop.time() + timeout
+            received = 0
+            while max_replies is None or received < max_replies:
+                remaining = None if deadline is None else deadline - loop.time()
+                if remaining is not None and remaining <= 0:
+                    return
+                try:
+                    msg = await asyncio.wait_for(queue.get(), remaining)
+                except asyncio.TimeoutError:
+                    return
+                received += 1
+                yield msg
+
+        try:
+            await self.redis.publish(subject, message=payload)
+            yield iterator()
+        finally:
+            self._reply_queues.pop(reply_subject, None)
 
     @asynccontextmanager
     async def subscribe(
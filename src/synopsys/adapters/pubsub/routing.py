@@ -0,0 +1,492 @@
+"""Route messages between in-process subscribers and remote pubsub backends.
+
+Messages published by a process are delivered to subscribers of the same process
+without leaving the process, using an in-memory backend. Messages are sent to a
+remote backend only when required by the route matching their subject, either
+always, or when another process subscribed to the subject.
+
+Processes using a routing backend announce the subjects they subscribe to on a
+control subject of each remote backend, so that each process knows which
+subjects have remote interest.
+"""
+import asyncio
+import json
+import logging
+import typing as t
+from collections import Counter, OrderedDict
+from contextlib import AsyncExitStack, asynccontextmanager
+from dataclasses import dataclass
+from functools import partial
+from secrets import token_hex
+
+from synopsys.entities.syntax import SubjectSyntax
+from synopsys.interfaces.pubsub import PubSubBackend, PubSubMsg
+from synopsys.operations.streams import iterate_until
+from synopsys.operations.subjects import match_subject
+
+from .memory import InMemoryMsg, InMemoryPubSub
+
+logger = logging.getLogger("pubsub.routing")
+
+INTEREST_SUBJECT = "_SYNOPSYS.interest"
+"""Control subject used to announce subscriptions to other processes."""
+
+ORIGIN_HEADER = "Synopsys-Origin"
+"""Header holding the ID of the routing backend which published a message."""
+
+REMOTE_MODES = ("interest", "always")
+"""Modes of routes sending messages to a remote backend."""
+
+
+@dataclass
+class Route:
+    """Route messages published on subjects starting with a prefix."""
+
+    prefix: str
+    """Subject prefix, matched token by token: prefix 'orders' matches subjects
+    'orders' and 'orders.created', but not 'ordersfoo.created'. An empty prefix
+    matches all subjects."""
+
+    backend: t.Optional[PubSubBackend] = None
+    """The remote backend. When None, messages never leave the process."""
+
+    remote: str = "interest"
+    """When to send messages to the remote backend. Use 'interest' to send messages
+    only when another process subscribed to the subject, or 'always' to send
+    all messages, for example when subscribers do not use a routing backend."""
+
+    def __post_init__(self) -> None:
+        if self.remote not in REMOTE_MODES:
+            raise ValueError(
+                f"Invalid remote mode: '{self.remote}'. Expected one of {list(REMOTE_MODES)}"
+            )
+
+
+class _Link:
+    """Subscriptions and remote interest of a remote backend."""
+
+    def __init__(self, backend: PubSubBackend, max_cache: int) -> None:
+        self.backend = backend
+        # Subjects subscribed by this process on remote backend
+        self.subjects: t.Counter[str] = Counter()
+        # Subjects subscribed by queue subscribers and services of this process,
+        # which only receive messages from remote backend
+        self.remote_only: t.Counter[str] = Counter()
+        # Subjects subscribed by other processes, by process ID
+        self.peers: t.Dict[str, t.List[str]] = {}
+        # Remote interest by published subject, from least to most recently used
+        self.cache: "OrderedDict[str, bool]" = OrderedDict()
+        self.max_cache = max_cache
+        # True when remote interest is not tracked anymore
+        self.stale = False
+        self.task: t.Optional["asyncio.Task[None]"] = None
+        self.announces: t.Set["asyncio.Task[None]"] = set()
+
+
+class RoutingPubSub(PubSubBackend):
+    """A pubsub backend composing an in-memory backend with remote backends.
+
+    The route with the longest prefix matching a subject is used. Subjects which
+    do not match any route are local to the process. Subscriptions using a filter
+    subject are made on each remote backend whose route may match a subject
+    matched by the filter.
+
+    - Published messages are delivered to subscribers of the process without leaving
+    the process, and sent to the remote backend when route requires it.
+    - Subscribers receive messages published within the process, and messages published
+    by other processes on the remote backend.
+    - Queue subscribers, services and requests always use the remote backend, so that
+    each message is processed once within a queue group.
+    """
+
+    def __init__(
+        self,
+        routes: t.Sequence[Route],
+        syntax: t.Optional[SubjectSyntax] = None,
+        max_pending_replies: int = 10000,
+        max_interest_cache: int = 10000,
+    ) -> None:
+        """Create a new routing backend.
+
+        Arguments:
+            routes: Routes used to select the remote backend of a subject.
+            syntax: Syntax of subjects. By default, NATS syntax is used.
+            max_pending_replies: Maximum number of requests received from a remote
+                backend waiting for a reply.
+            max_interest_cache: Maximum number of published subjects whose remote
+                interest is cached, for each remote backend.
+        """
+        self.id = token_hex(8)
+        self.syntax = syntax or SubjectSyntax()
+        self.local = InMemoryPubSub(self.syntax)
+        # Longest prefixes first
+        prefixes = [
+            (_split_prefix(route.prefix, self.syntax), route) for route in routes
+        ]
+        prefixes.sort(key=lambda item: len(item[0]), reverse=True)
+        self._prefixes = [tokens for tokens, _ in prefixes]
+        self.routes = [route for _, route in prefixes]
+        self.max_pending_replies = max_pending_replies
+        self._links: t.Dict[int, _Link] = {}
+        for route in self.routes:
+            if route.backend is not None:
+                self._links.setdefault(
+                    id(route.backend), _Link(route.backend, max_interest_cache)
+                )
+        # Remote backend of requests received from other processes, by reply subject
+        self._replies: "OrderedDict[str, PubSubBackend]" = OrderedDict()
+        self._connected = False
+
+    def _get_route(self, subject: str) -> t.Optional[Route]:
+        tokens = subject.split(self.syntax.match_sep)
+        for prefix, route in zip(self._prefixes, self.routes):
+            if _match_prefix(prefix, tokens, self.syntax):
+                return route
+        return None
+
+    def _get_links(self, subject: str) -> t.List[_Link]:
+        """Get links of remote backends which may receive messages matched by a filter subject."""
+        tokens = subject.split(self.syntax.match_sep)
+        links: t.Dict[int, _Link] = {}
+        for prefix, route in zip(self._prefixes, self.routes):
+            matches = _match_prefix(prefix, tokens, self.syntax)
+            if matches is None:
+                continue
+            if route.backend is not None:
+                links.setdefault(id(route.backend), self._links[id(route.backend)])
+            # Shorter routes are never used for subjects all matching this route
+            if matches:
+                break
+        return list(links.values())
+
+    def _get_link(self, subject: str) -> t.Tuple[t.Optional[Route], t.Optional[_Link]]:
+        route = self._get_route(subject)
+        if route is None or route.backend is None:
+            return route, None
+        return route, self._links[id(route.backend)]
+
+    def has_interest(self, subject: str) -> bool:
+        """Check if a subscriber of another process, or a queue subscriber, may receive messages published on subject.
+
+        When subscriptions of other processes cannot be tracked anymore, interest is
+        assumed, so that messages are not lost.
+        """
+        _, link = self._get_link(subject)
+        if link is None:
+            return False
+        if link.stale:
+            return True
+        try:
+            interest = link.cache[subject]
+        except KeyError:
+            interest = any(
+                match_subject(filter, subject, self.syntax)
+                for filters in (*link.peers.values(), link.remote_only)
+                for filter in filters
+            )
+            link.cache[subject] = interest
+            if len(link.cache) > link.max_cache:
+                link.cache.popitem(last=False)
+        else:
+            link.cache.move_to_end(subject)
+        return interest
+
+    async def publish(
+        self,
+        subject: str,
+        payload: bytes,
+        headers: t.Dict[str, str],
+        timeout: t.Optional[float] = None,
+    ) -> None:
+        """Publish a message to local subscribers, and to remote backend when required."""
+        backend = self._replies.pop(subject, None)
+        if backend is not None:
+            # Reply to a request received from a remote backend
+            await backend.publish(subject, payload, headers, timeout)
+            return
+        route, link = self._get_link(subject)
+        await self.local.publish(subject, payload, headers, timeout)
+        if link is None or route is None:
+            return
+        if route.remote == "always" or self.has_interest(subject):
+            await link.backend.publish(
+                subject, payload, {**headers, ORIGIN_HEADER: self.id}, timeout
+            )
+
+    async def request(
+        self,
+        subject: str,
+        payload: bytes,
+        headers: t.Dict[str, str],
+        timeout: t.Optional[float] = None,
+    ) -> PubSubMsg:
+        """Send a request using the backend of the subject route."""
+        _, link = self._get_link(subject)
+        if link is None:
+            return await self.local.request(subject, payload, headers, timeout)
+        return await link.backend.request(subject, payload, headers, timeout)
+
+    def request_many(
+        self,
+        subject: str,
+        payload: bytes,
+        headers: t.Dict[str, str],
+        max_replies: t.Optional[int] = None,
+        timeout: t.Optional[float] = None,
+    ) -> t.AsyncContextManager[t.AsyncIterator[PubSubMsg]]:
+        """Send a request using the backend of the subject route and iterate over replies."""
+        _, link = self._get_link(subject)
+        backend = self.local if link is None else link.backend
+        return backend.request_many(subject, payload, headers, max_replies, timeout)
+
+    @asynccontextmanager
+    async def subscribe(
+        self, subject: str, queue: t.Optional[str] = None, reply: bool = False
+    ) -> t.AsyncIterator[t.AsyncIterator[PubSubMsg]]:
+        """Subscribe to messages published within the process and on remote backends."""
+        links = self._get_links(subject)
+        if not links:
+            async with self.local.subscribe(subject, queue, reply) as subscription:
+                yield subscription
+            return
+        remote_only = bool(queue or reply)
+        for link in links:
+            await self._add_interest(link, subject, remote_only)
+        try:
+            async with AsyncExitStack() as stack:
+                sources: t.List[t.AsyncIterator[PubSubMsg]] = []
+                if not remote_only:
+                    sources.append(
+                        await stack.enter_async_context(self.local.subscribe(subject))
+                    )
+                for link in links:
+                    remote_subscription = await stack.enter_async_context(
+                        link.backend.subscribe(subject, queue, reply)
+                    )
+                    sources.append(
+                        self._receive(
+                            link, remote_subscription, drop_own=not remote_only
+                        )
+                    )
+                if len(sources) == 1:
+                    yield sources[0]
+                else:
+                    yield await stack.enter_async_context(_merge(*sources))
+        finally:
+            for link in links:
+                await self._remove_interest(link, subject, remote_only)
+
+    async def _receive(
+        self,
+        link: _Link,
+        subscription: t.AsyncIterator[PubSubMsg],
+        drop_own: bool,
+    ) -> t.AsyncIterator[PubSubMsg]:
+        """Receive messages from a remote backend."""
+        async for msg in subscription:
+            headers = msg.get_headers()
+            origin = headers.get(ORIGIN_HEADER)
+            # Message was already delivered within the process which published it
+            if drop_own and origin == self.id:
+                continue
+            reply_subject = msg.get_reply_subject()
+            if reply_subject is not None:
+                # Reply must be sent using the backend the request was received from
+                self._replies[reply_subject] = link.backend
+                while len(self._replies) > self.max_pending_replies:
+                    self._replies.popitem(last=False)
+            if origin is None:
+                yield msg
+                continue
+            yield InMemoryMsg(
+                msg.get_subject(),
+                msg.get_payload(),
+                {key: value for key, value in headers.items() if key != ORIGIN_HEADER},
+                reply_subject,
+            )
+
+    async def _add_interest(self, link: _Link, subject: str, remote_only: bool) -> None:
+        if remote_only:
+            link.remote_only[subject] += 1
+            link.cache.clear()
+        link.subjects[subject] += 1
+        if link.subjects[subject] == 1:
+            await self._announce(link, "state")
+
+    async def _remove_interest(
+        self, link: _Link, subject: str, remote_only: bool
+    ) -> None:
+        if remote_only:
+            link.remote_only[subject] -= 1
+            if link.remote_only[subject] <= 0:
+                del link.remote_only[subject]
+            link.cache.clear()
+        link.subjects[subject] -= 1
+        if link.subjects[subject] <= 0:
+            del link.subjects[subject]
+            await self._announce(link, "state")
+
+    async def _announce(self, link: _Link, op: str) -> None:
+        """Publish subjects subscribed by this process on remote backend."""
+        if not self._connected:
+            return
+        payload = {"op": op, "id": self.id, "subjects": list(link.subjects)}
+        try:
+            await link.backend.publish(
+                INTEREST_SUBJECT, json.dumps(payload).encode("utf-8"), {}
+            )
+        except Exception as exc:
+            logger.error("Failed to announce subscriptions", exc_info=exc)
+
+    async def _watch(self, link: _Link, ready: "asyncio.Future[None]") -> None:
+        """Track subjects subscribed by other processes."""
+        async with link.backend.subscribe(INTEREST_SUBJECT) as subscription:
+            ready.set_result(None)
+            async for msg in iterate_until(subscription, lambda: link.task is None):
+                try:
+                    announce = json.loads(msg.get_payload())
+                    peer, op = announce["id"], announce["op"]
+                except Exception as exc:
+                    logger.error("Invalid announce", exc_info=exc)
+                    continue
+                if peer == self.id:
+                    continue
+                if op == "bye":
+                    link.peers.pop(peer, None)
+                else:
+                    link.peers[peer] = announce["subjects"]
+                link.cache.clear()
+                # Newcomers must learn subscriptions of existing processes.
+                # Announce in background, so that watcher never waits for other watchers.
+                if op == "hello":
+                    task = asyncio.create_task(self._announce(link, "state"))
+                    link.announces.add(task)
+                    task.add_done_callback(link.announces.discard)
+
+    def _watch_done(self, link: _Link, task: "asyncio.Task[None]") -> None:
+        """Detect a watcher stopped while backend is connected."""
+        if link.task is not task:
+            return
+        link.task = None
+        link.stale = True
+        link.cache.clear()
+        exc = None if task.cancelled() else task.exception()
+        logger.error(
+            "Stopped tracking remote interest, messages are now always sent to remote backend",
+            exc_info=exc,
+        )
+
+    async def connect(self) -> None:
+        """Connect remote backends and announce subscriptions."""
+        await self.local.connect()
+        loop = asyncio.get_running_loop()
+        for link in self._links.values():
+            await link.backend.connect()
+            ready: "asyncio.Future[None]" = loop.create_future()
+            link.task = asyncio.create_task(self._watch(link, ready))
+            # Wait until subscription is started, or failed to start
+            await asyncio.wait([ready, link.task], return_when=asyncio.FIRST_COMPLETED)
+            if not ready.done():
+                task, link.task = link.task, None
+                # Raise the exception of the watcher, if any
+                task.result()
+                raise RuntimeError("Failed to track remote interest")
+            link.stale = False
+            link.task.add_done_callback(partial(self._watch_done, link))
+        self._connected = True
+        for link in self._links.values():
+            await self._announce(link, "hello")
+
+    async def disconnect(self) -> None:
+        """Stop tracking remote interest, announce departure and disconnect all backends."""
+        for link in self._links.values():
+            tasks = [*link.announces]
+            if link.task is not None:
+                tasks.append(link.task)
+                link.task = None
+            for task in tasks:
+                task.cancel()
+            if tasks:
+                await asyncio.wait(tasks)
+            if self._connected:
+                await self._announce(link, "bye")
+        self._connected = False
+        for link in self._links.values():
+            await link.backend.disconnect()
+        await self.local.disconnect()
+
+
+@asynccontextmanager
+async def _merge(
+    *sources: t.AsyncIterator[PubSubMsg],
+) -> t.AsyncIterator[t.AsyncIterator[PubSubMsg]]:
+    """Merge several async iterators into a single async iterator.
+
+    Merged iterator ends once all iterators ended.
+    """
+    # None is put once a source ended
+    queue: "asyncio.Queue[t.Union[PubSubMsg, BaseException, None]]" = asyncio.Queue(1)
+    closed = False
+
+    async def pump(source: t.AsyncIterator[PubSubMsg]) -> None:
+        try:
+            async for item in iterate_until(source, lambda: closed):
+                await queue.put(item)
+        except Exception as exc:
+            await queue.put(exc)
+        else:
+            await queue.put(None)
+
+    async def iterator() -> t.AsyncIterator[PubSubMsg]:
+        running = len(sources)
+        while running:
+            item = await queue.get()
+            if item is None:
+                running -= 1
+                continue
+            if isinstance(item, BaseException):
+                raise item
+            yield item
+
+    tasks = [asyncio.create_task(pump(source)) for source in sources]
+    try:
+        yield iterator()
+    finally:
+        closed = True
+        for task in tasks:
+            task.cancel()
+        await asyncio.wait(tasks)
+
+
+def _split_prefix(prefix: str, syntax: SubjectSyntax) -> t.List[str]:
+    """Get tokens of a route prefix, ignoring a trailing separator."""
+    if prefix.endswith(syntax.match_sep):
+        prefix = prefix[: -len(syntax.match_sep)]
+    return prefix.split(syntax.match_sep) if prefix else []
+
+
+def _match_prefix(
+    prefix: t.List[str], tokens: t.List[str], syntax: SubjectSyntax
+) -> t.Optional[bool]:
+    """Check if subjects matched by a filter subject start with a route prefix.
+
+    Arguments:
+        prefix: Tokens of the route prefix.
+        tokens: Tokens of the filter subject.
+        syntax: Syntax of subjects.
+
+    Returns:
+        True when all matched subjects start with prefix, False when some matched
+        subjects may start with prefix, and None when no matched subject does.
+    """
+    matches = True
+    for idx, token in enumerate(prefix):
+        if idx >= len(tokens):
+            return None
+        if tokens[idx] == syntax.match_all:
+            return False
+        if tokens[idx] == syntax.match_one:
+            matches = False
+        elif tokens[idx] != token:
+            return None
+    return matches
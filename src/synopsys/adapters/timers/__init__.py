@@ -0,0 +1,3 @@
+from .file import FileTimerStore
+
+__all__ = ["FileTimerStore"]
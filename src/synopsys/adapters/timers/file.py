@@ -0,0 +1,93 @@
+import base64
+import json
+import os
+import typing as t
+from pathlib import Path
+
+from ...interfaces.timers import TimerStore
+
+if t.TYPE_CHECKING:
+    from ...aio.timers import ScheduledMessage  # pragma: no cover
+
+
+class FileTimerStore(TimerStore):
+    """Persist scheduled messages within an append-only file, writing one JSON object per line.
+
+    Each scheduled message appends an "add" record, and each published or cancelled
+    message appends a "remove" record, so that writes never rewrite the file.
+    The file is compacted when pending messages are loaded.
+    """
+
+    def __init__(self, path: t.Union[str, Path], fsync: bool = False) -> None:
+        """Create a new store.
+
+        Arguments:
+            path: Path to the file.
+            fsync: When True, file is synced to disk after each write.
+        """
+        self.path = Path(path)
+        self.fsync = fsync
+        self._file: t.Optional[t.TextIO] = None
+
+    def _write(self, record: t.Dict[str, t.Any]) -> None:
+        if self._file is None:
+            self._file = self.path.open("a", encoding="utf-8")
+        self._file.write(json.dumps(record))
+        self._file.write("\n")
+        self._file.flush()
+        if self.fsync:
+            os.fsync(self._file.fileno())
+
+    def add(self, message: "ScheduledMessage") -> None:
+        self._write(
+            {
+                "op": "add",
+                "id": message.id,
+                "subject": message.subject,
+                "payload": base64.b64encode(message.payload).decode("ascii"),
+                "headers": message.headers,
+                "deadline": message.deadline,
+            }
+        )
+
+    def remove(self, message_id: str) -> None:
+        self._write({"op": "remove", "id": message_id})
+
+    def load(self) -> t.List["ScheduledMessage"]:
+        from ...aio.timers import ScheduledMessage
+
+        self.close()
+        if not self.path.exists():
+            return []
+        pending: t.Dict[str, t.Dict[str, t.Any]] = {}
+        with self.path.open("r", encoding="utf-8") as file:
+            for line in file:
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                if record["op"] == "add":
+                    pending[record["id"]] = record
+                else:
+                    pending.pop(record["id"], None)
+        # Compact file so that it only holds pending messages
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        with tmp.open("w", encoding="utf-8") as file:
+            for record in pending.values():
+                file.write(json.dumps(record))
+                file.write("\n")
+        os.replace(tmp, self.path)
+        return [
+            ScheduledMessage(
+                subject=record["subject"],
+                payload=base64.b64decode(record["payload"]),
+                headers=record["headers"],
+                deadline=record["deadline"],
+                id=record["id"],
+            )
+            for record in pending.values()
+        ]
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
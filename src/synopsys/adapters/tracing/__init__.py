@@ -0,0 +1,4 @@
+from .file import FileSpanExporter
+from .otlp import OTLPHTTPSpanExporter
+
+__all__ = ["FileSpanExporter", "OTLPHTTPSpanExporter"]
@@ -0,0 +1,49 @@
+import json
+import logging
+import typing as t
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict
+from pathlib import Path
+
+from ...interfaces.tracing import SpanExporter
+
+if t.TYPE_CHECKING:
+    from ...aio.tracing import Span  # pragma: no cover
+
+
+logger = logging.getLogger("synopsys.tracing")
+
+
+class FileSpanExporter(SpanExporter):
+    """Export spans to a local file, writing one JSON object per line.
+
+    Spans are written from a background thread, so that export never blocks
+    the event loop.
+    """
+
+    def __init__(self, path: t.Union[str, Path]) -> None:
+        self.path = Path(path)
+        self._file: t.Optional[t.TextIO] = None
+        # A single worker preserves the order of exports
+        self._executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="synopsys-file-spans"
+        )
+
+    def _write(self, lines: str) -> None:
+        try:
+            if self._file is None:
+                self._file = self.path.open("a", encoding="utf-8")
+            self._file.write(lines)
+            self._file.flush()
+        except Exception as exc:
+            logger.warning(f"Failed to export spans to {self.path}: {exc}")
+
+    def export(self, spans: t.List["Span"]) -> None:
+        lines = "".join(json.dumps(asdict(span), default=str) + "\n" for span in spans)
+        self._executor.submit(self._write, lines)
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=True)
+        if self._file is not None:
+            self._file.close()
+            self._file = None
@@ -0,0 +1,114 @@
+"""Export spans to an OpenTelemetry collector using OTLP/HTTP with JSON encoding.
+
+Only the standard library is used, so that no OpenTelemetry package is required.
+Spans are sent from a background thread, so that export never blocks the event loop.
+"""
+import json
+import logging
+import typing as t
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+from ...interfaces.tracing import SpanExporter
+
+if t.TYPE_CHECKING:
+    from ...aio.tracing import Span  # pragma: no cover
+
+
+logger = logging.getLogger("synopsys.tracing")
+
+# Span kinds as defined by OTLP protocol
+_KINDS = {"internal": 1, "server": 2, "client": 3, "producer": 4, "consumer": 5}
+
+
+def _encode_value(value: t.Any) -> t.Dict[str, t.Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def _encode_attributes(attributes: t.Dict[str, t.Any]) -> t.List[t.Dict[str, t.Any]]:
+    return [
+        {"key": key, "value": _encode_value(value)} for key, value in attributes.items()
+    ]
+
+
+def encode_spans(spans: t.List["Span"], service_name: str) -> t.Dict[str, t.Any]:
+    """Encode spans into an OTLP/JSON trace export request."""
+    encoded: t.List[t.Dict[str, t.Any]] = []
+    for span in spans:
+        item: t.Dict[str, t.Any] = {
+            "traceId": span.trace_id,
+            "spanId": span.span_id,
+            "name": span.name,
+            "kind": _KINDS[span.kind],
+            "startTimeUnixNano": str(int(span.start_time * 1e9)),
+            "endTimeUnixNano": str(int((span.end_time or span.start_time) * 1e9)),
+            "attributes": _encode_attributes(span.attributes),
+            "status": {"code": 2, "message": span.error} if span.error else {"code": 1},
+        }
+        if span.parent_id:
+            item["parentSpanId"] = span.parent_id
+        encoded.append(item)
+    return {
+        "resourceSpans": [
+            {
+                "resource": {
+                    "attributes": _encode_attributes({"service.name": service_name})
+                },
+                "scopeSpans": [{"scope": {"name": "synopsys"}, "spans": encoded}],
+            }
+        ]
+    }
+
+
+class OTLPHTTPSpanExporter(SpanExporter):
+    """Export spans to an OTLP/HTTP endpoint, such as an OpenTelemetry collector."""
+
+    def __init__(
+        self,
+        endpoint: str = "http://localhost:4318/v1/traces",
+        service_name: str = "synopsys",
+        headers: t.Optional[t.Dict[str, str]] = None,
+        timeout: float = 10.0,
+    ) -> None:
+        """Create a new exporter.
+
+        Arguments:
+            endpoint: The URL spans are posted to.
+            service_name: The name of the service emitting spans.
+            headers: Additional HTTP headers, for example used for authentication.
+            timeout: Maximum time in seconds to wait for the collector to respond.
+        """
+        self.endpoint = endpoint
+        self.service_name = service_name
+        self.headers = headers or {}
+        self.timeout = timeout
+        # A single worker preserves the order of exports
+        self._executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="synopsys-otlp"
+        )
+
+    def _send(self, body: bytes) -> None:
+        request = urllib.request.Request(
+            self.endpoint,
+            data=body,
+            headers={"Content-Type": "application/json", **self.headers},
+            method="POST",
+        )
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout):
+                pass
+        except Exception as exc:
+            logger.warning(f"Failed to export spans to {self.endpoint}: {exc}")
+
+    def export(self, spans: t.List["Span"]) -> None:
+        body = json.dumps(encode_spans(spans, self.service_name)).encode("utf-8")
+        self._executor.submit(self._send, body)
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=True)
@@ -1,4 +1,31 @@
+from .bridge import Bridge, BridgeRule
 from .bus import EventBus
+from .offload import DecodeOffloadPolicy
+from .partition import PartitionGroup
 from .play import Play
+from .publisher import Publisher
+from .timers import PublishScheduler, TimingWheel
+from .views import MaterializedView
+from .virtual import VirtualClockLoop, VirtualClockPolicy, run_virtual
+from .watchdog import LoopWatchdog
+from .windows import Reducer, Window, WindowAggregator
 
-__all__ = ["EventBus", "Play"]
+__all__ = [
+    "Bridge",
+    "BridgeRule",
+    "DecodeOffloadPolicy",
+    "EventBus",
+    "LoopWatchdog",
+    "MaterializedView",
+    "PartitionGroup",
+    "Play",
+    "Publisher",
+    "PublishScheduler",
+    "Reducer",
+    "TimingWheel",
+    "VirtualClockLoop",
+    "VirtualClockPolicy",
+    "Window",
+    "WindowAggregator",
+    "run_virtual",
+]
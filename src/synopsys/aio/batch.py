@@ -0,0 +1,151 @@
+import asyncio
+import typing as t
+from contextlib import asynccontextmanager
+
+T = t.TypeVar("T")
+
+
+class EndOfStream:
+    """Marker pushed into buffer when source iterator is exhausted."""
+
+    def __init__(self, exc: t.Optional[BaseException] = None) -> None:
+        self.exc = exc
+
+
+class BufferReader(t.Generic[T]):
+    """Read items from a buffer, waiting at most a timeout for each item.
+
+    Cancelling `Queue.get()` on timeout, as `asyncio.wait_for()` does, loses the
+    item when it is received at the same time on Python < 3.12. Instead, a single
+    pending read is kept across timeouts.
+    """
+
+    def __init__(self, buffer: "asyncio.Queue[T]") -> None:
+        self.buffer = buffer
+        self._pending: t.Optional["asyncio.Future[T]"] = None
+
+    def get_nowait(self) -> T:
+        """Get an item already received. Raises `asyncio.QueueEmpty` when there is none."""
+        if self._pending is None:
+            return self.buffer.get_nowait()
+        if not self._pending.done():
+            raise asyncio.QueueEmpty()
+        pending, self._pending = self._pending, None
+        return pending.result()
+
+    async def get(self, timeout: t.Optional[float] = None) -> T:
+        """Get next item. Raises `asyncio.TimeoutError` when no item is received within timeout."""
+        try:
+            return self.get_nowait()
+        except asyncio.QueueEmpty:
+            pass
+        if self._pending is None:
+            self._pending = asyncio.ensure_future(self.buffer.get())
+        await asyncio.wait([self._pending], timeout=timeout)
+        try:
+            return self.get_nowait()
+        except asyncio.QueueEmpty:
+            raise asyncio.TimeoutError() from None
+
+    def close(self) -> None:
+        """Cancel pending read, if any."""
+        if self._pending is not None:
+            self._pending.cancel()
+            self._pending = None
+
+
+@asynccontextmanager
+async def buffered(
+    source: t.AsyncIterator[T],
+    max_buffer: int,
+) -> t.AsyncIterator[BufferReader[t.Union[T, EndOfStream]]]:
+    """Read items from an async iterator into a buffer using a background task.
+
+    Once the source iterator is exhausted, an `EndOfStream` marker holding the
+    exception raised by the source iterator, if any, is pushed into the buffer.
+
+    Arguments:
+        source: The asynchronous iterator to read items from.
+        max_buffer: Maximum number of items buffered.
+
+    Returns:
+        An asynchronous context manager yielding a reader of the buffer.
+    """
+    buffer: "asyncio.Queue[t.Union[T, EndOfStream]]" = asyncio.Queue(max_buffer)
+
+    async def pump() -> None:
+        try:
+            async for item in source:
+                await buffer.put(item)
+        except Exception as exc:
+            await buffer.put(EndOfStream(exc))
+        else:
+            await buffer.put(EndOfStream())
+
+    reader = BufferReader(buffer)
+    task = asyncio.create_task(pump())
+    try:
+        yield reader
+    finally:
+        reader.close()
+        task.cancel()
+        await asyncio.wait([task])
+
+
+@asynccontextmanager
+async def batched(
+    source: t.AsyncIterator[T],
+    max_batch: int = 100,
+    max_wait: float = 0,
+) -> t.AsyncIterator[t.AsyncIterator[t.List[T]]]:
+    """Group items received from an async iterator into batches.
+
+    A background task reads items from the source iterator into a buffer
+    holding at most `max_batch` items. Each batch starts with the next
+    available item, then takes all items already buffered, and waits at
+    most `max_wait` seconds for more items until `max_batch` items are
+    collected.
+
+    Arguments:
+        source: The asynchronous iterator to read items from.
+        max_batch: Maximum number of items within a batch.
+        max_wait: Maximum time in seconds to wait for a batch to be full.
+
+    Returns:
+        An asynchronous context manager yielding an asynchronous iterator of batches.
+    """
+    if max_batch < 1:
+        raise ValueError("max_batch must be greater than 0")
+
+    async def iterator() -> t.AsyncIterator[t.List[T]]:
+        loop = asyncio.get_running_loop()
+        end: t.Optional[EndOfStream] = None
+        while end is None:
+            item = await buffer.get()
+            if isinstance(item, EndOfStream):
+                end = item
+                break
+            batch = [item]
+            deadline = loop.time() + max_wait
+            while len(batch) < max_batch:
+                # Take items already buffered without waiting
+                try:
+                    item = buffer.get_nowait()
+                except asyncio.QueueEmpty:
+                    remaining = deadline - loop.time()
+                    if remaining <= 0:
+                        break
+                    try:
+                        item = await buffer.get(remaining)
+                    except asyncio.TimeoutError:
+                        break
+                if isinstance(item, EndOfStream):
+                    end = item
+                    break
+                batch.append(item)
+            yield batch
+        if end.exc is not None:
+            raise end.exc
+
+    async with buffered(source, max_batch) as buffer:
+        yield iterator()
@@ -0,0 +1,350 @@
+"""Mirror subjects from a pubsub backend onto another pubsub backend.
+
+Messages are republished without being decoded: payload and headers are copied
+as is, and subjects may be rewritten. Messages are received in batches, and each
+batch is published by a background task, so that receiving messages never waits
+for the target backend unless too many messages are in flight.
+"""
+import asyncio
+import logging
+import time
+import typing as t
+from dataclasses import dataclass, field
+
+from ..entities.actors import Producer
+from ..entities.flows import ProducerFlow
+from ..entities.syntax import SubjectSyntax
+from ..interfaces.pubsub import PubSubBackend, PubSubMsg
+from ..operations.subjects import compile_subject_rewrite
+from .batch import batched
+
+if t.TYPE_CHECKING:
+    from .bus import EventBus  # pragma: no cover
+
+
+logger = logging.getLogger("synopsys.bridge")
+
+
+@dataclass
+class BridgeRule:
+    """Mirror messages matching a filter subject."""
+
+    source: str
+    """The filter subject subscribed on the source backend."""
+
+    target: t.Optional[str] = None
+    """The subject messages are published on. Wildcards of target subject are replaced
+    by the tokens matched by wildcards of source subject. When None, subjects are
+    not rewritten."""
+
+
+@dataclass
+class BridgeMetrics:
+    """Metrics collected by a bridge."""
+
+    received: int = 0
+    """Number of messages received from source backend."""
+
+    published: int = 0
+    """Number of messages published on target backend."""
+
+    failed: int = 0
+    """Number of messages which could not be published on target backend."""
+
+    batches: int = 0
+    """Number of batches received from source backend."""
+
+    bytes: int = 0
+    """Number of payload bytes published on target backend."""
+
+    in_flight: int = 0
+    """Number of messages received but not published yet."""
+
+    started_at: float = field(default_factory=time.monotonic)
+    """Monotonic time at which metrics started to be collected."""
+
+    def throughput(self) -> t.Tuple[float, float]:
+        """Get average throughput as a tuple (messages per second, bytes per second)."""
+        elapsed = time.monotonic() - self.started_at
+        if elapsed <= 0:
+            return 0, 0
+        return self.published / elapsed, self.bytes / elapsed
+
+    def render_prometheus(self, prefix: str = "synopsys_bridge") -> str:
+        """Render metrics using Prometheus text exposition format."""
+        lines: t.List[str] = []
+        for name, kind, help, value in (
+            (
+                "messages_received_total",
+                "counter",
+                "Number of messages received from source backend.",
+                self.received,
+            ),
+            (
+                "messages_published_total",
+                "counter",
+                "Number of messages published on target backend.",
+                self.published,
+            ),
+            (
+                "messages_failed_total",
+                "counter",
+                "Number of messages which could not be published on target backend.",
+                self.failed,
+            ),
+            (
+                "batches_received_total",
+                "counter",
+                "Number of batches received from source backend.",
+                self.batches,
+            ),
+            (
+                "published_bytes_total",
+                "counter",
+                "Number of payload bytes published on target backend.",
+                self.bytes,
+            ),
+            (
+                "messages_in_flight",
+                "gauge",
+                "Number of messages received but not published yet.",
+                self.in_flight,
+            ),
+        ):
+            lines.append(f"# HELP {prefix}_{name} {help}")
+            lines.append(f"# TYPE {prefix}_{name} {kind}")
+            lines.append(f"{prefix}_{name} {value}")
+        return "\n".join(lines) + "\n"
+
+
+class Bridge:
+    """Republish raw messages received from a source backend on a target backend.
+
+    Messages of a batch are published in order. Batches are published concurrently
+    as long as at most `max_in_flight` messages are in flight, so messages of
+    different batches may be published out of order when target backend waits
+    on each publish. Use `max_in_flight` equal to `max_batch` in order to publish
+    a single batch at a time.
+
+    Replies are not bridged, and bridging the same subjects in both directions
+    republishes messages forever.
+
+    Example:
+
+    ```python
+    bridge = Bridge(
+        RedisPubSub(),
+        NATSPubSub(),
+        [BridgeRule("orders.>"), BridgeRule("devices.*", "legacy.devices.*")],
+    )
+    bridge.main()
+    ```
+    """
+
+    def __init__(
+        self,
+        source: PubSubBackend,
+        target: PubSubBackend,
+        rules: t.Sequence[BridgeRule],
+        *,
+        queue: t.Optional[str] = None,
+        max_batch: int = 100,
+        max_wait: float = 0,
+        max_in_flight: int = 1000,
+        syntax: t.Optional[SubjectSyntax] = None,
+        name: str = "bridge",
+    ) -> None:
+        """Create a new bridge.
+
+        Arguments:
+            source: The backend messages are received from.
+            target: The backend messages are published on.
+            rules: Rules indicating which subjects are bridged.
+            queue: An optional queue group, so that several bridges share the load.
+            max_batch: Maximum number of messages within a batch.
+            max_wait: Maximum time in seconds to wait for a batch to be full.
+            max_in_flight: Maximum number of messages received but not published yet.
+                A batch larger than `max_in_flight` is only published once no other
+                message is in flight.
+            syntax: Syntax of subjects. By default, NATS syntax is used.
+            name: Name of the bridge, used as flow name when bridge runs as an actor.
+        """
+        if not rules:
+            raise ValueError("At least one rule must be provided")
+        if max_batch < 1:
+            raise ValueError("max_batch must be greater than 0")
+        if max_in_flight < 1:
+            raise ValueError("max_in_flight must be greater than 0")
+        self.source = source
+        self.target = target
+        self.rules = list(rules)
+        self.queue = queue
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.max_in_flight = max_in_flight
+        self.syntax = syntax or SubjectSyntax()
+        self.name = name
+        self.metrics = BridgeMetrics()
+        self._rewrites = [
+            (
+                None
+                if rule.target is None
+                else compile_subject_rewrite(rule.source, rule.target, self.syntax)
+            )
+            for rule in self.rules
+        ]
+        self._tasks: t.Set["asyncio.Task[None]"] = set()
+        self._window: t.Optional[asyncio.Condition] = None
+
+    async def run(self) -> None:
+        """Bridge messages until cancelled.
+
+        Backends must be connected before running the bridge. Batches in flight
+        are published before returning.
+        """
+        self._window = asyncio.Condition()
+        rules = [
+            asyncio.create_task(self._bridge(rule, rewrite))
+            for rule, rewrite in zip(self.rules, self._rewrites)
+        ]
+        try:
+            # Stop bridging as soon as a rule fails
+            done, _ = await asyncio.wait(rules, return_when=asyncio.FIRST_EXCEPTION)
+            for task in done:
+                task.result()
+        finally:
+            for task in rules:
+                task.cancel()
+            await asyncio.wait(rules)
+            if self._tasks:
+                await asyncio.wait(self._tasks)
+            self._window = None
+
+    def actor(self) -> Producer:
+        """Get an actor running the bridge within a play.
+
+        Backends are not connected by the actor. Use the pubsub backend of the play
+        bus as source or target, or connect backends before starting the play.
+        """
+
+        async def task_factory(bus: "EventBus") -> None:
+            await self.run()
+
+        return Producer(
+            flow=ProducerFlow(name=self.name, emits=[], requests=[]),
+            task_factory=task_factory,
+        )
+
+    def main(self, loop: str = "auto", report_interval: float = 10) -> None:
+        """Connect backends and run bridge until interrupted.
+
+        Arguments:
+            loop: Event loop used to run the bridge. One of "auto", "asyncio"
+                or "uvloop". By default, uvloop is used when installed.
+            report_interval: Time in seconds between two throughput reports.
+        """
+        from anyio import run
+
+        from ..runner import get_backend
+
+        backend, backend_options = get_backend(loop)
+        if backend != "asyncio":
+            raise ValueError("Bridge can only run on asyncio or uvloop")
+        try:
+            run(
+                self._main,
+                report_interval,
+                backend=backend,
+                backend_options=backend_options,
+            )
+        except KeyboardInterrupt:
+            pass
+
+    async def _main(self, report_interval: float) -> None:
+        await self.source.connect()
+        if self.target is not self.source:
+            await self.target.connect()
+        reporter = asyncio.create_task(self._report(report_interval))
+        try:
+            await self.run()
+        finally:
+            reporter.cancel()
+            await asyncio.wait([reporter])
+            await self.source.disconnect()
+            if self.target is not self.source:
+                await self.target.disconnect()
+
+    async def _report(self, interval: float) -> None:
+        """Log throughput measured over each interval."""
+        published, size = self.metrics.published, self.metrics.bytes
+        while True:
+            await asyncio.sleep(interval)
+            previous = published, size
+            published, size = self.metrics.published, self.metrics.bytes
+            logger.info(
+                f"Bridged {(published - previous[0]) / interval:.1f} msg/s "
+                f"({(size - previous[1]) / interval:.1f} B/s), "
+                f"{self.metrics.in_flight} in flight, {self.metrics.failed} failed"
+            )
+
+    async def _bridge(
+        self, rule: BridgeRule, rewrite: t.Optional[t.Callable[[str], str]]
+    ) -> None:
+        async with self.source.subscribe(rule.source, queue=self.queue) as subscription:
+            async with batched(
+                subscription, max_batch=self.max_batch, max_wait=self.max_wait
+            ) as batches:
+                async for batch in batches:
+                    self.metrics.received += len(batch)
+                    self.metrics.batches += 1
+                    await self._acquire(len(batch))
+                    task = asyncio.create_task(self._forward(batch, rewrite))
+                    self._tasks.add(task)
+                    task.add_done_callback(self._tasks.discard)
+
+    async def _acquire(self, count: int) -> None:
+        """Wait until batch fits within the in-flight window."""
+        window = self._window
+        assert window is not None
+        async with window:
+            await window.wait_for(
+                lambda: self.metrics.in_flight == 0
+                or self.metrics.in_flight + count <= self.max_in_flight
+            )
+            self.metrics.in_flight += count
+
+    async def _release(self, count: int) -> None:
+        window = self._window
+        assert window is not None
+        async with window:
+            self.metrics.in_flight -= count
+            window.notify_all()
+
+    async def _forward(
+        self, batch: t.List[PubSubMsg], rewrite: t.Optional[t.Callable[[str], str]]
+    ) -> None:
+        """Publish a batch of messages on target backend."""
+        failed = 0
+        try:
+            for msg in batch:
+                subject = msg.get_subject()
+                payload = msg.get_payload()
+                try:
+                    await self.target.publish(
+                        subject if rewrite is None else rewrite(subject),
+                        payload,
+                        msg.get_headers(),
+                    )
+                except Exception as exc:
+                    if not failed:
+                        logger.error(
+                            f"Failed to publish message received on {subject}",
+                            exc_info=exc,
+                        )
+                    failed += 1
+                    continue
+                self.metrics.published += 1
+                self.metrics.bytes += len(payload)
+        finally:
+            self.metrics.failed += failed
+            await self._release(len(batch))
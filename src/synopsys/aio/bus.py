@@ -1,48 +1,245 @@
+import asyncio
+import time
 import typing as t
-from contextlib import asynccontextmanager
+from contextlib import asynccontextmanager, contextmanager
 from dataclasses import dataclass
+from time import perf_counter
 from types import TracebackType
 
 from ..entities.events import Event
 from ..entities.flows import Flow, SubscriptionFlow
 from ..entities.messages import Message, Reply
 from ..interfaces.codec import CodecBackend
+from ..interfaces.instrumentation import BusInstrumentation
 from ..interfaces.pubsub import PubSubBackend, PubSubMsg
+from ..operations.delivery import split_headers, stamp_headers
+from ..operations.partitions import partition_key
+from ..operations.subjects import extract_scope, merge_filter_subjects, render_subject
 from ..types import DataT, MetaT, ReplyMetaT, ReplyT, ScopeT
-from .waiter import RequestWaiter, Waiter
+from .batch import batched
+from .offload import DecodeOffloadPolicy
+from .partition import PartitionGroup
+from .publisher import Publisher
+from .timers import PublishScheduler, ScheduledMessage, Timer
+from .tracing import Tracer
+from .views import KeyT, MaterializedView
+from .waiter import Dispatcher, RequestWaiter, Waiter
+from .windows import AccT, Reducer, Window, WindowAggregator, windowed
 
 
 @dataclass
 class _Request(Message[ScopeT, DataT, MetaT, ReplyT, ReplyMetaT]):
-    reply_subject: str
+    # Message has fields with default values
+    reply_subject: str = ""
 
 
 BusT = t.TypeVar("BusT", bound="EventBus")
 
 
+def _headers_size(headers: t.Dict[str, str]) -> int:
+    return sum(len(key) + len(value) for key, value in headers.items())
+
+
 class EventBus:
     """An interface used to publish events."""
 
     def __init__(
-        self, pubsub: PubSubBackend, codec: CodecBackend, flow: t.Optional[Flow] = None
+        self,
+        pubsub: PubSubBackend,
+        codec: CodecBackend,
+        flow: t.Optional[Flow] = None,
+        offload: t.Optional[DecodeOffloadPolicy] = None,
+        instrumentation: t.Optional[BusInstrumentation] = None,
+        track_latency: bool = False,
+        tracer: t.Optional[Tracer] = None,
+        scheduler: t.Optional[PublishScheduler] = None,
     ) -> None:
+        """Create a new event bus.
+
+        Arguments:
+            pubsub: The pubsub backend used to exchange messages.
+            codec: The codec backend used to encode and decode messages.
+            flow: An optional flow restricting which events can be used.
+            offload: An optional policy used to decode large payloads within a thread pool.
+            instrumentation: An optional instrumentation observing encoding, decoding and transport.
+            track_latency: When True, publish time and a unique message ID are added
+                to headers of published messages and requests, so that consumers can
+                measure delivery latency.
+            tracer: An optional tracer creating spans for published, received and
+                requested messages, and propagating trace context within headers.
+            scheduler: The scheduler used to publish messages later. By default, a
+                scheduler without persistence is created.
+        """
         self.pubsub = pubsub
         self.codec = codec
         self.flow = flow
+        self.offload = offload
+        self.instrumentation = instrumentation
+        self.track_latency = track_latency
+        self.tracer = tracer
+        self.scheduler = scheduler if scheduler is not None else PublishScheduler()
+        self._dispatchers: t.Dict[
+            Event[t.Any, t.Any, t.Any, t.Any, t.Any],
+            Dispatcher[Message[t.Any, t.Any, t.Any, t.Any, t.Any]],
+        ] = {}
 
     def bind_flow(self, flow: Flow) -> "EventBus":
         """Create a new event bus scoped to a flow."""
-        return self.__class__(self.pubsub, self.codec, flow=flow)
+        return self.__class__(
+            self.pubsub,
+            self.codec,
+            flow=flow,
+            offload=self.offload,
+            instrumentation=self.instrumentation,
+            track_latency=self.track_latency,
+            tracer=self.tracer,
+            scheduler=self.scheduler,
+        )
+
+    def _encode(
+        self,
+        event: Event[t.Any, t.Any, t.Any, t.Any, t.Any],
+        data: t.Any,
+        metadata: t.Any,
+        *,
+        reply: bool = False,
+        headers: t.Optional[t.Dict[str, str]] = None,
+    ) -> t.Tuple[bytes, t.Dict[str, str]]:
+        """Encode payload and headers, observing encode time when bus is instrumented.
+
+        Arguments:
+            event: The event being published, requested or replied to.
+            data: The data to encode as payload.
+            metadata: The metadata to encode as headers. When metadata is `...`,
+                headers argument is used, or no header is sent.
+            reply: Whether a reply is encoded.
+            headers: Headers already encoded, used when metadata is `...`.
+
+        Returns:
+            A tuple (payload, headers).
+        """
+        instrumentation = self.instrumentation
+        if instrumentation is not None:
+            start = perf_counter()
+        if metadata is ...:
+            headers = {} if headers is None else headers.copy()
+        else:
+            headers = self.codec.encode_headers(metadata)
+        if self.track_latency and not reply:
+            stamp_headers(headers)
+        payload = self.codec.encode_payload(data)
+        if instrumentation is not None:
+            observe = (
+                instrumentation.reply_encoded
+                if reply
+                else instrumentation.message_encoded
+            )
+            observe(
+                self,
+                event,
+                perf_counter() - start,
+                len(payload),
+                _headers_size(headers),
+            )
+        return payload, headers
+
+    async def _publish(
+        self,
+        event: Event[t.Any, t.Any, t.Any, t.Any, t.Any],
+        subject: str,
+        payload: bytes,
+        headers: t.Dict[str, str],
+        timeout: t.Optional[float] = None,
+        *,
+        reply: bool = False,
+    ) -> None:
+        """Publish an encoded message, within a span when bus is traced."""
+        tracer = self.tracer
+        if tracer is None:
+            return await self._send(event, subject, payload, headers, timeout, reply)
+        with tracer.start_span(
+            f"{event.name} {'reply' if reply else 'publish'}",
+            "producer",
+            attributes={
+                "messaging.destination.name": subject,
+                "messaging.message.body.size": len(payload),
+            },
+        ) as span:
+            tracer.inject(span, headers)
+            await self._send(event, subject, payload, headers, timeout, reply)
+
+    async def _send(
+        self,
+        event: Event[t.Any, t.Any, t.Any, t.Any, t.Any],
+        subject: str,
+        payload: bytes,
+        headers: t.Dict[str, str],
+        timeout: t.Optional[float],
+        reply: bool,
+    ) -> None:
+        """Publish an encoded message, observing publish time when bus is instrumented."""
+        instrumentation = self.instrumentation
+        if instrumentation is None:
+            return await self.pubsub.publish(
+                subject=subject, payload=payload, headers=headers, timeout=timeout
+            )
+        start = perf_counter()
+        await self.pubsub.publish(
+            subject=subject, payload=payload, headers=headers, timeout=timeout
+        )
+        observe = (
+            instrumentation.reply_published
+            if reply
+            else instrumentation.message_published
+        )
+        observe(self, event, subject, perf_counter() - start)
 
     def _create_message(
-        self, msg: PubSubMsg, event: Event[ScopeT, DataT, MetaT, ReplyT, ReplyMetaT]
+        self,
+        msg: PubSubMsg,
+        event: Event[ScopeT, DataT, MetaT, ReplyT, ReplyMetaT],
+        data: DataT = ...,  # type: ignore[assignment]
+        started: t.Optional[float] = None,
+        metadata: MetaT = ...,  # type: ignore[assignment]
     ) -> Message[ScopeT, DataT, MetaT, ReplyT, ReplyMetaT]:
-        """Create a typed message out of a pubsub message."""
+        """Create a typed message out of a pubsub message.
+
+        Payload and headers are decoded unless already decoded data or metadata
+        is provided. When bus is instrumented and payload was decoded elsewhere,
+        `started` is the time at which decoding started.
+        """
+        instrumentation = self.instrumentation
+        if instrumentation is not None:
+            start = perf_counter() if started is None else started
         subject = msg.get_subject()
         reply_subject = msg.get_reply_subject()
+        headers, published_at, message_id, traceparent = split_headers(
+            msg.get_headers()
+        )
+        tracer = self.tracer
+        if tracer is not None:
+            span = tracer.create_span(
+                f"{event.name} receive",
+                "consumer",
+                parent=traceparent,
+                attributes={"messaging.destination.name": subject},
+            )
         scope = event.extract_scope(subject, codec=self.codec)
-        data = self.codec.decode_payload(msg.get_payload(), event.schema)
-        metadata = self.codec.decode_headers(msg.get_headers(), event.metadata_schema)
+        if data is ...:
+            data = self.codec.decode_payload(msg.get_payload(), event.schema)
+        if metadata is ...:
+            metadata = self.codec.decode_headers(headers, event.metadata_schema)
+        if tracer is not None:
+            tracer.finish(span)
+            traceparent = span.traceparent
+        if instrumentation is not None:
+            instrumentation.message_decoded(
+                self,
+                event,
+                perf_counter() - start,
+                len(msg.get_payload()),
+                _headers_size(headers),
+            )
         if not reply_subject:
             return Message(
                 subject=subject,
@@ -50,6 +247,9 @@ class EventBus:
                 data=data,
                 metadata=metadata,
                 event=event,
+                published_at=published_at,
+                message_id=message_id,
+                traceparent=traceparent,
             )
         return _Request(
             subject=subject,
@@ -57,9 +257,67 @@ class EventBus:
             data=data,
             metadata=metadata,
             event=event,
+            published_at=published_at,
+            message_id=message_id,
+            traceparent=traceparent,
             reply_subject=reply_subject,
         )
 
+    async def _create_message_offloaded(
+        self,
+        msg: PubSubMsg,
+        event: Event[ScopeT, DataT, MetaT, ReplyT, ReplyMetaT],
+        metadata: MetaT = ...,  # type: ignore[assignment]
+    ) -> Message[ScopeT, DataT, MetaT, ReplyT, ReplyMetaT]:
+        """Create a typed message, decoding large payloads within a thread pool."""
+        payload = msg.get_payload()
+        if self.offload is None or not self.offload.should_offload(event, len(payload)):
+            return self._create_message(msg, event, metadata=metadata)
+        instrumentation = self.instrumentation
+        if instrumentation is not None:
+            start = perf_counter()
+        data = await asyncio.get_running_loop().run_in_executor(
+            self.offload.executor, self.codec.decode_payload, payload, event.schema
+        )
+        if instrumentation is None:
+            return self._create_message(msg, event, data=data, metadata=metadata)
+        return self._create_message(
+            msg, event, data=data, started=start, metadata=metadata
+        )
+
+    def _check_predicates(
+        self,
+        msg: PubSubMsg,
+        event: Event[t.Any, t.Any, MetaT, t.Any, t.Any],
+        header_predicate: t.Optional[t.Callable[[t.Dict[str, str]], bool]],
+        metadata_predicate: t.Optional[t.Callable[[MetaT], bool]],
+    ) -> t.Tuple[bool, MetaT]:
+        """Evaluate predicates on message headers, without decoding payload.
+
+        Returns:
+            A tuple (accepted, metadata). Metadata is `...` unless it was decoded
+            in order to evaluate metadata predicate.
+        """
+        if header_predicate is not None and not header_predicate(msg.get_headers()):
+            return False, ...  # type: ignore[return-value]
+        if metadata_predicate is None:
+            return True, ...  # type: ignore[return-value]
+        headers, *_ = split_headers(msg.get_headers())
+        metadata = self.codec.decode_headers(headers, event.metadata_schema)
+        return metadata_predicate(metadata), metadata
+
+    def _drop(
+        self,
+        msg: PubSubMsg,
+        event: Event[t.Any, t.Any, t.Any, t.Any, t.Any],
+        on_dropped: t.Optional[t.Callable[[PubSubMsg], None]] = None,
+    ) -> None:
+        """Observe a message dropped by predicates."""
+        if self.instrumentation is not None:
+            self.instrumentation.message_dropped(self, event, msg.get_subject())
+        if on_dropped is not None:
+            on_dropped(msg)
+
     async def reply(
         self,
         message: Message[t.Any, t.Any, t.Any, ReplyT, ReplyMetaT],
@@ -74,10 +332,9 @@ class EventBus:
         if metadata is ...:
             metadata = {}  # type: ignore[assignment]
         subject = message.reply_subject
-        headers = self.codec.encode_headers(metadata)
-        payload = self.codec.encode_payload(data)
-        return await self.pubsub.publish(
-            subject=subject, payload=payload, headers=headers, timeout=timeout
+        payload, headers = self._encode(message.event, data, metadata, reply=True)
+        return await self._publish(
+            message.event, subject, payload, headers, timeout, reply=True
         )
 
     async def publish(
@@ -90,57 +347,242 @@ class EventBus:
         timeout: t.Optional[float] = None,
     ) -> None:
         """Publish and wait until event is flushed by underlying messaging system."""
+        self._check_emits(event)
+        if scope is ...:
+            scope = {}  # type: ignore[assignment]
+        subject = event.get_subject(scope, self.codec)
+        payload, headers = self._encode(event, data, metadata)
+        return await self._publish(event, subject, payload, headers, timeout)
+
+    async def publish_later(
+        self,
+        event: Event[ScopeT, DataT, MetaT, t.Any, t.Any],
+        data: DataT,
+        *,
+        delay: float,
+        scope: ScopeT = ...,  # type: ignore[assignment]
+        metadata: MetaT = ...,  # type: ignore[assignment]
+    ) -> Timer[ScheduledMessage]:
+        """Publish once delay in seconds has elapsed.
+
+        Message is encoded immediately, and published by the bus scheduler.
+
+        Returns:
+            A timer which can be used to cancel publication.
+        """
+        return await self.publish_at(
+            event, data, at=time.time() + delay, scope=scope, metadata=metadata
+        )
+
+    async def publish_at(
+        self,
+        event: Event[ScopeT, DataT, MetaT, t.Any, t.Any],
+        data: DataT,
+        *,
+        at: float,
+        scope: ScopeT = ...,  # type: ignore[assignment]
+        metadata: MetaT = ...,  # type: ignore[assignment]
+    ) -> Timer[ScheduledMessage]:
+        """Publish at given time in seconds since epoch.
+
+        Message is encoded immediately, and published by the bus scheduler.
+
+        Returns:
+            A timer which can be used to cancel publication.
+        """
+        self._check_emits(event)
+        if scope is ...:
+            scope = {}  # type: ignore[assignment]
+        subject = event.get_subject(scope, self.codec)
+        payload, headers = self._encode(event, data, metadata)
+        message = ScheduledMessage(
+            subject=subject, payload=payload, headers=headers, deadline=at, event=event
+        )
+        return self.scheduler.schedule_message(self, message)
+
+    def publisher(
+        self,
+        event: Event[ScopeT, DataT, MetaT, t.Any, t.Any],
+        *,
+        scope: ScopeT = ...,  # type: ignore[assignment]
+        metadata: MetaT = ...,  # type: ignore[assignment]
+    ) -> Publisher[ScopeT, DataT, MetaT]:
+        """Create a publisher bound to an event and a scope.
+
+        Flow is checked, subject is rendered and metadata is encoded once,
+        so that the publisher only needs to encode payloads afterwards.
+
+        Arguments:
+            event: The event to publish.
+            scope: The scope used to render the subject.
+            metadata: Default metadata sent with each message.
+
+        Returns:
+            A publisher instance.
+        """
+        self._check_emits(event)
+        if scope is ...:
+            scope = {}  # type: ignore[assignment]
+        subject = event.get_subject(scope, self.codec)
+        if metadata is ...:
+            headers: t.Dict[str, str] = {}
+        else:
+            headers = self.codec.encode_headers(metadata)
+        return Publisher(self, event, subject, headers)
+
+    def _check_emits(self, event: Event[t.Any, t.Any, t.Any, t.Any, t.Any]) -> None:
         if self.flow and event not in self.flow.emits:
             raise ValueError(
                 "Cannot publish an event not declared in flow. Append the event to the emits attribute of the flow in order to fix this error."
             )
+
+    async def request(
+        self,
+        event: Event[ScopeT, DataT, MetaT, ReplyT, ReplyMetaT],
+        data: DataT,
+        *,
+        scope: ScopeT = ...,  # type: ignore[assignment]
+        metadata: MetaT = ...,  # type: ignore[assignment]
+        timeout: t.Optional[float] = None,
+    ) -> Reply[ReplyT, ReplyMetaT]:
+        """Request and wait for reply."""
+        self._check_requests(event)
         if scope is ...:
             scope = {}  # type: ignore[assignment]
         if metadata is ...:
             metadata = {}  # type: ignore[assignment]
         subject = event.get_subject(scope, self.codec)
-        headers = self.codec.encode_headers(metadata)
-        payload = self.codec.encode_payload(data)
-        return await self.pubsub.publish(
-            subject=subject, payload=payload, headers=headers, timeout=timeout
-        )
+        payload, headers = self._encode(event, data, metadata)
+        instrumentation = self.instrumentation
+        with self._trace_request(event, subject, payload, headers):
+            if instrumentation is not None:
+                start = perf_counter()
+            reply = await self.pubsub.request(
+                subject=subject, payload=payload, headers=headers, timeout=timeout
+            )
+            if instrumentation is not None:
+                instrumentation.request_completed(
+                    self, event, subject, perf_counter() - start
+                )
+        return self._create_reply(reply, event)
 
-    async def request(
+    @contextmanager
+    def _trace_request(
+        self,
+        event: Event[t.Any, t.Any, t.Any, t.Any, t.Any],
+        subject: str,
+        payload: bytes,
+        headers: t.Dict[str, str],
+    ) -> t.Iterator[None]:
+        """Start a request span and inject its context into headers when bus is traced."""
+        tracer = self.tracer
+        if tracer is None:
+            yield
+            return
+        with tracer.start_span(
+            f"{event.name} request",
+            "client",
+            attributes={
+                "messaging.destination.name": subject,
+                "messaging.message.body.size": len(payload),
+            },
+        ) as span:
+            tracer.inject(span, headers)
+            yield
+
+    @asynccontextmanager
+    async def request_many(
         self,
         event: Event[ScopeT, DataT, MetaT, ReplyT, ReplyMetaT],
         data: DataT,
         *,
         scope: ScopeT = ...,  # type: ignore[assignment]
         metadata: MetaT = ...,  # type: ignore[assignment]
+        max_replies: t.Optional[int] = None,
         timeout: t.Optional[float] = None,
-    ) -> Reply[ReplyT, ReplyMetaT]:
-        """Request and wait for reply."""
-        if self.flow and event not in self.flow.requests:
-            raise ValueError(
-                "Cannot request an event not declared in flow. Append the event to the emit attribute of the flow in order to fix this error."
-            )
+    ) -> t.AsyncIterator[t.AsyncIterator[Reply[ReplyT, ReplyMetaT]]]:
+        """Send a request and gather replies from all responders.
+
+        All replies are received on a single inbox. Iteration stops once
+        `max_replies` replies are received or `timeout` expires, whichever
+        comes first. Exiting the context stops waiting for replies.
+
+        Arguments:
+            event: The event to request.
+            data: The request data.
+            scope: The scope used to render the subject.
+            metadata: The request metadata.
+            max_replies: Maximum number of replies to wait for.
+            timeout: Maximum time in seconds to wait for replies.
+
+        Returns:
+            An asynchronous context manager yielding an asynchronous iterator of replies.
+        """
+        self._check_requests(event)
         if scope is ...:
             scope = {}  # type: ignore[assignment]
         if metadata is ...:
             metadata = {}  # type: ignore[assignment]
         subject = event.get_subject(scope, self.codec)
-        headers = self.codec.encode_headers(metadata)
-        payload = self.codec.encode_payload(data)
-        reply = await self.pubsub.request(
-            subject=subject, payload=payload, headers=headers, timeout=timeout
-        )
-        return Reply(
-            data=self.codec.decode_payload(reply.get_payload(), event.reply_schema),
-            metadata=self.codec.decode_headers(
-                reply.get_headers(), event.reply_metadata_schema
-            ),
+        payload, headers = self._encode(event, data, metadata)
+        with self._trace_request(event, subject, payload, headers):
+            async with self.pubsub.request_many(
+                subject=subject,
+                payload=payload,
+                headers=headers,
+                max_replies=max_replies,
+                timeout=timeout,
+            ) as replies:
+
+                async def iterator() -> t.AsyncIterator[Reply[ReplyT, ReplyMetaT]]:
+                    async for reply in replies:
+                        yield self._create_reply(reply, event)
+
+                yield iterator()
+
+    def _create_reply(
+        self, msg: PubSubMsg, event: Event[t.Any, t.Any, t.Any, ReplyT, ReplyMetaT]
+    ) -> Reply[ReplyT, ReplyMetaT]:
+        """Create a typed reply out of a pubsub message."""
+        instrumentation = self.instrumentation
+        if instrumentation is not None:
+            start = perf_counter()
+        payload = msg.get_payload()
+        headers = msg.get_headers()
+        # Replies may hold trace context, which is not part of reply metadata
+        metadata, *_ = split_headers(headers)
+        reply = Reply(
+            data=self.codec.decode_payload(payload, event.reply_schema),
+            metadata=self.codec.decode_headers(metadata, event.reply_metadata_schema),
         )
+        if instrumentation is not None:
+            instrumentation.reply_decoded(
+                self,
+                event,
+                perf_counter() - start,
+                len(payload),
+                _headers_size(headers),
+            )
+        return reply
+
+    def _check_requests(self, event: Event[t.Any, t.Any, t.Any, t.Any, t.Any]) -> None:
+        if self.flow and event not in self.flow.requests:
+            raise ValueError(
+                "Cannot request an event not declared in flow. Append the event to the emit attribute of the flow in order to fix this error."
+            )
 
     @asynccontextmanager
     async def subscribe(
         self,
         event: Event[ScopeT, DataT, MetaT, ReplyT, ReplyMetaT],
         queue: t.Optional[str] = None,
+        *,
+        filters: t.Optional[
+            t.Sequence[Event[ScopeT, DataT, MetaT, ReplyT, ReplyMetaT]]
+        ] = None,
+        header_predicate: t.Optional[t.Callable[[t.Dict[str, str]], bool]] = None,
+        metadata_predicate: t.Optional[t.Callable[[MetaT], bool]] = None,
+        on_dropped: t.Optional[t.Callable[[PubSubMsg], None]] = None,
     ) -> t.AsyncIterator[
         t.AsyncIterator[Message[ScopeT, DataT, MetaT, ReplyT, ReplyMetaT]]
     ]:
@@ -150,15 +592,110 @@ class EventBus:
         asynchronous iterator.
         This iterator can be used to iterate over received messages.
         Each message contains both event definition and event data.
+        Messages for which a predicate returns False are dropped before their
+        payload is decoded.
 
         Arguments:
             event: An event to observe
             queue: An optional string indicating that observer belongs to a queue group.
                 Within a queue group, each message is delivered to a single observer.
+            filters: Optional scope filters of the event. Defaults to the filters of the
+                flow bound to the bus.
+            header_predicate: An optional function evaluated on raw message headers.
+            metadata_predicate: An optional function evaluated on decoded message metadata.
+            on_dropped: An optional function called with each message dropped by predicates.
 
         Returns:
             An asynchronous context manager yielding an asynchronous iterator of messages.
         """
+        async with self.subscribe_raw(
+            event, queue=queue, filters=filters
+        ) as subscription:
+            yield self._decode_messages(
+                subscription, event, header_predicate, metadata_predicate, on_dropped
+            )
+
+    async def _decode_messages(
+        self,
+        subscription: t.AsyncIterator[PubSubMsg],
+        event: Event[ScopeT, DataT, MetaT, ReplyT, ReplyMetaT],
+        header_predicate: t.Optional[t.Callable[[t.Dict[str, str]], bool]] = None,
+        metadata_predicate: t.Optional[t.Callable[[MetaT], bool]] = None,
+        on_dropped: t.Optional[t.Callable[[PubSubMsg], None]] = None,
+    ) -> t.AsyncIterator[Message[ScopeT, DataT, MetaT, ReplyT, ReplyMetaT]]:
+        """Decode pubsub messages, dropping messages rejected by predicates."""
+        filtered = header_predicate is not None or metadata_predicate is not None
+        async for msg in subscription:
+            try:
+                metadata: MetaT = ...  # type: ignore[assignment]
+                if filtered:
+                    accepted, metadata = self._check_predicates(
+                        msg, event, header_predicate, metadata_predicate
+                    )
+                    if not accepted:
+                        self._drop(msg, event, on_dropped)
+                        continue
+                if self.offload is None:
+                    yield self._create_message(msg, event, metadata=metadata)
+                else:
+                    yield await self._create_message_offloaded(
+                        msg, event, metadata=metadata
+                    )
+            except Exception as exc:
+                import logging
+
+                logging.error("Failed to process message", exc_info=exc)
+                # TODO: It may not be a good idea to simply skip
+                continue
+
+    def subscribe_raw(
+        self,
+        event: Event[t.Any, t.Any, t.Any, t.Any, t.Any],
+        queue: t.Optional[str] = None,
+        *,
+        filters: t.Optional[
+            t.Sequence[Event[t.Any, t.Any, t.Any, t.Any, t.Any]]
+        ] = None,
+    ) -> t.AsyncContextManager[t.AsyncIterator[PubSubMsg]]:
+        """Create an observer yielding pubsub messages which are not decoded.
+
+        Filters are pushed down to the pubsub backend: a single subscription is
+        created using the narrowest subject matching all filters. When this subject
+        matches more than the filters, messages which do not match any filter
+        are dropped.
+
+        Arguments:
+            event: An event to observe
+            queue: An optional string indicating that observer belongs to a queue group.
+            filters: Optional scope filters of the event. Defaults to the filters of the
+                flow bound to the bus.
+
+        Returns:
+            An asynchronous context manager yielding an asynchronous iterator of pubsub messages.
+        """
+        self._check_source(event)
+        if filters is None:
+            filters = self._get_filters(event)
+        is_reply = event.reply_schema is not type(None)  # noqa: E721
+        if not filters:
+            return self.pubsub.subscribe(event._subject, queue=queue, reply=is_reply)
+        subject = merge_filter_subjects(
+            [item._subject for item in filters], event.syntax
+        )
+        subscription = self.pubsub.subscribe(subject, queue=queue, reply=is_reply)
+        if any(item._subject == subject for item in filters):
+            return subscription
+        return _filter_subscription(subscription, filters)
+
+    def _get_filters(
+        self, event: Event[t.Any, t.Any, t.Any, t.Any, t.Any]
+    ) -> t.Sequence[Event[t.Any, t.Any, t.Any, t.Any, t.Any]]:
+        """Get scope filters of the flow bound to the bus, if event is the flow source."""
+        if isinstance(self.flow, SubscriptionFlow) and event is self.flow.event:
+            return self.flow.filters
+        return []
+
+    def _check_source(self, event: Event[t.Any, t.Any, t.Any, t.Any, t.Any]) -> None:
         if self.flow:
             if not isinstance(self.flow, SubscriptionFlow):
                 raise TypeError(
@@ -169,40 +706,377 @@ class EventBus:
                     f"Can only subscribe to the flow source. Tried to subscribe to event {event.name} but flow source is {self.flow.event.name}"
                 )
 
-        is_reply = event.reply_schema is not type(None)  # noqa: E721
+    @asynccontextmanager
+    async def subscribe_batch(
+        self,
+        event: Event[ScopeT, DataT, MetaT, ReplyT, ReplyMetaT],
+        queue: t.Optional[str] = None,
+        *,
+        max_batch: int = 100,
+        max_wait: float = 0,
+        filters: t.Optional[
+            t.Sequence[Event[ScopeT, DataT, MetaT, ReplyT, ReplyMetaT]]
+        ] = None,
+        header_predicate: t.Optional[t.Callable[[t.Dict[str, str]], bool]] = None,
+        metadata_predicate: t.Optional[t.Callable[[MetaT], bool]] = None,
+        on_dropped: t.Optional[t.Callable[[PubSubMsg], None]] = None,
+    ) -> t.AsyncIterator[
+        t.AsyncIterator[t.List[Message[ScopeT, DataT, MetaT, ReplyT, ReplyMetaT]]]
+    ]:
+        """Create an event observer yielding batches of messages.
+
+        Each batch holds at least one message, and at most `max_batch` messages.
+        Messages already received are added to the batch without waiting,
+        then observer waits at most `max_wait` seconds for the batch to be full.
+
+        Arguments:
+            event: An event to observe
+            queue: An optional string indicating that observer belongs to a queue group.
+                Within a queue group, each message is delivered to a single observer.
+            max_batch: Maximum number of messages within a batch.
+            max_wait: Maximum time in seconds to wait for a batch to be full.
+            filters: Optional scope filters of the event. Defaults to the filters of the
+                flow bound to the bus.
+            header_predicate: An optional function evaluated on raw message headers.
+            metadata_predicate: An optional function evaluated on decoded message metadata.
+            on_dropped: An optional function called with each message dropped by predicates.
 
-        async with self.pubsub.subscribe(
-            event._subject, queue=queue, reply=is_reply
+        Returns:
+            An asynchronous context manager yielding an asynchronous iterator of lists of messages.
+        """
+        async with self.subscribe(
+            event,
+            queue=queue,
+            filters=filters,
+            header_predicate=header_predicate,
+            metadata_predicate=metadata_predicate,
+            on_dropped=on_dropped,
         ) as subscription:
+            async with batched(
+                subscription, max_batch=max_batch, max_wait=max_wait
+            ) as batches:
+                yield batches
 
-            async def iterator() -> t.AsyncIterator[
-                Message[ScopeT, DataT, MetaT, ReplyT, ReplyMetaT]
-            ]:
-                async for msg in subscription:
-                    try:
-                        yield self._create_message(msg, event)
-                    except Exception as exc:
-                        import logging
-
-                        logging.error("Failed to process message", exc_info=exc)
-                        # TODO: It may not be a good idea to simply skip
-                        continue
+    @asynccontextmanager
+    async def subscribe_partitioned(
+        self,
+        event: Event[ScopeT, DataT, MetaT, ReplyT, ReplyMetaT],
+        queue: str,
+        *,
+        keys: t.Sequence[str],
+        member: t.Optional[str] = None,
+        heartbeat: float = 1,
+        ttl: t.Optional[float] = None,
+        filters: t.Optional[
+            t.Sequence[Event[ScopeT, DataT, MetaT, ReplyT, ReplyMetaT]]
+        ] = None,
+        header_predicate: t.Optional[t.Callable[[t.Dict[str, str]], bool]] = None,
+        metadata_predicate: t.Optional[t.Callable[[MetaT], bool]] = None,
+        on_dropped: t.Optional[t.Callable[[PubSubMsg], None]] = None,
+    ) -> t.AsyncIterator[
+        t.AsyncIterator[Message[ScopeT, DataT, MetaT, ReplyT, ReplyMetaT]]
+    ]:
+        """Create an event observer belonging to a partitioned queue group.
+
+        Within a partitioned queue group, each message is delivered to the member
+        owning its partition key, according to a consistent hash of some scope
+        fields, so that all messages with the same key are delivered to the same
+        member. When members join or leave the group, only the keys of these
+        members move to other members.
 
-            yield iterator()
+        Each member receives all messages, and drops messages owned by other
+        members before their payload is decoded, using scope fields found in
+        message subject.
+
+        Arguments:
+            event: An event to observe
+            queue: Name of the partitioned queue group.
+            keys: Names of the scope fields used as partition key. Fields must be
+                placeholders of event subject.
+            member: Unique name of the member within the group. Defaults to a random name.
+            heartbeat: Time in seconds between two heartbeats sent to other members.
+            ttl: Time in seconds after which a member which did not send heartbeats
+                is removed from the group. Defaults to three heartbeats.
+            filters: Optional scope filters of the event. Defaults to the filters of the
+                flow bound to the bus.
+            header_predicate: An optional function evaluated on raw message headers.
+            metadata_predicate: An optional function evaluated on decoded message metadata.
+            on_dropped: An optional function called with each message dropped by predicates.
+
+        Returns:
+            An asynchronous context manager yielding an asynchronous iterator of messages.
+        """
+        if not keys:
+            raise ValueError("At least one partition key must be provided")
+        unknown = set(keys).difference(event._placeholders)
+        if unknown:
+            raise ValueError(
+                f"Partition keys must be placeholders of event subject. Unknown keys: {sorted(unknown)}"
+            )
+        async with PartitionGroup(
+            self.pubsub, queue, member=member, heartbeat=heartbeat, ttl=ttl
+        ) as group:
+            async with self.subscribe_raw(event, filters=filters) as subscription:
+                yield self._decode_messages(
+                    _partition_messages(subscription, event, keys, group),
+                    event,
+                    header_predicate,
+                    metadata_predicate,
+                    on_dropped,
+                )
+
+    @asynccontextmanager
+    async def subscribe_window(
+        self,
+        event: Event[ScopeT, DataT, MetaT, ReplyT, ReplyMetaT],
+        queue: t.Optional[str] = None,
+        *,
+        size: float,
+        reducer: Reducer[Message[ScopeT, DataT, MetaT, ReplyT, ReplyMetaT], AccT],
+        step: t.Optional[float] = None,
+        max_windows: int = 10000,
+        filters: t.Optional[
+            t.Sequence[Event[ScopeT, DataT, MetaT, ReplyT, ReplyMetaT]]
+        ] = None,
+        header_predicate: t.Optional[t.Callable[[t.Dict[str, str]], bool]] = None,
+        metadata_predicate: t.Optional[t.Callable[[MetaT], bool]] = None,
+        on_dropped: t.Optional[t.Callable[[PubSubMsg], None]] = None,
+    ) -> t.AsyncIterator[t.AsyncIterator[t.List[Window[ScopeT, AccT]]]]:
+        """Create an event observer yielding batches of closed time windows.
+
+        Messages are grouped by scope and accumulated by the reducer as soon as
+        they are received. Each window holds the value accumulated for a single
+        scope, and windows are yielded in batches once closed.
+
+        Arguments:
+            event: An event to observe
+            queue: An optional string indicating that observer belongs to a queue group.
+                Within a queue group, each message is delivered to a single observer.
+            size: Duration of a window in seconds.
+            reducer: The reducer used to accumulate messages, for example `count()`.
+            step: Duration between the start of two consecutive windows in seconds.
+                Defaults to `size`, I.E, tumbling windows. Sliding windows are
+                created when step is lower than size.
+            max_windows: Maximum number of open windows. When reached, the window
+                closing first is closed early.
+            filters: Optional scope filters of the event. Defaults to the filters of the
+                flow bound to the bus.
+            header_predicate: An optional function evaluated on raw message headers.
+            metadata_predicate: An optional function evaluated on decoded message metadata.
+            on_dropped: An optional function called with each message dropped by predicates.
+
+        Returns:
+            An asynchronous context manager yielding an asynchronous iterator of lists of windows.
+        """
+        aggregator = WindowAggregator(
+            size=size, reducer=reducer, step=step, max_windows=max_windows
+        )
+        async with self.subscribe(
+            event,
+            queue=queue,
+            filters=filters,
+            header_predicate=header_predicate,
+            metadata_predicate=metadata_predicate,
+            on_dropped=on_dropped,
+        ) as subscription:
+            async with windowed(subscription, aggregator) as windows:
+                yield windows
+
+    async def aggregate(
+        self,
+        event: Event[ScopeT, DataT, MetaT, ReplyT, ReplyMetaT],
+        target: Event[t.Any, t.Any, t.Any, t.Any, t.Any],
+        queue: t.Optional[str] = None,
+        *,
+        size: float,
+        reducer: Reducer[Message[ScopeT, DataT, MetaT, ReplyT, ReplyMetaT], AccT],
+        step: t.Optional[float] = None,
+        max_windows: int = 10000,
+        data: t.Optional[t.Callable[[Window[ScopeT, AccT]], t.Any]] = None,
+        scope: t.Optional[t.Callable[[Window[ScopeT, AccT]], t.Any]] = None,
+        filters: t.Optional[
+            t.Sequence[Event[ScopeT, DataT, MetaT, ReplyT, ReplyMetaT]]
+        ] = None,
+    ) -> None:
+        """Aggregate an event over time windows, and publish each closed window as another event.
+
+        This coroutine runs until cancelled.
+
+        Arguments:
+            event: An event to observe
+            target: The event published for each closed window.
+            queue: An optional string indicating that observer belongs to a queue group.
+            size: Duration of a window in seconds.
+            reducer: The reducer used to accumulate messages.
+            step: Duration between the start of two consecutive windows in seconds.
+                Defaults to `size`, I.E, tumbling windows.
+            max_windows: Maximum number of open windows.
+            data: An optional function returning target event data from a window.
+                Defaults to the window value.
+            scope: An optional function returning target event scope from a window.
+                Defaults to the window scope.
+            filters: Optional scope filters of the event. Defaults to the filters of the
+                flow bound to the bus.
+        """
+        self._check_emits(target)
+        async with self.subscribe_window(
+            event,
+            queue=queue,
+            size=size,
+            reducer=reducer,
+            step=step,
+            max_windows=max_windows,
+            filters=filters,
+        ) as windows:
+            async for batch in windows:
+                for window in batch:
+                    await self.publish(
+                        target,
+                        window.value if data is None else data(window),
+                        scope=window.scope if scope is None else scope(window),
+                    )
+
+    @asynccontextmanager
+    async def materialize(
+        self,
+        event: Event[ScopeT, DataT, MetaT, ReplyT, ReplyMetaT],
+        *,
+        key: t.Callable[[Message[ScopeT, DataT, MetaT, ReplyT, ReplyMetaT]], KeyT],
+        max_size: int = 10000,
+        ttl: t.Optional[float] = None,
+        snapshot: t.Optional[Event[t.Any, t.Any, t.Any, t.Any, t.Any]] = None,
+        snapshot_data: t.Any = None,
+        snapshot_items: t.Optional[
+            t.Callable[[Reply[t.Any, t.Any]], t.Iterable[t.Tuple[KeyT, DataT]]]
+        ] = None,
+        snapshot_timeout: t.Optional[float] = None,
+        filters: t.Optional[
+            t.Sequence[Event[ScopeT, DataT, MetaT, ReplyT, ReplyMetaT]]
+        ] = None,
+    ) -> t.AsyncIterator[MaterializedView[KeyT, DataT]]:
+        """Keep the latest data of an event in memory, indexed by key.
+
+        The view is updated in background with each message received, until context
+        is exited. When a snapshot event is provided, it is requested once subscribed,
+        and the view is loaded with the entries found in the reply before being yielded.
+        Entries received from messages are never overwritten by the snapshot.
+
+        When receiving messages fails, the view stops being updated, the exception
+        is kept within the `error` attribute of the view, and raised on context exit.
+
+        Arguments:
+            event: An event to observe
+            key: A function returning the key of a message, for example a scope field.
+            max_size: Maximum number of entries. When reached, the least recently
+                used entry is evicted.
+            ttl: Time in seconds after which an entry which was not updated expires.
+                By default, entries never expire.
+            snapshot: An optional service event replying with the current state of
+                all entries.
+            snapshot_data: Data of the snapshot request.
+            snapshot_items: A function returning entries as (key, data) tuples out of
+                the snapshot reply. By default, reply data must be a mapping from keys
+                to data.
+            snapshot_timeout: Maximum time in seconds to wait for the snapshot reply.
+            filters: Optional scope filters of the event. Defaults to the filters of the
+                flow bound to the bus.
+
+        Returns:
+            An asynchronous context manager yielding a materialized view.
+        """
+        view: MaterializedView[KeyT, DataT] = MaterializedView(
+            key, max_size=max_size, ttl=ttl
+        )
+        async with self.subscribe(event, filters=filters) as messages:
+            task = asyncio.create_task(view.follow(messages))
+            try:
+                if snapshot is not None:
+                    reply = await self.request(
+                        snapshot, snapshot_data, timeout=snapshot_timeout
+                    )
+                    view.load(
+                        reply.data.items()
+                        if snapshot_items is None
+                        else snapshot_items(reply)
+                    )
+                yield view
+            finally:
+                view.close()
+                task.cancel()
+                await asyncio.wait([task])
+                error = None if task.cancelled() else task.exception()
+        if error is not None:
+            raise error
 
     async def next_event(
-        self, event: Event[ScopeT, DataT, MetaT, ReplyT, ReplyMetaT]
+        self,
+        event: Event[ScopeT, DataT, MetaT, ReplyT, ReplyMetaT],
+        *,
+        scope: ScopeT = ...,  # type: ignore[assignment]
+        predicate: t.Optional[
+            t.Callable[[Message[ScopeT, DataT, MetaT, ReplyT, ReplyMetaT]], bool]
+        ] = None,
     ) -> Message[ScopeT, DataT, MetaT, ReplyT, ReplyMetaT]:
-        async with self.subscribe(event) as subscription:
-            async for msg in subscription:
-                return msg
-        raise ValueError("Did not receive a message")
+        """Wait for next event matching scope and predicate."""
+        waiter = await self.wait_in_background(event, scope=scope, predicate=predicate)
+        return await waiter.task
 
     async def wait_in_background(
-        self, event: Event[ScopeT, DataT, MetaT, ReplyT, ReplyMetaT]
+        self,
+        event: Event[ScopeT, DataT, MetaT, ReplyT, ReplyMetaT],
+        *,
+        scope: ScopeT = ...,  # type: ignore[assignment]
+        predicate: t.Optional[
+            t.Callable[[Message[ScopeT, DataT, MetaT, ReplyT, ReplyMetaT]], bool]
+        ] = None,
     ) -> Waiter[Message[ScopeT, DataT, MetaT, ReplyT, ReplyMetaT]]:
-        """Start waiting in background"""
-        return await Waiter.create(self.subscribe(event))
+        """Start waiting in background.
+
+        All waiters waiting for the same event share a single subscription.
+
+        Arguments:
+            event: An event to wait for.
+            scope: An optional scope which must match message subject. Scope may be partial.
+            predicate: An optional function which must return True for message to match.
+
+        Returns:
+            A waiter resolved with the first matching message.
+        """
+        subject: t.Optional[str] = None
+        exact = True
+        if scope is not ...:
+            subject = render_subject(
+                tokens=event._tokens,
+                placeholders=event._placeholders,
+                context=self.codec.encode_headers(scope),
+                syntax=event.syntax,
+                is_filter=True,
+            )
+            tokens = subject.split(event.syntax.match_sep)
+            exact = (
+                event.syntax.match_one not in tokens
+                and event.syntax.match_all not in tokens
+            )
+        return await Waiter.attach(
+            self._get_dispatcher(event), subject, predicate, exact=exact
+        )
+
+    def _get_dispatcher(
+        self, event: Event[ScopeT, DataT, MetaT, ReplyT, ReplyMetaT]
+    ) -> Dispatcher[Message[ScopeT, DataT, MetaT, ReplyT, ReplyMetaT]]:
+        """Get the dispatcher shared by all waiters of an event."""
+        dispatcher = self._dispatchers.get(event)
+        if dispatcher is None:
+            dispatcher = Dispatcher(
+                lambda: self.subscribe(event), on_close=self._remove_dispatcher
+            )
+            self._dispatchers[event] = dispatcher
+        return dispatcher
+
+    def _remove_dispatcher(self, dispatcher: Dispatcher[t.Any]) -> None:
+        for event, candidate in list(self._dispatchers.items()):
+            if candidate is dispatcher:
+                self._dispatchers.pop(event)
 
     async def request_in_background(
         self,
@@ -221,15 +1095,19 @@ class EventBus:
     async def connect(self) -> None:
         """Connect event bus.
 
-        Calls the .connect() method of the pubsub backend.
+        Calls the .connect() method of the pubsub backend, then starts
+        the scheduler when messages restored from its store are pending.
         """
         await self.pubsub.connect()
+        if len(self.scheduler):
+            self.scheduler.start(self)
 
     async def disconnect(self) -> None:
         """Disconnect event bus.
 
-        Calls the .disconnect() method of the pubsub backend.
+        Stops the scheduler, then calls the .disconnect() method of the pubsub backend.
         """
+        await self.scheduler.stop()
         await self.pubsub.disconnect()
 
     async def __aenter__(self: BusT) -> BusT:
@@ -244,3 +1122,33 @@ class EventBus:
     ) -> None:
         """Disconnect on context exit."""
         await self.disconnect()
+
+
+@asynccontextmanager
+async def _filter_subscription(
+    subscription: t.AsyncContextManager[t.AsyncIterator[PubSubMsg]],
+    filters: t.Sequence[Event[t.Any, t.Any, t.Any, t.Any, t.Any]],
+) -> t.AsyncIterator[t.AsyncIterator[PubSubMsg]]:
+    """Drop messages which do not match any filter, before they are decoded."""
+    async with subscription as messages:
+
+        async def iterator() -> t.AsyncIterator[PubSubMsg]:
+            async for msg in messages:
+                subject = msg.get_subject()
+                if any(item.match_subject(subject) for item in filters):
+                    yield msg
+
+        yield iterator()
+
+
+async def _partition_messages(
+    messages: t.AsyncIterator[PubSubMsg],
+    event: Event[t.Any, t.Any, t.Any, t.Any, t.Any],
+    keys: t.Sequence[str],
+    group: PartitionGroup,
+) -> t.AsyncIterator[PubSubMsg]:
+    """Drop messages owned by other members of a partition group, before they are decoded."""
+    async for msg in messages:
+        values = extract_scope(msg.get_subject(), event._placeholders, event.syntax)
+        if group.owns(partition_key(values, keys)):
+            yield msg
@@ -0,0 +1,34 @@
+import typing as t
+from concurrent.futures import Executor
+from dataclasses import dataclass, field
+
+from ..entities.events import Event
+
+
+@dataclass
+class DecodeOffloadPolicy:
+    """Configure when payloads are decoded within a thread pool.
+
+    Payloads larger than threshold are decoded within a thread pool,
+    so that decoding does not block the event loop. Smaller payloads are
+    decoded inline, because handing them to a thread costs more than
+    decoding them.
+    """
+
+    threshold: int = 1_000_000
+    """Minimum payload size in bytes for decoding to be offloaded."""
+
+    overrides: t.Dict[
+        Event[t.Any, t.Any, t.Any, t.Any, t.Any], t.Optional[int]
+    ] = field(default_factory=dict)
+    """Per-event thresholds. A threshold set to None disables offloading for an event."""
+
+    executor: t.Optional[Executor] = None
+    """Executor used to decode payloads. Default executor of the event loop is used when None."""
+
+    def should_offload(
+        self, event: Event[t.Any, t.Any, t.Any, t.Any, t.Any], size: int
+    ) -> bool:
+        """Return True when a payload of given size should be decoded in thread pool."""
+        threshold = self.overrides.get(event, self.threshold)
+        return threshold is not None and size >= threshold
@@ -0,0 +1,179 @@
+"""Share messages between members of a group by consistent hash of a partition key.
+
+Members of a group announce themselves on a control subject and send heartbeats
+periodically. Each member tracks the other members of its group within a hash
+ring, and only processes messages whose partition key it owns, so that all
+messages of an entity are processed by the same member. When a member joins or
+leaves the group, only the keys owned by this member move to another member.
+
+Membership is eventually consistent: while a member joins the group, messages
+of its keys may be processed twice, and when a member stops without leaving the
+group, messages of its keys are skipped until its heartbeats expire.
+"""
+import asyncio
+import json
+import logging
+import typing as t
+from secrets import token_hex
+from types import TracebackType
+
+from ..interfaces.pubsub import PubSubBackend
+from ..operations.partitions import HashRing
+from ..operations.streams import iterate_until
+
+logger = logging.getLogger("synopsys.partitions")
+
+PARTITIONS_SUBJECT = "_SYNOPSYS.partitions"
+"""Control subject used by members of partition groups to announce themselves."""
+
+
+class PartitionGroup:
+    """Membership of a process within a partition group.
+
+    Example:
+
+    ```python
+    async with PartitionGroup(pubsub, "device-workers") as group:
+        if group.owns(device_id):
+            ...
+    ```
+    """
+
+    def __init__(
+        self,
+        pubsub: PubSubBackend,
+        group: str,
+        *,
+        member: t.Optional[str] = None,
+        heartbeat: float = 1,
+        ttl: t.Optional[float] = None,
+        replicas: int = 64,
+    ) -> None:
+        """Create a new group membership.
+
+        Arguments:
+            pubsub: The backend used to announce members. Backend must be connected
+                before entering the group.
+            group: Name of the group.
+            member: Unique name of the member. Defaults to a random name.
+            heartbeat: Time in seconds between two heartbeats.
+            ttl: Time in seconds after which a member which did not send heartbeats
+                is removed from the group. Defaults to three heartbeats.
+            replicas: Number of points of each member on the hash ring.
+        """
+        if heartbeat <= 0:
+            raise ValueError("heartbeat must be greater than 0")
+        if ttl is None:
+            ttl = 3 * heartbeat
+        if ttl < heartbeat:
+            raise ValueError("ttl must be greater than heartbeat")
+        self.pubsub = pubsub
+        self.group = group
+        self.member = member or token_hex(8)
+        self.heartbeat = heartbeat
+        self.ttl = ttl
+        self.ring = HashRing([self.member], replicas=replicas)
+        self._last_seen: t.Dict[str, float] = {}
+        self._watcher: t.Optional["asyncio.Task[None]"] = None
+        self._heartbeat: t.Optional["asyncio.Task[None]"] = None
+        self._announces: t.Set["asyncio.Task[None]"] = set()
+
+    @property
+    def members(self) -> t.FrozenSet[str]:
+        """Members of the group known by this member, including itself."""
+        return self.ring.members
+
+    def owns(self, key: str) -> bool:
+        """Return True if this member owns a partition key."""
+        return self.ring.get(key) == self.member
+
+    async def __aenter__(self) -> "PartitionGroup":
+        """Join the group."""
+        ready: "asyncio.Future[None]" = asyncio.get_running_loop().create_future()
+        self._watcher = asyncio.create_task(self._watch(ready))
+        # Wait until subscription is started, or failed to start
+        await asyncio.wait([ready, self._watcher], return_when=asyncio.FIRST_COMPLETED)
+        if not ready.done():
+            watcher, self._watcher = self._watcher, None
+            # Raise the exception of the watcher, if any
+            watcher.result()
+            raise RuntimeError(f"Failed to join partition group {self.group}")
+        await self._announce("hello")
+        self._heartbeat = asyncio.create_task(self._beat())
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: t.Optional[t.Type[BaseException]] = None,
+        exc: t.Optional[BaseException] = None,
+        traceback: t.Optional[TracebackType] = None,
+    ) -> None:
+        """Leave the group."""
+        tasks = [*self._announces]
+        for task in (self._watcher, self._heartbeat):
+            if task is not None:
+                tasks.append(task)
+        self._watcher = self._heartbeat = None
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.wait(tasks)
+        await self._announce("bye")
+        for peer in list(self._last_seen):
+            self._remove(peer)
+
+    async def _announce(self, op: str) -> None:
+        payload = {"op": op, "group": self.group, "member": self.member}
+        try:
+            await self.pubsub.publish(
+                PARTITIONS_SUBJECT, json.dumps(payload).encode("utf-8"), {}
+            )
+        except Exception as exc:
+            logger.error("Failed to announce partition group member", exc_info=exc)
+
+    def _remove(self, peer: str) -> None:
+        self._last_seen.pop(peer, None)
+        if self.ring.remove(peer):
+            logger.info(f"Member {peer} left partition group {self.group}")
+
+    async def _watch(self, ready: "asyncio.Future[None]") -> None:
+        """Track other members of the group."""
+        loop = asyncio.get_running_loop()
+        async with self.pubsub.subscribe(PARTITIONS_SUBJECT) as subscription:
+            ready.set_result(None)
+            async for msg in iterate_until(subscription, lambda: self._watcher is None):
+                try:
+                    announce = json.loads(msg.get_payload())
+                    group, peer, op = (
+                        announce["group"],
+                        announce["member"],
+                        announce["op"],
+                    )
+                except Exception as exc:
+                    logger.error("Invalid partition group announce", exc_info=exc)
+                    continue
+                if group != self.group or peer == self.member:
+                    continue
+                if op == "bye":
+                    self._remove(peer)
+                    continue
+                self._last_seen[peer] = loop.time()
+                if self.ring.add(peer):
+                    logger.info(f"Member {peer} joined partition group {self.group}")
+                # Newcomers must learn existing members.
+                # Announce in background, so that watcher never waits for other watchers.
+                if op == "hello":
+                    task = asyncio.create_task(self._announce("alive"))
+                    self._announces.add(task)
+                    task.add_done_callback(self._announces.discard)
+
+    async def _beat(self) -> None:
+        """Send heartbeats and remove members whose heartbeats expired."""
+        loop = asyncio.get_running_loop()
+        while True:
+            await asyncio.sleep(self.heartbeat)
+            await self._announce("alive")
+            expired = loop.time() - self.ttl
+            for peer, seen in list(self._last_seen.items()):
+                if seen < expired:
+                    self._remove(peer)
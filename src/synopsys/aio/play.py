@@ -1,31 +1,69 @@
+import asyncio
+import logging
 import sys
 import typing as t
-from contextlib import AsyncExitStack
+from concurrent.futures import Executor, ProcessPoolExecutor
+from contextlib import AsyncExitStack, asynccontextmanager, nullcontext
 from dataclasses import dataclass, field
+from functools import partial
 from types import TracebackType
 
-from anyio import Event, create_task_group, get_cancelled_exc_class, run
+from anyio import (
+    BrokenResourceError,
+    ClosedResourceError,
+    Event,
+    Semaphore,
+    create_memory_object_stream,
+    create_task_group,
+    get_cancelled_exc_class,
+    run,
+)
 from anyio.abc._tasks import TaskGroup
+from anyio.streams.memory import MemoryObjectReceiveStream, MemoryObjectSendStream
 
-from ..entities.actors import Actor, Producer, Service, Subscriber
-from ..interfaces.instrumentation import PlayInstrumentation
+from ..entities.actors import Actor, BatchSubscriber, Producer, Service, Subscriber
+from ..entities.events import Event as EventSpec
+from ..entities.messages import Message
+from ..entities.registry import EventRegistry
+from ..interfaces.instrumentation import PlayHooks, PlayInstrumentation
+from ..interfaces.pubsub import PubSubMsg
+from ..operations.delivery import get_delivery_delay, split_headers
 from .bus import EventBus
+from .process import RawMessage, initialize_worker, process_message
+from .watchdog import LoopWatchdog
+
+# Context used instead of a span when bus is not traced
+_UNTRACED = nullcontext()
+
+# Number of messages buffered for each subscriber sharing a subscription
+_SHARED_BUFFER_SIZE = 1024
 
 
 @dataclass
 class Play:
     bus: EventBus
     actors: t.List[Actor] = field(default_factory=list)
-    instrumentation: PlayInstrumentation = field(
-        default_factory=PlayInstrumentation, repr=False
+    instrumentation: t.Union[PlayInstrumentation, t.Sequence[PlayInstrumentation]] = (
+        field(default_factory=PlayInstrumentation, repr=False)
     )
     auto_connect: bool = False
+    watchdog: t.Optional[LoopWatchdog] = None
+    # When True, subscribers share one wildcard subscription per subject prefix
+    share_subscriptions: bool = False
 
     def __post_init__(self) -> None:
         self._task_group: t.Optional[TaskGroup] = None
         self._exit_stack: t.Optional[AsyncExitStack] = None
         self.stopped: t.Optional[Event] = None
         self.user_cancelled: bool = False
+        # Streams of messages dispatched to subscribers sharing subscriptions
+        self._shared: t.Dict[int, MemoryObjectReceiveStream[PubSubMsg]] = {}
+        self.hooks = self._resolve_hooks()
+
+    def _resolve_hooks(self) -> PlayHooks:
+        if isinstance(self.instrumentation, PlayInstrumentation):
+            return PlayHooks(self.instrumentation)
+        return PlayHooks(*self.instrumentation)
 
     @property
     def task_group(self) -> TaskGroup:
@@ -41,23 +79,170 @@ class Play:
         return self
 
     async def _on_exit(self) -> None:
+        # Export spans buffered by tracer
+        if self.bus.tracer is not None:
+            self.bus.tracer.flush()
         if self.stopped:
             self.stopped.set()
 
+    def _event_received(
+        self, actor: Actor, msg: Message[t.Any, t.Any, t.Any, t.Any, t.Any]
+    ) -> None:
+        for hook in self.hooks.event_received:
+            hook(self, actor, msg)
+        if msg.published_at is not None and self.hooks.event_delivered:
+            delay = get_delivery_delay(msg.published_at)
+            for hook in self.hooks.event_delivered:
+                hook(self, actor, msg, delay)
+
+    def _event_dropped(self, actor: Actor, msg: PubSubMsg) -> None:
+        for hook in self.hooks.event_dropped:
+            hook(self, actor, msg.get_subject())
+
+    def _trace_handler(
+        self, name: str, traceparent: t.Optional[str]
+    ) -> t.ContextManager[t.Any]:
+        """Start a span active while handler runs when bus is traced."""
+        tracer = self.bus.tracer
+        if tracer is None:
+            return _UNTRACED
+        return tracer.start_span(f"{name} handle", parent=traceparent, activate=True)
+
     async def _create_susbcriber_loop(
         self, actor: Subscriber[t.Any, t.Any, t.Any, t.Any, t.Any]
     ) -> None:
         event = actor.flow.event
         callback = actor.handler
-        async with self.bus.subscribe(event, queue=actor.queue) as subscription:
-            self.instrumentation.actor_started(self, actor)
+        if actor.processes:
+            return await self._create_process_loop(actor, event, actor.processes)
+        if id(actor) in self._shared:
+            messages = self._subscribe_shared(actor)
+        elif actor.partition_by:
+            assert actor.queue is not None
+            messages = self.bus.subscribe_partitioned(
+                event,
+                actor.queue,
+                keys=actor.partition_by,
+                filters=actor.flow.filters,
+                header_predicate=actor.header_predicate,
+                metadata_predicate=actor.metadata_predicate,
+                on_dropped=partial(self._event_dropped, actor),
+            )
+        else:
+            messages = self.bus.subscribe(
+                event,
+                queue=actor.queue,
+                filters=actor.flow.filters,
+                header_predicate=actor.header_predicate,
+                metadata_predicate=actor.metadata_predicate,
+                on_dropped=partial(self._event_dropped, actor),
+            )
+        async with messages as subscription:
+            for hook in self.hooks.actor_started:
+                hook(self, actor)
+            async for msg in subscription:
+                self._event_received(actor, msg)
+                try:
+                    with self._trace_handler(actor.flow.name, msg.traceparent):
+                        await callback(msg)
+                    for hook in self.hooks.event_processed:
+                        hook(self, actor, msg)
+                except Exception as exc:
+                    for hook in self.hooks.event_processing_failed:
+                        hook(self, actor, msg, exc)
+                    continue
+
+    @asynccontextmanager
+    async def _subscribe_shared(
+        self, actor: Subscriber[t.Any, t.Any, t.Any, t.Any, t.Any]
+    ) -> t.AsyncIterator[t.AsyncIterator[Message[t.Any, t.Any, t.Any, t.Any, t.Any]]]:
+        """Decode messages dispatched to a subscriber sharing a subscription."""
+        async with self._shared[id(actor)] as stream:
+            yield self.bus._decode_messages(
+                stream,
+                actor.flow.event,
+                actor.header_predicate,
+                actor.metadata_predicate,
+                partial(self._event_dropped, actor),
+            )
+
+    def _start_dispatchers(self) -> None:
+        """Subscribe once per subject prefix on behalf of subscribers sharing subscriptions.
+
+        Events of subscribers are indexed within a registry, so that each message
+        received is dispatched to subscribers whose flow event or filters match
+        the message subject.
+        """
+        registry: EventRegistry[MemoryObjectSendStream[PubSubMsg]] = EventRegistry()
+        for actor in self.actors:
+            if not isinstance(actor, Subscriber) or not _can_share_subscription(
+                actor, registry
+            ):
+                continue
+            send: MemoryObjectSendStream[PubSubMsg]
+            receive: MemoryObjectReceiveStream[PubSubMsg]
+            send, receive = create_memory_object_stream(_SHARED_BUFFER_SIZE)
+            self._shared[id(actor)] = receive
+            for event in actor.flow.filters or [actor.flow.event]:
+                registry.register(event, send)
+        for subject in registry.get_subscriptions():
+            self.task_group.start_soon(
+                self._dispatch, subject, registry, name=f"dispatch {subject}"
+            )
+
+    async def _dispatch(
+        self,
+        subject: str,
+        registry: EventRegistry[MemoryObjectSendStream[PubSubMsg]],
+    ) -> None:
+        """Dispatch messages to subscribers, skipping subscribers which stopped.
+
+        A subscriber whose buffer is full delays the others, so that no message
+        is lost.
+        """
+        # Streams of subscribers which stopped
+        closed: t.Set[MemoryObjectSendStream[PubSubMsg]] = set()
+        async with self.bus.pubsub.subscribe(subject) as subscription:
             async for msg in subscription:
-                self.instrumentation.event_received(self, actor, msg)
+                # A subscriber with several matching filters receives message once
+                for stream in dict.fromkeys(registry.match(msg.get_subject())):
+                    if stream in closed:
+                        continue
+                    try:
+                        await stream.send(msg)
+                    except (BrokenResourceError, ClosedResourceError):
+                        closed.add(stream)
+
+    async def _create_batch_susbcriber_loop(
+        self, actor: BatchSubscriber[t.Any, t.Any, t.Any, t.Any, t.Any]
+    ) -> None:
+        event = actor.flow.event
+        callback = actor.handler
+        async with self.bus.subscribe_batch(
+            event,
+            queue=actor.queue,
+            max_batch=actor.max_batch,
+            max_wait=actor.max_wait,
+            filters=actor.flow.filters,
+            header_predicate=actor.header_predicate,
+            metadata_predicate=actor.metadata_predicate,
+            on_dropped=partial(self._event_dropped, actor),
+        ) as subscription:
+            for hook in self.hooks.actor_started:
+                hook(self, actor)
+            async for batch in subscription:
+                for msg in batch:
+                    self._event_received(actor, msg)
                 try:
-                    await callback(msg)
-                    self.instrumentation.event_processed(self, actor, msg)
+                    with self._trace_handler(actor.flow.name, None):
+                        await callback(batch)
+                    for msg in batch:
+                        for hook in self.hooks.event_processed:
+                            hook(self, actor, msg)
                 except Exception as exc:
-                    self.instrumentation.event_processing_failed(self, actor, msg, exc)
+                    for msg in batch:
+                        for hook in self.hooks.event_processing_failed:
+                            hook(self, actor, msg, exc)
                     continue
 
     async def _create_service_loop(
@@ -66,21 +251,155 @@ class Play:
     ) -> None:
         event = actor.flow.command
         callback = actor.handler
-        async with self.bus.subscribe(event, queue=actor.queue) as subscription:
-            self.instrumentation.actor_started(self, actor)
+        if actor.processes:
+            return await self._create_process_loop(actor, event, actor.processes)
+        async with self.bus.subscribe(
+            event, queue=actor.queue, filters=actor.flow.filters
+        ) as subscription:
+            for hook in self.hooks.actor_started:
+                hook(self, actor)
             async for msg in subscription:
-                self.instrumentation.event_received(self, actor, msg)
+                self._event_received(actor, msg)
                 try:
-                    reply = await callback(msg)
-                    await self.bus.reply(msg, data=reply.data, metadata=reply.metadata)
-                    self.instrumentation.event_processed(self, actor, msg)
+                    with self._trace_handler(actor.flow.name, msg.traceparent):
+                        reply = await callback(msg)
+                        await self.bus.reply(
+                            msg, data=reply.data, metadata=reply.metadata
+                        )
+                    for hook in self.hooks.event_processed:
+                        hook(self, actor, msg)
                 except Exception as exc:
-                    self.instrumentation.event_processing_failed(self, actor, msg, exc)
+                    for hook in self.hooks.event_processing_failed:
+                        hook(self, actor, msg, exc)
                     continue
 
+    async def _create_process_loop(
+        self,
+        actor: t.Union[
+            Subscriber[t.Any, t.Any, t.Any, t.Any, t.Any],
+            Service[t.Any, t.Any, t.Any, t.Any, t.Any],
+        ],
+        event: EventSpec[t.Any, t.Any, t.Any, t.Any, t.Any],
+        processes: int,
+    ) -> None:
+        """Process messages within a pool of worker processes.
+
+        Instrumentation receives messages holding decoded scope and metadata, but
+        raw payload, because payloads are only decoded within worker processes.
+        """
+        # Only subscribers may drop messages using predicates
+        subscriber = (
+            actor
+            if isinstance(actor, Subscriber)
+            and (
+                actor.header_predicate is not None
+                or actor.metadata_predicate is not None
+            )
+            else None
+        )
+        # Handler, event and codec are sent once to each worker process
+        executor = ProcessPoolExecutor(
+            max_workers=processes,
+            initializer=initialize_worker,
+            initargs=(actor.handler, event, self.bus.codec),
+        )
+        # Keep workers busy while next messages are shipped
+        semaphore = Semaphore(2 * processes)
+        try:
+            async with self.bus.subscribe_raw(
+                event, queue=actor.queue, filters=actor.flow.filters
+            ) as subscription:
+                async with create_task_group() as task_group:
+                    for hook in self.hooks.actor_started:
+                        hook(self, actor)
+                    async for pubsub_msg in subscription:
+                        if subscriber is not None and not self._accept(
+                            subscriber, event, pubsub_msg
+                        ):
+                            continue
+                        await semaphore.acquire()
+                        task_group.start_soon(
+                            self._process_in_worker,
+                            executor,
+                            semaphore,
+                            actor,
+                            event,
+                            RawMessage.from_pubsub_msg(pubsub_msg),
+                        )
+        finally:
+            executor.shutdown(wait=False)
+
+    def _accept(
+        self,
+        actor: Subscriber[t.Any, t.Any, t.Any, t.Any, t.Any],
+        event: EventSpec[t.Any, t.Any, t.Any, t.Any, t.Any],
+        msg: PubSubMsg,
+    ) -> bool:
+        """Evaluate subscriber predicates before shipping message to a worker."""
+        try:
+            accepted, _ = self.bus._check_predicates(
+                msg, event, actor.header_predicate, actor.metadata_predicate
+            )
+        except Exception as exc:
+            logging.error("Failed to process message", exc_info=exc)
+            return False
+        if not accepted:
+            self.bus._drop(msg, event, partial(self._event_dropped, actor))
+        return accepted
+
+    async def _process_in_worker(
+        self,
+        executor: Executor,
+        semaphore: Semaphore,
+        actor: t.Union[
+            Subscriber[t.Any, t.Any, t.Any, t.Any, t.Any],
+            Service[t.Any, t.Any, t.Any, t.Any, t.Any],
+        ],
+        event: EventSpec[t.Any, t.Any, t.Any, t.Any, t.Any],
+        raw: RawMessage,
+    ) -> None:
+        try:
+            headers, published_at, message_id, traceparent = split_headers(raw.headers)
+            codec = self.bus.codec
+            msg = Message(
+                subject=raw.subject,
+                scope=event.extract_scope(raw.subject, codec),
+                data=raw.payload,
+                metadata=codec.decode_headers(headers, event.metadata_schema),
+                event=event,
+                published_at=published_at,
+                message_id=message_id,
+                traceparent=traceparent,
+            )
+        except Exception as exc:
+            semaphore.release()
+            logging.error("Failed to process message", exc_info=exc)
+            return
+        self._event_received(actor, msg)
+        try:
+            with self._trace_handler(actor.flow.name, traceparent):
+                reply = await asyncio.get_running_loop().run_in_executor(
+                    executor, process_message, raw
+                )
+                if reply and raw.reply_subject:
+                    payload, headers = reply
+                    await self.bus._publish(
+                        event, raw.reply_subject, payload, headers, reply=True
+                    )
+            for hook in self.hooks.event_processed:
+                hook(self, actor, msg)
+        except Exception as exc:
+            for hook in self.hooks.event_processing_failed:
+                hook(self, actor, msg, exc)
+        finally:
+            semaphore.release()
+
     async def _start_actors(self) -> None:
+        if self.share_subscriptions:
+            self._start_dispatchers()
         for actor in self.actors:
-            self.instrumentation.actor_starting(self, actor)
+            for hook in self.hooks.actor_starting:
+                hook(self, actor)
             if isinstance(actor, Producer):
                 # Start producer
                 self.task_group.start_soon(
@@ -97,6 +416,13 @@ class Play:
                 )
                 # Continue in order to start next actor
                 continue
+            if isinstance(actor, BatchSubscriber):
+                # Start batch subscriber
+                self.task_group.start_soon(
+                    self._create_batch_susbcriber_loop, actor, name=actor.flow.name
+                )
+                # Continue in order to start next actor
+                continue
             if isinstance(actor, Service):
                 # Start service
                 self.task_group.start_soon(
@@ -114,7 +440,10 @@ class Play:
             raise RuntimeError("Play has been cancelled")
         if self._task_group is not None:
             return
-        self.instrumentation.play_starting(self)
+        # Instrumentation may have changed since play was created
+        self.hooks = self._resolve_hooks()
+        for hook in self.hooks.play_starting:
+            hook(self)
         # Create and start exist task
         self._exit_stack = AsyncExitStack()
         await self._exit_stack.__aenter__()
@@ -128,15 +457,19 @@ class Play:
         # Try to create actors
         try:
             await self._start_actors()
+            if self.watchdog is not None:
+                self.task_group.start_soon(self.watchdog.watch, self, name="watchdog")
         except BaseException as _exc:
             exc_type, exc, tb = sys.exc_info()
-            self.instrumentation.play_failed(self, [_exc])
+            for hook in self.hooks.play_failed:
+                hook(self, [_exc])
             self._task_group.cancel_scope.cancel()
             await self._exit_stack.__aexit__(exc_type, exc, tb)
             raise
         # Push async callback
         self._exit_stack.push_async_callback(self._on_exit)
-        self.instrumentation.play_started(self)
+        for hook in self.hooks.play_started:
+            hook(self)
 
     def cancel(self) -> None:
         self.user_cancelled = True
@@ -147,12 +480,14 @@ class Play:
         """Stop play"""
         if self._exit_stack is None:
             return
-        self.instrumentation.play_stopping(self)
+        for hook in self.hooks.play_stopping:
+            hook(self)
         try:
             self.task_group.cancel_scope.cancel()
             await self._exit_stack.__aexit__(*sys.exc_info())
         finally:
-            self.instrumentation.play_stopped(self)
+            for hook in self.hooks.play_stopped:
+                hook(self)
 
     async def run_forever(self) -> None:
         if self.stopped is None:
@@ -186,8 +521,34 @@ class Play:
                 return
             raise
 
-    def main(self) -> None:
+    def main(self, workers: t.Optional[int] = None, loop: str = "auto") -> None:
+        """Run play until interrupted.
+
+        Arguments:
+            workers: When set, run a copy of the play within each one of `workers`
+                processes. Crashed workers are restarted, and SIGINT or SIGTERM are
+                forwarded to workers for a graceful shutdown.
+            loop: Event loop used to run the play. One of "auto", "asyncio" or
+                "uvloop". By default, uvloop is used when installed.
+        """
+        from ..runner import Supervisor, get_backend
+
+        backend, backend_options = get_backend(loop)
+        if workers is not None:
+            return Supervisor(partial(self.main, loop=loop), workers=workers).run()
         try:
-            return run(self)
+            return run(self, backend=backend, backend_options=backend_options)
         except KeyboardInterrupt:
             pass
+
+
+def _can_share_subscription(
+    actor: Subscriber[t.Any, t.Any, t.Any, t.Any, t.Any], registry: EventRegistry[t.Any]
+) -> bool:
+    """Subscribers within a queue group, using processes or expecting requests need their own subscription."""
+    return (
+        actor.queue is None
+        and not actor.processes
+        and actor.flow.event.reply_schema is type(None)  # noqa: E721
+        and actor.flow.event.syntax == registry.syntax
+    )
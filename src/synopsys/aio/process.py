@@ -0,0 +1,98 @@
+"""Run actor handlers within worker processes.
+
+Messages are shipped to worker processes as raw payload and headers, so that
+decoding, handler execution and reply encoding happen outside of the event loop.
+"""
+import asyncio
+import inspect
+import typing as t
+from dataclasses import dataclass
+
+from ..entities.events import Event
+from ..entities.messages import Message, Reply
+from ..interfaces.codec import CodecBackend
+from ..interfaces.pubsub import PubSubMsg
+from ..operations.delivery import split_headers
+
+# Event loop used to run coroutine handlers within a worker process
+_worker_loop: t.Optional[asyncio.AbstractEventLoop] = None
+
+# Handler, event and codec of the actor served by a worker process
+_worker_actor: t.Optional[
+    t.Tuple[
+        t.Callable[[Message[t.Any, t.Any, t.Any, t.Any, t.Any]], t.Any],
+        Event[t.Any, t.Any, t.Any, t.Any, t.Any],
+        CodecBackend,
+    ]
+] = None
+
+
+@dataclass
+class RawMessage:
+    """A picklable message which can be sent to a worker process."""
+
+    subject: str
+    payload: bytes
+    headers: t.Dict[str, str]
+    reply_subject: t.Optional[str] = None
+
+    @classmethod
+    def from_pubsub_msg(cls, msg: PubSubMsg) -> "RawMessage":
+        return cls(
+            subject=msg.get_subject(),
+            payload=msg.get_payload(),
+            headers=msg.get_headers(),
+            reply_subject=msg.get_reply_subject(),
+        )
+
+
+def initialize_worker(
+    handler: t.Callable[[Message[t.Any, t.Any, t.Any, t.Any, t.Any]], t.Any],
+    event: Event[t.Any, t.Any, t.Any, t.Any, t.Any],
+    codec: CodecBackend,
+) -> None:
+    """Register the actor served by a worker process.
+
+    This function is the initializer of the process pool, so that handler, event
+    and codec are pickled once per worker process instead of once per message.
+    """
+    global _worker_actor
+    _worker_actor = (handler, event, codec)
+
+
+def process_message(raw: RawMessage) -> t.Optional[t.Tuple[bytes, t.Dict[str, str]]]:
+    """Decode a raw message, run handler and encode reply.
+
+    This function is executed within a worker process initialized using
+    `initialize_worker()`.
+
+    Returns:
+        A tuple (payload, headers) when handler returns a reply, else None.
+    """
+    global _worker_loop
+    if _worker_actor is None:
+        raise RuntimeError("Worker process was not initialized")
+    handler, event, codec = _worker_actor
+    headers, published_at, message_id, traceparent = split_headers(raw.headers)
+    msg = Message(
+        subject=raw.subject,
+        scope=event.extract_scope(raw.subject, codec=codec),
+        data=codec.decode_payload(raw.payload, event.schema),
+        metadata=codec.decode_headers(headers, event.metadata_schema),
+        event=event,
+        published_at=published_at,
+        message_id=message_id,
+        traceparent=traceparent,
+    )
+    result = handler(msg)
+    if inspect.isawaitable(result):
+        if _worker_loop is None:
+            _worker_loop = asyncio.new_event_loop()
+        result = _worker_loop.run_until_complete(result)
+    if isinstance(result, Reply):
+        if result.metadata is None:
+            reply_headers: t.Dict[str, str] = {}
+        else:
+            reply_headers = codec.encode_headers(result.metadata)
+        return codec.encode_payload(result.data), reply_headers
+    return None
@@ -0,0 +1,49 @@
+import typing as t
+
+from ..entities.events import Event
+from ..types import DataT, MetaT, ScopeT
+
+if t.TYPE_CHECKING:
+    from .bus import EventBus  # pragma: no cover
+
+
+class Publisher(t.Generic[ScopeT, DataT, MetaT]):
+    """A publisher bound to an event and a scope.
+
+    Subject is rendered and headers are encoded once when the publisher is created,
+    so that publishing a message only requires encoding its payload.
+    """
+
+    def __init__(
+        self,
+        bus: "EventBus",
+        event: Event[ScopeT, DataT, MetaT, t.Any, t.Any],
+        subject: str,
+        headers: t.Dict[str, str],
+    ) -> None:
+        """Do not use __init__ constructor directly. Instead use EventBus.publisher() method."""
+        self.bus = bus
+        self.event = event
+        self.subject = subject
+        self.headers = headers
+
+    def __repr__(self) -> str:
+        return f"Publisher(event='{self.event.name}', subject='{self.subject}')"
+
+    async def publish(
+        self,
+        data: DataT,
+        *,
+        metadata: MetaT = ...,  # type: ignore[assignment]
+        timeout: t.Optional[float] = None,
+    ) -> None:
+        """Publish and wait until event is flushed by underlying messaging system.
+
+        When metadata is not provided, headers encoded on publisher creation are used.
+        """
+        payload, headers = self.bus._encode(
+            self.event, data, metadata, headers=self.headers
+        )
+        return await self.bus._publish(
+            self.event, self.subject, payload, headers, timeout
+        )
@@ -0,0 +1,334 @@
+"""Schedule delayed publishes using a hashed timing wheel.
+
+A timing wheel is a circular array of slots, each slot holding the timers
+expiring within a tick. A timer is stored in the slot of its expiration tick
+modulo the number of slots, so scheduling and cancelling a timer are O(1)
+operations, whatever the number of pending timers. A single task advances the
+wheel once per tick and fires all timers expired within the tick as a batch,
+instead of running one sleeping task per timer.
+"""
+import asyncio
+import itertools
+import logging
+import math
+import time
+import typing as t
+from dataclasses import dataclass, field
+from uuid import uuid4
+
+from ..entities.events import Event
+from ..interfaces.timers import TimerStore
+from ..operations.delivery import PUBLISHED_AT_HEADER
+
+if t.TYPE_CHECKING:
+    from .bus import EventBus  # pragma: no cover
+
+
+T = t.TypeVar("T")
+
+logger = logging.getLogger("synopsys.timers")
+
+
+def loop_time() -> float:
+    """Get time of running event loop, or monotonic time outside of an event loop.
+
+    Timers must use the clock of the event loop they sleep on, so that they neither
+    fire early nor late when event loop does not use the monotonic clock.
+    """
+    try:
+        return asyncio.get_running_loop().time()
+    except RuntimeError:
+        return time.monotonic()
+
+
+class Timer(t.Generic[T]):
+    """A timer scheduled within a timing wheel."""
+
+    __slots__ = ("item", "deadline", "tick", "seq", "_wheel")
+
+    def __init__(
+        self,
+        wheel: "TimingWheel[T]",
+        item: T,
+        deadline: float,
+        tick: int,
+        seq: int,
+    ) -> None:
+        self.item = item
+        self.deadline = deadline
+        self.tick = tick
+        self.seq = seq
+        self._wheel: t.Optional[TimingWheel[T]] = wheel
+
+    @property
+    def pending(self) -> bool:
+        """True until timer is fired or cancelled."""
+        return self._wheel is not None
+
+    def cancel(self) -> bool:
+        """Cancel timer. Returns False when timer already fired or was already cancelled."""
+        if self._wheel is None:
+            return False
+        return self._wheel.cancel(self)
+
+
+class TimingWheel(t.Generic[T]):
+    """A hashed timing wheel.
+
+    Timers never fire before their deadline, and fire at most one tick after their
+    deadline when the event loop is not busy.
+    """
+
+    def __init__(
+        self,
+        tick: float = 0.01,
+        size: int = 512,
+        clock: t.Callable[[], float] = loop_time,
+    ) -> None:
+        """Create a new timing wheel.
+
+        Arguments:
+            tick: Duration of a tick in seconds, I.E, the precision of timers.
+            size: Number of slots. Timers expiring after `tick * size` seconds
+                wait for the wheel to go round as many times as needed.
+            clock: Monotonic clock returning a time in seconds. Defaults to the
+                clock of the running event loop.
+        """
+        if tick <= 0:
+            raise ValueError("tick must be greater than 0")
+        if size < 1:
+            raise ValueError("size must be greater than 0")
+        self.tick = tick
+        self.size = size
+        self.clock = clock
+        # Each slot maps timers sequence number to timers
+        self._slots: t.List[t.Dict[int, Timer[T]]] = [{} for _ in range(size)]
+        # Origin is set on first use, so that a wheel created before event loop
+        # is started uses the clock of this event loop
+        self._origin: t.Optional[float] = None
+        # Last tick processed
+        self._cursor = 0
+        self._count = 0
+        self._seq = itertools.count()
+        self._wakeup: t.Optional[asyncio.Event] = None
+
+    def __len__(self) -> int:
+        """Get number of pending timers."""
+        return self._count
+
+    def _now(self) -> t.Tuple[float, float]:
+        """Get current time and wheel origin."""
+        now = self.clock()
+        if self._origin is None:
+            self._origin = now
+        return now, self._origin
+
+    def schedule(self, delay: float, item: T) -> Timer[T]:
+        """Schedule a timer expiring after delay in seconds."""
+        now, origin = self._now()
+        deadline = now + max(delay, 0)
+        # Ceil ensures that timer never fires before deadline
+        tick = max(self._cursor + 1, math.ceil((deadline - origin) / self.tick))
+        timer = Timer(self, item, deadline, tick, next(self._seq))
+        self._slots[tick % self.size][timer.seq] = timer
+        self._count += 1
+        if self._wakeup is not None:
+            self._wakeup.set()
+        return timer
+
+    def cancel(self, timer: Timer[T]) -> bool:
+        """Cancel a timer. Returns False when timer is not pending within this wheel."""
+        if timer._wheel is not self:
+            return False
+        del self._slots[timer.tick % self.size][timer.seq]
+        timer._wheel = None
+        self._count -= 1
+        return True
+
+    def advance(self, now: t.Optional[float] = None) -> t.List[Timer[T]]:
+        """Advance wheel up to given time, and remove expired timers.
+
+        Returns:
+            Expired timers sorted by expiration tick, then by scheduling order.
+        """
+        current, origin = self._now()
+        if now is None:
+            now = current
+        return self._expire(math.floor((now - origin) / self.tick))
+
+    def _expire(self, target: int) -> t.List[Timer[T]]:
+        """Remove timers expiring up to target tick."""
+        if target <= self._cursor:
+            return []
+        slots: t.Iterable[int]
+        if target - self._cursor >= self.size:
+            # Wheel went round at least once, every slot must be visited
+            slots = range(self.size)
+        else:
+            slots = (idx % self.size for idx in range(self._cursor + 1, target + 1))
+        self._cursor = target
+        expired: t.List[Timer[T]] = []
+        for idx in slots:
+            slot = self._slots[idx]
+            if not slot:
+                continue
+            due = [timer for timer in slot.values() if timer.tick <= target]
+            for timer in due:
+                del slot[timer.seq]
+                timer._wheel = None
+            expired.extend(due)
+        self._count -= len(expired)
+        expired.sort(key=lambda timer: (timer.tick, timer.seq))
+        return expired
+
+    async def run(
+        self, callback: t.Callable[[t.List[Timer[T]]], t.Awaitable[None]]
+    ) -> None:
+        """Fire expired timers until cancelled.
+
+        Timers expired within the same tick are given to callback as a single batch.
+        Task sleeps without ticking while there is no pending timer.
+        """
+        self._wakeup = asyncio.Event()
+        try:
+            while True:
+                if not self._count:
+                    self._wakeup.clear()
+                    await self._wakeup.wait()
+                    continue
+                target = self._cursor + 1
+                now, origin = self._now()
+                delay = origin + target * self.tick - now
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                    # Event loop may wake up before clock reaches the end of tick
+                    continue
+                # Clock reached the end of target tick, rounding errors must not
+                # prevent this tick from expiring
+                current = math.floor((now - origin) / self.tick)
+                expired = self._expire(max(current, target))
+                if expired:
+                    await callback(expired)
+        finally:
+            self._wakeup = None
+
+
+@dataclass
+class ScheduledMessage:
+    """An encoded message scheduled to be published later."""
+
+    subject: str
+    """The subject message is published on."""
+
+    payload: bytes
+    """The encoded message payload."""
+
+    headers: t.Dict[str, str]
+    """The encoded message headers."""
+
+    deadline: float
+    """Publish time in seconds since epoch."""
+
+    id: str = field(default_factory=lambda: uuid4().hex)
+    """A unique ID, used to remove message from timer store once published."""
+
+    event: t.Optional[Event[t.Any, t.Any, t.Any, t.Any, t.Any]] = field(
+        default=None, compare=False, repr=False
+    )
+    """The event published. Events are not persisted, so messages restored
+    from a timer store are published as raw messages."""
+
+
+class PublishScheduler(TimingWheel[ScheduledMessage]):
+    """A timing wheel publishing scheduled messages using an event bus.
+
+    When a store is provided, pending messages are persisted, and messages
+    pending when scheduler is created are restored from the store.
+    Messages are removed from the store once published.
+    """
+
+    def __init__(
+        self,
+        tick: float = 0.01,
+        size: int = 512,
+        store: t.Optional[TimerStore] = None,
+        clock: t.Callable[[], float] = loop_time,
+    ) -> None:
+        """Create a new scheduler.
+
+        Arguments:
+            tick: Duration of a tick in seconds, I.E, the precision of timers.
+            size: Number of slots of the timing wheel.
+            store: An optional store persisting pending messages.
+            clock: Monotonic clock returning a time in seconds. Defaults to the
+                clock of the running event loop.
+        """
+        super().__init__(tick=tick, size=size, clock=clock)
+        self.store = store
+        self._bus: t.Optional["EventBus"] = None
+        self._task: t.Optional["asyncio.Task[None]"] = None
+        if store is not None:
+            for message in store.load():
+                super().schedule(message.deadline - time.time(), message)
+
+    def schedule_message(
+        self, bus: "EventBus", message: ScheduledMessage
+    ) -> Timer[ScheduledMessage]:
+        """Schedule a message, and start publishing expired messages using bus."""
+        if self.store is not None:
+            self.store.add(message)
+        timer = self.schedule(message.deadline - time.time(), message)
+        self.start(bus)
+        return timer
+
+    def cancel(self, timer: Timer[ScheduledMessage]) -> bool:
+        cancelled = super().cancel(timer)
+        if cancelled and self.store is not None:
+            self.store.remove(timer.item.id)
+        return cancelled
+
+    def start(self, bus: "EventBus") -> None:
+        """Start publishing expired messages using bus, unless already started."""
+        if self._task is not None:
+            return
+        self._bus = bus
+        self._task = asyncio.get_running_loop().create_task(self.run(self._publish))
+
+    async def stop(self) -> None:
+        """Stop publishing expired messages. Pending messages are kept."""
+        task, self._task = self._task, None
+        if task is None:
+            return
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+    async def _publish(self, timers: t.List[Timer[ScheduledMessage]]) -> None:
+        bus = self._bus
+        assert bus is not None
+        for timer in timers:
+            message = timer.item
+            # Delivery latency is measured from the time message is actually published
+            if PUBLISHED_AT_HEADER in message.headers:
+                message.headers[PUBLISHED_AT_HEADER] = str(time.time_ns())
+            try:
+                if message.event is None:
+                    await bus.pubsub.publish(
+                        subject=message.subject,
+                        payload=message.payload,
+                        headers=message.headers,
+                    )
+                else:
+                    await bus._publish(
+                        message.event, message.subject, message.payload, message.headers
+                    )
+            except Exception as exc:
+                # Message is kept within store, so that it is published after restart
+                logger.error(
+                    f"Failed to publish scheduled message {message.id}", exc_info=exc
+                )
+                continue
+            if self.store is not None:
+                self.store.remove(message.id)
@@ -0,0 +1,216 @@
+"""Trace messages across publishers, subscribers and services.
+
+Trace context is propagated within message headers using the W3C Trace Context
+`traceparent` header, so that a trace can follow a message from `EventBus.publish()`
+to subscribers, and from a request to the service reply. Within a process, the
+current span is held in a context variable, so that messages published by a
+handler belong to the trace of the message being handled.
+"""
+import random
+import time
+import typing as t
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+
+from ..interfaces.tracing import SpanExporter
+from ..operations.delivery import TRACEPARENT_HEADER
+
+SPAN_KINDS = ("internal", "server", "client", "producer", "consumer")
+"""Kinds of span, as defined by OpenTelemetry."""
+
+_current_span: "ContextVar[t.Optional[Span]]" = ContextVar(
+    "synopsys_current_span", default=None
+)
+
+
+@dataclass
+class Span:
+    """A span records an operation within a trace."""
+
+    name: str
+    """Name of the operation."""
+
+    trace_id: str
+    """Trace ID encoded as 32 hexadecimal characters."""
+
+    span_id: str
+    """Span ID encoded as 16 hexadecimal characters."""
+
+    parent_id: t.Optional[str] = None
+    """ID of parent span. Root spans do not have a parent."""
+
+    kind: str = "internal"
+    """Kind of span. One of 'internal', 'server', 'client', 'producer' or 'consumer'."""
+
+    start_time: float = field(default_factory=time.time)
+    """Start time in seconds since epoch."""
+
+    end_time: t.Optional[float] = None
+    """End time in seconds since epoch. None until span is finished."""
+
+    attributes: t.Dict[str, t.Any] = field(default_factory=dict)
+    """Attributes describing the operation."""
+
+    error: t.Optional[str] = None
+    """Description of the exception raised by the operation, if any."""
+
+    @property
+    def traceparent(self) -> str:
+        """Get span context as a W3C traceparent header value."""
+        return f"00-{self.trace_id}-{self.span_id}-01"
+
+    @property
+    def duration(self) -> t.Optional[float]:
+        """Get span duration in seconds, or None if span is not finished."""
+        if self.end_time is None:
+            return None
+        return self.end_time - self.start_time
+
+
+def parse_traceparent(value: t.Optional[str]) -> t.Optional[t.Tuple[str, str]]:
+    """Parse a W3C traceparent header value into a tuple (trace_id, span_id).
+
+    Returns None when value is missing or invalid.
+    """
+    if not value:
+        return None
+    parts = value.strip().split("-")
+    if len(parts) < 4 or len(parts[1]) != 32 or len(parts[2]) != 16:
+        return None
+    try:
+        int(parts[1], 16)
+        int(parts[2], 16)
+    except ValueError:
+        return None
+    return parts[1], parts[2]
+
+
+def get_current_span() -> t.Optional[Span]:
+    """Get the span active within current context."""
+    return _current_span.get()
+
+
+class Tracer:
+    """Create spans and export them once finished.
+
+    Finished spans are buffered, and exported once `max_batch` spans
+    are buffered or when `flush()` is called.
+    """
+
+    def __init__(
+        self,
+        exporter: SpanExporter,
+        max_batch: int = 512,
+    ) -> None:
+        """Create a new tracer.
+
+        Arguments:
+            exporter: The exporter used to send finished spans.
+            max_batch: Maximum number of finished spans buffered before export.
+        """
+        if max_batch < 1:
+            raise ValueError("max_batch must be greater than 0")
+        self.exporter = exporter
+        self.max_batch = max_batch
+        self._buffer: t.List[Span] = []
+
+    def create_span(
+        self,
+        name: str,
+        kind: str = "internal",
+        *,
+        parent: t.Optional[str] = None,
+        attributes: t.Optional[t.Dict[str, t.Any]] = None,
+    ) -> Span:
+        """Create a span. Span must be finished using `finish()` method.
+
+        Arguments:
+            name: Name of the operation.
+            kind: Kind of span.
+            parent: A traceparent header value used as parent context. When None,
+                span is a child of current span, or a root span if there is no current span.
+            attributes: Attributes describing the operation.
+
+        Returns:
+            A new span.
+        """
+        if kind not in SPAN_KINDS:
+            raise ValueError(
+                f"Invalid span kind: '{kind}'. Expected one of {list(SPAN_KINDS)}"
+            )
+        context = parse_traceparent(parent)
+        if context is None:
+            current = _current_span.get()
+            if current is not None:
+                context = current.trace_id, current.span_id
+        if context is None:
+            trace_id, parent_id = f"{random.getrandbits(128):032x}", None
+        else:
+            trace_id, parent_id = context
+        return Span(
+            name=name,
+            trace_id=trace_id,
+            span_id=f"{random.getrandbits(64):016x}",
+            parent_id=parent_id,
+            kind=kind,
+            attributes=attributes or {},
+        )
+
+    @contextmanager
+    def start_span(
+        self,
+        name: str,
+        kind: str = "internal",
+        *,
+        parent: t.Optional[str] = None,
+        attributes: t.Optional[t.Dict[str, t.Any]] = None,
+        activate: bool = False,
+    ) -> t.Iterator[Span]:
+        """Start a span, and finish it on context exit.
+
+        Arguments:
+            name: Name of the operation.
+            kind: Kind of span.
+            parent: A traceparent header value used as parent context. When None,
+                span is a child of current span, or a root span if there is no current span.
+            attributes: Attributes describing the operation.
+            activate: When True, span is the current span until context exit.
+
+        Returns:
+            A context manager yielding the span.
+        """
+        span = self.create_span(name, kind, parent=parent, attributes=attributes)
+        token = _current_span.set(span) if activate else None
+        try:
+            yield span
+        except BaseException as exc:
+            span.error = repr(exc)
+            raise
+        finally:
+            if token is not None:
+                _current_span.reset(token)
+            self.finish(span)
+
+    def inject(self, span: Span, headers: t.Dict[str, str]) -> None:
+        """Inject span context into message headers (in place)."""
+        headers[TRACEPARENT_HEADER] = span.traceparent
+
+    def finish(self, span: Span) -> None:
+        """Finish a span and export buffered spans when buffer is full."""
+        span.end_time = time.time()
+        self._buffer.append(span)
+        if len(self._buffer) >= self.max_batch:
+            self.flush()
+
+    def flush(self) -> None:
+        """Export all buffered spans."""
+        if not self._buffer:
+            return
+        spans, self._buffer = self._buffer, []
+        self.exporter.export(spans)
+
+    def shutdown(self) -> None:
+        """Export buffered spans and shutdown exporter."""
+        self.flush()
+        self.exporter.shutdown()
@@ -0,0 +1,170 @@
+"""Keep the latest data of an event in memory, indexed by key.
+
+A materialized view is fed by the messages of an event, so that reading the
+current state of an entity is a dictionary lookup instead of a request. The
+view is bounded: least recently used entries are evicted once the view is full,
+and entries may expire after some time without being updated.
+"""
+import logging
+import time
+import typing as t
+from collections import OrderedDict
+
+from ..entities.messages import Message
+from ..operations.streams import iterate_until
+from ..types import DataT
+
+logger = logging.getLogger("synopsys.views")
+
+KeyT = t.TypeVar("KeyT", bound=t.Hashable)
+T = t.TypeVar("T")
+
+
+class MaterializedView(t.Generic[KeyT, DataT]):
+    """A bounded mapping from keys to the latest data received for each key.
+
+    Example:
+
+    ```python
+    async with bus.materialize(DEVICE_STATE, key=lambda msg: msg.scope["device"]) as view:
+        state = view.get("device-1")
+    ```
+    """
+
+    def __init__(
+        self,
+        key: t.Callable[[Message[t.Any, DataT, t.Any, t.Any, t.Any]], KeyT],
+        *,
+        max_size: int = 10000,
+        ttl: t.Optional[float] = None,
+        clock: t.Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Create a new materialized view.
+
+        Arguments:
+            key: A function returning the key of a message.
+            max_size: Maximum number of entries. When reached, the least recently
+                used entry is evicted.
+            ttl: Time in seconds after which an entry which was not updated expires.
+                By default, entries never expire.
+            clock: Function returning current time in seconds.
+        """
+        if max_size < 1:
+            raise ValueError("max_size must be greater than 0")
+        if ttl is not None and ttl <= 0:
+            raise ValueError("ttl must be greater than 0")
+        self.key = key
+        self.max_size = max_size
+        self.ttl = ttl
+        self.clock = clock
+        # Number of lookups which found an entry, and which did not
+        self.hits = 0
+        self.misses = 0
+        # Exception which stopped the view from following messages, if any
+        self.error: t.Optional[Exception] = None
+        self._closed = False
+        # Entries are ordered from least to most recently used
+        self._entries: "OrderedDict[KeyT, t.Tuple[float, DataT]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: object) -> bool:
+        return self._lookup(key) is not None
+
+    def __getitem__(self, key: KeyT) -> DataT:
+        entry = self._lookup(key)
+        if entry is None:
+            raise KeyError(key)
+        return entry[1]
+
+    @t.overload
+    def get(self, key: KeyT) -> t.Optional[DataT]: ...  # pragma: no cover
+
+    @t.overload
+    def get(self, key: KeyT, default: T) -> t.Union[DataT, T]: ...  # pragma: no cover
+
+    def get(self, key: KeyT, default: t.Any = None) -> t.Any:
+        """Get the latest data of a key, or default when key is unknown or expired."""
+        entry = self._lookup(key)
+        if entry is None:
+            return default
+        return entry[1]
+
+    def keys(self) -> t.List[KeyT]:
+        """Get the keys of entries which did not expire, from least to most recently used."""
+        self.expire()
+        return list(self._entries)
+
+    def _lookup(self, key: t.Any) -> t.Optional[t.Tuple[float, DataT]]:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        if self.ttl is not None and entry[0] + self.ttl <= self.clock():
+            del self._entries[key]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry
+
+    def set(self, key: KeyT, data: DataT) -> None:
+        """Set the latest data of a key."""
+        self._entries[key] = (self.clock(), data)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def update(self, message: Message[t.Any, DataT, t.Any, t.Any, t.Any]) -> None:
+        """Set the latest data of the key of a message."""
+        self.set(self.key(message), message.data)
+
+    def load(self, items: t.Iterable[t.Tuple[KeyT, DataT]]) -> None:
+        """Load a snapshot of entries.
+
+        Keys already present are not overwritten, because data received from
+        messages is more recent than a snapshot requested after subscribing.
+        """
+        for key, data in items:
+            if key not in self._entries:
+                self.set(key, data)
+
+    def discard(self, key: KeyT) -> None:
+        """Remove a key from the view, if present."""
+        self._entries.pop(key, None)
+
+    def expire(self) -> None:
+        """Remove expired entries."""
+        if self.ttl is None:
+            return
+        deadline = self.clock() - self.ttl
+        for key, (updated_at, _) in list(self._entries.items()):
+            if updated_at <= deadline:
+                del self._entries[key]
+
+    async def follow(
+        self, messages: t.AsyncIterator[Message[t.Any, DataT, t.Any, t.Any, t.Any]]
+    ) -> None:
+        """Update the view with messages until iterator is exhausted or view is closed.
+
+        When iterator raises an exception, the exception is kept within `error`
+        attribute and raised again, and the view is not updated anymore.
+        """
+        try:
+            async for msg in iterate_until(messages, lambda: self._closed):
+                try:
+                    self.update(msg)
+                except Exception as exc:
+                    logger.error(
+                        f"Failed to update view with message received on {msg.subject}",
+                        exc_info=exc,
+                    )
+        except Exception as exc:
+            self.error = exc
+            logger.error("View stopped following messages", exc_info=exc)
+            raise
+
+    def close(self) -> None:
+        """Stop updating the view. Entries can still be read."""
+        self._closed = True
@@ -0,0 +1,194 @@
+"""Run tests within an event loop using a virtual clock.
+
+The event loop clock does not follow wall-clock time. When all tasks are idle,
+waiting for a timer such as `asyncio.sleep()` or a timeout, the clock advances
+instantly to the next timer deadline instead of sleeping. Tests waiting for
+timeouts run in milliseconds, and the order in which callbacks run only depends
+on the order in which they are scheduled, so that deliveries are replayed in the
+same order on each run.
+
+Time only advances while the loop is idle: blocking calls and work running in
+executor threads take real time, during which the virtual clock advances by
+the real elapsed time.
+"""
+import asyncio
+import random
+import selectors
+import time
+import typing as t
+from concurrent.futures import Executor
+
+T = t.TypeVar("T")
+
+
+class _VirtualSelector(selectors.BaseSelector):
+    """A selector advancing the loop clock instead of blocking when no I/O is ready."""
+
+    def __init__(self) -> None:
+        self._selector = selectors.DefaultSelector()
+        self.loop: t.Optional["VirtualClockLoop"] = None
+
+    def register(
+        self, fileobj: t.Any, events: int, data: t.Any = None
+    ) -> selectors.SelectorKey:
+        return self._selector.register(fileobj, events, data)
+
+    def unregister(self, fileobj: t.Any) -> selectors.SelectorKey:
+        return self._selector.unregister(fileobj)
+
+    def modify(
+        self, fileobj: t.Any, events: int, data: t.Any = None
+    ) -> selectors.SelectorKey:
+        return self._selector.modify(fileobj, events, data)
+
+    def get_map(self) -> t.Mapping[t.Any, selectors.SelectorKey]:
+        return self._selector.get_map()
+
+    def close(self) -> None:
+        self._selector.close()
+
+    def select(
+        self, timeout: t.Optional[float] = None
+    ) -> t.List[t.Tuple[selectors.SelectorKey, int]]:
+        loop = self.loop
+        assert loop is not None
+        # Never block when I/O is ready or when loop has callbacks to run
+        ready = self._selector.select(0)
+        if ready or timeout == 0:
+            return ready
+        if loop._pending_threads:
+            # Virtual clock follows real time while threads are running
+            ready = self._selector.select(timeout)
+            loop._sync(timeout)
+            return ready
+        if timeout is None:
+            # Wait for I/O using real time
+            start = time.monotonic()
+            ready = self._selector.select(timeout)
+            loop._advance(time.monotonic() - start, timeout)
+            return ready
+        # All tasks are idle: jump to the next timer deadline
+        loop._advance(timeout, timeout)
+        return []
+
+
+class VirtualClockLoop(asyncio.SelectorEventLoop):
+    """An asyncio event loop using a virtual clock.
+
+    The virtual clock follows real time only while work submitted using
+    `loop.run_in_executor()` is running. Threads which the loop does not know
+    about, such as threads started by `anyio.to_thread.run_sync()`, or futures
+    of an executor awaited using `asyncio.wrap_future()`, are not followed: the
+    clock may jump to the next timer deadline while they are running.
+
+    Example:
+
+    ```python
+    loop = VirtualClockLoop()
+    # Completes instantly, virtual time is 3600 seconds
+    loop.run_until_complete(asyncio.sleep(3600))
+    loop.close()
+    ```
+    """
+
+    def __init__(self, start: float = 0) -> None:
+        """Create a new event loop.
+
+        Arguments:
+            start: The initial time of the virtual clock in seconds.
+        """
+        selector = _VirtualSelector()
+        self._virtual_time = start
+        self._pending_threads = 0
+        # Real time up to which virtual clock followed running threads
+        self._synced = time.monotonic()
+        super().__init__(selector)
+        selector.loop = self
+
+    def time(self) -> float:
+        """Get virtual time in seconds."""
+        return self._virtual_time
+
+    def _advance(self, elapsed: float, timeout: t.Optional[float]) -> None:
+        if timeout is not None:
+            elapsed = min(elapsed, timeout)
+        self._virtual_time += elapsed
+
+    def _sync(self, timeout: t.Optional[float]) -> None:
+        """Advance virtual clock by real time elapsed since last sync, up to timeout."""
+        elapsed = time.monotonic() - self._synced
+        if timeout is not None:
+            elapsed = min(elapsed, timeout)
+        self._virtual_time += elapsed
+        self._synced += elapsed
+
+    def run_in_executor(  # type: ignore[override]
+        self,
+        executor: t.Optional[Executor],
+        func: t.Callable[..., T],
+        *args: t.Any,
+    ) -> "asyncio.Future[T]":
+        # Virtual clock must not jump while a thread is running
+        if not self._pending_threads:
+            self._synced = time.monotonic()
+        future = super().run_in_executor(executor, func, *args)
+        self._pending_threads += 1
+
+        def done(_: "asyncio.Future[T]") -> None:
+            self._pending_threads -= 1
+
+        future.add_done_callback(done)
+        return future
+
+
+class VirtualClockPolicy(asyncio.DefaultEventLoopPolicy):
+    """An event loop policy creating event loops using a virtual clock.
+
+    This policy can be used with pytest-asyncio in order to run all tests of a
+    module using a virtual clock.
+    """
+
+    def __init__(self, start: float = 0) -> None:
+        super().__init__()
+        self.start = start
+
+    def new_event_loop(self) -> VirtualClockLoop:
+        return VirtualClockLoop(self.start)
+
+
+def run_virtual(
+    func: t.Callable[..., t.Awaitable[T]],
+    *args: t.Any,
+    start: float = 0,
+    seed: t.Optional[int] = 0,
+) -> T:
+    """Run an asynchronous function within an event loop using a virtual clock.
+
+    Tasks still running when the function returns are cancelled, like `asyncio.run()` does.
+
+    Arguments:
+        func: The asynchronous function to run, for example a play.
+        args: Positional arguments given to the function.
+        start: The initial time of the virtual clock in seconds.
+        seed: Seed of the `random` module, so that random values, such as trace IDs,
+            are the same on each run. Use None in order to keep the current state.
+
+    Returns:
+        The value returned by the function.
+    """
+    if seed is not None:
+        random.seed(seed)
+    loop = VirtualClockLoop(start)
+    asyncio.set_event_loop(loop)
+    try:
+        return loop.run_until_complete(func(*args))
+    finally:
+        try:
+            tasks = asyncio.all_tasks(loop)
+            for task in tasks:
+                task.cancel()
+            loop.run_until_complete(asyncio.gather(*tasks, return_exceptions=True))
+            loop.run_until_complete(loop.shutdown_asyncgens())
+        finally:
+            asyncio.set_event_loop(None)
+            loop.close()
@@ -2,23 +2,196 @@ import asyncio
 import typing as t
 
 from ..entities import Message, Reply
+from ..operations.subjects import match_subject
 from ..types import ReplyMetaT, ReplyT
 
 MsgT = t.TypeVar("MsgT", bound=Message[t.Any, t.Any, t.Any, t.Any, t.Any])
 
 
-class Waiter(t.Generic[MsgT]):
+class _Pending(t.Generic[MsgT]):
+    """A waiter attached to a dispatcher."""
+
+    __slots__ = ("subject", "exact", "predicate", "future")
+
     def __init__(
         self,
-        subscription: t.AsyncContextManager[t.AsyncIterator[MsgT]],
+        subject: t.Optional[str],
+        exact: bool,
+        predicate: t.Optional[t.Callable[[MsgT], bool]],
+        future: "asyncio.Future[MsgT]",
+    ) -> None:
+        self.subject = subject
+        self.exact = exact
+        self.predicate = predicate
+        self.future = future
+
+    def resolve(self, msg: MsgT) -> bool:
+        """Resolve future if message matches. Return True if waiter is done."""
+        if self.future.done():
+            return True
+        if not self.exact and self.subject is not None:
+            if not match_subject(self.subject, msg.subject, msg.event.syntax):
+                return False
+        if self.predicate is not None:
+            try:
+                if not self.predicate(msg):
+                    return False
+            except Exception as exc:
+                self.future.set_exception(exc)
+                return True
+        self.future.set_result(msg)
+        return True
+
+
+class Dispatcher(t.Generic[MsgT]):
+    """Dispatch messages received on a single subscription to many waiters.
+
+    Waiters waiting for an exact subject are indexed by subject, so that
+    a delivered message is matched against its waiters in constant time.
+    Waiters waiting for a subject filter or a predicate only are checked
+    against each delivered message.
+
+    Subscription is started when the first waiter is attached, and closed
+    once no waiter remains.
+    """
+
+    def __init__(
+        self,
+        subscription_factory: t.Callable[
+            [], t.AsyncContextManager[t.AsyncIterator[MsgT]]
+        ],
+        on_close: t.Optional[t.Callable[["Dispatcher[MsgT]"], None]] = None,
     ) -> None:
-        """Do not use __init__ constructor directly. Instead of .create() classmethod."""
-        self.subscription = subscription
-        self.task = asyncio.create_task(self.__start_in_foreground())
+        """Do not use __init__ constructor directly. Instead use EventBus.wait_in_background() method."""
+        self.subscription_factory = subscription_factory
+        self.on_close = on_close
+        self.closed = False
+        self._by_subject: t.Dict[str, t.List[_Pending[MsgT]]] = {}
+        self._filtered: t.List[_Pending[MsgT]] = []
+        self._pending: t.Dict["asyncio.Future[MsgT]", _Pending[MsgT]] = {}
+        self._task: t.Optional["asyncio.Task[None]"] = None
+        self._ready: t.Optional["asyncio.Future[None]"] = None
+
+    def __len__(self) -> int:
+        """Return number of pending waiters."""
+        return len(self._pending)
+
+    async def attach(
+        self,
+        subject: t.Optional[str] = None,
+        predicate: t.Optional[t.Callable[[MsgT], bool]] = None,
+        exact: bool = True,
+    ) -> "asyncio.Future[MsgT]":
+        """Attach a new waiter and return a future resolved with the first matching message.
 
-    async def __start_in_foreground(self) -> MsgT:
+        Arguments:
+            subject: An optional subject which must match message subject.
+            predicate: An optional function which must return True for message to match.
+            exact: When False, subject is considered as a subject filter.
+
+        Returns:
+            A future which is resolved when a matching message is received.
+        """
+        if self.closed:
+            raise RuntimeError("Dispatcher is closed")
+        loop = asyncio.get_running_loop()
+        future: "asyncio.Future[MsgT]" = loop.create_future()
+        pending = _Pending(subject, exact, predicate, future)
+        if subject is not None and exact:
+            self._by_subject.setdefault(subject, []).append(pending)
+        else:
+            self._filtered.append(pending)
+        self._pending[future] = pending
+        future.add_done_callback(self._detach)
+        if self._task is None:
+            self._ready = loop.create_future()
+            self._task = asyncio.create_task(self._run())
+        # Wait until subscription is started
+        if self._ready is not None and not self._ready.done():
+            await asyncio.wait(
+                [self._ready, self._task], return_when=asyncio.FIRST_COMPLETED
+            )
+        return future
+
+    def dispatch(self, msg: MsgT) -> None:
+        """Dispatch a message to matching waiters."""
+        indexed = self._by_subject.get(msg.subject)
+        if indexed:
+            remaining = [pending for pending in indexed if not pending.resolve(msg)]
+            if remaining:
+                self._by_subject[msg.subject] = remaining
+            else:
+                self._by_subject.pop(msg.subject)
+        if self._filtered:
+            self._filtered = [
+                pending for pending in self._filtered if not pending.resolve(msg)
+            ]
+
+    def close(self) -> None:
+        """Close the dispatcher. Pending waiters are cancelled."""
+        if self.closed:
+            return
+        self.closed = True
+        if self.on_close:
+            self.on_close(self)
+        if (
+            self._task
+            and not self._task.done()
+            and self._task is not asyncio.current_task()
+        ):
+            self._task.cancel()
+        for future in list(self._pending):
+            future.cancel()
+
+    def _detach(self, future: "asyncio.Future[MsgT]") -> None:
+        """Remove a resolved or cancelled waiter, and close dispatcher when no waiter remain."""
+        pending = self._pending.pop(future, None)
+        if pending is None:
+            return
+        if pending.exact and pending.subject is not None:
+            indexed = self._by_subject.get(pending.subject)
+            if indexed and pending in indexed:
+                indexed.remove(pending)
+                if not indexed:
+                    self._by_subject.pop(pending.subject)
+        elif pending in self._filtered:
+            self._filtered.remove(pending)
+        if not self._pending:
+            self.close()
+
+    def _fail(self, exc: BaseException) -> None:
+        """Fail all pending waiters."""
+        for future in list(self._pending):
+            if not future.done():
+                future.set_exception(exc)
+
+    async def _run(self) -> None:
+        try:
+            async with self.subscription_factory() as subscription:
+                if self._ready and not self._ready.done():
+                    self._ready.set_result(None)
+                async for msg in subscription:
+                    self.dispatch(msg)
+            self._fail(ValueError("No event received"))
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            self._fail(exc)
+        finally:
+            self.close()
+
+
+class Waiter(t.Generic[MsgT]):
+    def __init__(self, task: "asyncio.Future[MsgT]") -> None:
+        """Do not use __init__ constructor directly. Instead use .create() or .attach() classmethods."""
+        self.task = task
+
+    @staticmethod
+    async def _start_in_foreground(
+        subscription: t.AsyncContextManager[t.AsyncIterator[MsgT]],
+    ) -> MsgT:
         """Wait for a single event."""
-        async with self.subscription as observer:
+        async with subscription as observer:
             async for item in observer:
                 return item
         raise ValueError("No event received")
@@ -28,11 +201,22 @@ class Waiter(t.Generic[MsgT]):
         cls,
         subscription: t.AsyncContextManager[t.AsyncIterator[MsgT]],
     ) -> "Waiter[MsgT]":
-        """Create and start waiter in background."""
-        waiter = cls(subscription)
+        """Create and start waiter in background using a dedicated subscription."""
+        waiter = cls(asyncio.create_task(cls._start_in_foreground(subscription)))
         await asyncio.sleep(0)
         return waiter
 
+    @classmethod
+    async def attach(
+        cls,
+        dispatcher: Dispatcher[MsgT],
+        subject: t.Optional[str] = None,
+        predicate: t.Optional[t.Callable[[MsgT], bool]] = None,
+        exact: bool = True,
+    ) -> "Waiter[MsgT]":
+        """Create a waiter sharing the subscription of a dispatcher."""
+        return cls(await dispatcher.attach(subject, predicate, exact=exact))
+
     async def wait(self, timeout: t.Optional[float] = 5) -> MsgT:
         """Wait until event is received"""
         return await asyncio.wait_for(self.task, timeout=timeout)
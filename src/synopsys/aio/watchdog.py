@@ -0,0 +1,139 @@
+"""Detect event loop lag and handlers blocking the event loop.
+
+A task running within the event loop sleeps for a fixed interval and measures
+how late it wakes up. Meanwhile, a thread checks that this task keeps waking up.
+When the event loop is blocked for longer than the threshold, the thread captures
+the stack of the event loop thread, so that blocking can be attributed to the actor
+whose handler was running. Observations are reported from within the event loop,
+once it is no longer blocked.
+"""
+import sys
+import threading
+import time
+import traceback
+import typing as t
+from dataclasses import dataclass
+from types import CodeType, FrameType
+
+from anyio import CancelScope, current_time, sleep, to_thread
+
+from ..entities.actors import Actor, Producer
+
+if t.TYPE_CHECKING:
+    from .play import Play  # pragma: no cover
+
+
+class _Sample:
+    """Stack captured while event loop was blocked."""
+
+    __slots__ = ("beat", "actor", "stack")
+
+    def __init__(
+        self, beat: int, actor: t.Optional[Actor], stack: traceback.StackSummary
+    ) -> None:
+        self.beat = beat
+        self.actor = actor
+        self.stack = stack
+
+
+@dataclass
+class LoopWatchdog:
+    """Configure how a play watches the event loop.
+
+    Event loop lag is reported on each interval using `PlayInstrumentation.event_loop_lag()`.
+    Event loop blocked for longer than threshold is reported using
+    `PlayInstrumentation.event_loop_blocked()`.
+    """
+
+    threshold: float = 0.1
+    """Minimum time in seconds event loop must be blocked for blocking to be reported."""
+
+    interval: float = 0.05
+    """Time in seconds between two event loop lag measurements."""
+
+    def __post_init__(self) -> None:
+        if self.threshold <= 0 or self.interval <= 0:
+            raise ValueError("Watchdog threshold and interval must be greater than 0")
+
+    async def watch(self, play: "Play") -> None:
+        """Watch event loop until cancelled."""
+        loop_thread = threading.get_ident()
+        codes = _get_actor_codes(play)
+        # Beat is incremented and its timestamp updated each time watchdog task wakes up
+        state: t.Dict[str, t.Any] = {"beat": 0, "at": time.monotonic(), "sample": None}
+        stopped = threading.Event()
+
+        def monitor() -> None:
+            poll = min(self.threshold, self.interval) / 2
+            while not stopped.wait(poll):
+                beat, at = state["beat"], state["at"]
+                sample = state["sample"]
+                if sample is not None and sample.beat == beat:
+                    continue
+                if time.monotonic() - at < self.interval + self.threshold:
+                    continue
+                frame = sys._current_frames().get(loop_thread)
+                if frame is None:  # pragma: no cover
+                    continue
+                state["sample"] = _Sample(
+                    beat, _find_actor(frame, codes), traceback.extract_stack(frame)
+                )
+
+        thread = threading.Thread(target=monitor, name="synopsys-watchdog", daemon=True)
+        thread.start()
+        try:
+            while True:
+                start = current_time()
+                state["at"] = time.monotonic()
+                await sleep(self.interval)
+                lag = max(0.0, current_time() - start - self.interval)
+                sample = state["sample"]
+                state["beat"] += 1
+                for hook in play.hooks.event_loop_lag:
+                    hook(play, lag)
+                if lag < self.threshold:
+                    continue
+                if sample is not None and sample.beat == state["beat"] - 1:
+                    actor, stack = sample.actor, sample.stack
+                else:
+                    # Thread could not capture the stack in time
+                    actor, stack = None, traceback.StackSummary()
+                for hook in play.hooks.event_loop_blocked:
+                    hook(play, actor, lag, stack)
+        finally:
+            stopped.set()
+            # Thread may be capturing a stack, wait for it without blocking event loop
+            with CancelScope(shield=True):
+                await to_thread.run_sync(thread.join)
+
+
+def _get_actor_codes(play: "Play") -> t.Dict[CodeType, t.Optional[Actor]]:
+    """Get code objects which identify the actor running when found in a stack.
+
+    Code objects of play loops map to None, because actor is found in frame locals.
+    """
+    codes: t.Dict[CodeType, t.Optional[Actor]] = {
+        play._create_susbcriber_loop.__code__: None,
+        play._create_batch_susbcriber_loop.__code__: None,
+        play._create_service_loop.__code__: None,
+    }
+    for actor in play.actors:
+        if isinstance(actor, Producer):
+            code = getattr(actor.task_factory, "__code__", None)
+            if code is not None:
+                codes[code] = actor
+    return codes
+
+
+def _find_actor(
+    frame: t.Optional[FrameType], codes: t.Dict[CodeType, t.Optional[Actor]]
+) -> t.Optional[Actor]:
+    """Find the actor running in a stack, starting from innermost frame."""
+    while frame is not None:
+        if frame.f_code in codes:
+            actor = codes[frame.f_code]
+            if actor is None:
+                actor = frame.f_locals.get("actor")
+            return actor
+        frame = frame.f_back
+    return None
@@ -0,0 +1,256 @@
+"""Aggregate messages over time windows.
+
+Messages are grouped by the subject they are delivered on, which identifies
+their scope within an event, and reduced into a single value per window as
+soon as they are received, so that messages do not need to be kept in memory
+until the window closes. Windows are emitted in batches once closed.
+
+Tumbling windows have a fixed size and do not overlap. Sliding windows have a
+fixed size and start every `step` seconds, so that a message belongs to
+`size / step` windows. Windows are aligned on multiples of `step` seconds since
+epoch, and messages are assigned to windows according to the time they are
+received.
+"""
+import asyncio
+import heapq
+import itertools
+import math
+import time
+import typing as t
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+
+from ..entities.messages import Message
+from ..types import ScopeT
+from .batch import EndOfStream, buffered
+
+T = t.TypeVar("T")
+AccT = t.TypeVar("AccT")
+
+
+@dataclass
+class Reducer(t.Generic[T, AccT]):
+    """Reduce messages into an accumulated value."""
+
+    initial: t.Callable[[], AccT]
+    """Create the initial value of a window."""
+
+    add: t.Callable[[AccT, T], AccT]
+    """Add a message to the accumulated value, and return the new accumulated value."""
+
+
+def count() -> Reducer[t.Any, int]:
+    """Count messages."""
+    return Reducer(initial=int, add=lambda acc, _: acc + 1)
+
+
+def sum_by(
+    getter: t.Callable[[T], float],
+) -> Reducer[T, float]:
+    """Sum the values returned by getter for each message."""
+    return Reducer(initial=float, add=lambda acc, item: acc + getter(item))
+
+
+def collect(
+    getter: t.Callable[[T], AccT],
+) -> Reducer[T, t.List[AccT]]:
+    """Collect the values returned by getter for each message into a list."""
+
+    def add(acc: t.List[AccT], item: T) -> t.List[AccT]:
+        acc.append(getter(item))
+        return acc
+
+    return Reducer(initial=list, add=add)
+
+
+@dataclass
+class Window(t.Generic[ScopeT, AccT]):
+    """A time window holding the value accumulated for a subject."""
+
+    subject: str
+    """The subject of messages within the window."""
+
+    scope: ScopeT
+    """The scope of messages within the window."""
+
+    start: float
+    """Start time of the window (included) in seconds since epoch."""
+
+    end: float
+    """End time of the window (excluded) in seconds since epoch."""
+
+    value: AccT
+    """The value accumulated by the reducer."""
+
+    count: int = 0
+    """The number of messages within the window."""
+
+
+class WindowAggregator(t.Generic[ScopeT, AccT]):
+    """Aggregate messages into tumbling or sliding windows keyed by subject.
+
+    State is bounded: when `max_windows` windows are open, the window closing
+    first is closed early in order to open a new window.
+    """
+
+    def __init__(
+        self,
+        size: float,
+        reducer: Reducer[Message[ScopeT, t.Any, t.Any, t.Any, t.Any], AccT],
+        step: t.Optional[float] = None,
+        max_windows: int = 10000,
+        clock: t.Callable[[], float] = time.time,
+    ) -> None:
+        """Create a new aggregator.
+
+        Arguments:
+            size: Duration of a window in seconds.
+            reducer: The reducer used to accumulate messages.
+            step: Duration between the start of two consecutive windows in seconds.
+                Defaults to `size`, I.E, tumbling windows.
+            max_windows: Maximum number of open windows.
+            clock: Clock returning a time in seconds since epoch.
+        """
+        if size <= 0:
+            raise ValueError("size must be greater than 0")
+        if step is None:
+            step = size
+        if step <= 0 or step > size:
+            raise ValueError(
+                "step must be greater than 0 and cannot be greater than size"
+            )
+        if max_windows < 1:
+            raise ValueError("max_windows must be greater than 0")
+        self.size = size
+        self.step = step
+        self.reducer = reducer
+        self.max_windows = max_windows
+        self.clock = clock
+        self._windows: t.Dict[t.Tuple[str, float], Window[ScopeT, AccT]] = {}
+        # Each open window has a single entry (end, seq, key) within the heap
+        self._heap: t.List[t.Tuple[float, int, t.Tuple[str, float]]] = []
+        self._seq = itertools.count()
+
+    def __len__(self) -> int:
+        """Get number of open windows."""
+        return len(self._windows)
+
+    def next_deadline(self) -> t.Optional[float]:
+        """Get the time at which the next window closes, or None if there is no open window."""
+        if not self._heap:
+            return None
+        return self._heap[0][0]
+
+    def add(
+        self,
+        message: Message[ScopeT, t.Any, t.Any, t.Any, t.Any],
+        now: t.Optional[float] = None,
+    ) -> t.List[Window[ScopeT, AccT]]:
+        """Add a message to the windows open at given time.
+
+        Returns:
+            The windows closed early because too many windows are open.
+        """
+        if now is None:
+            now = self.clock()
+        closed: t.List[Window[ScopeT, AccT]] = []
+        first = math.floor((now - self.size) / self.step) + 1
+        last = math.floor(now / self.step)
+        for idx in range(first, last + 1):
+            start = idx * self.step
+            key = (message.subject, start)
+            window = self._windows.get(key)
+            if window is None:
+                if len(self._windows) >= self.max_windows:
+                    closed.append(self._close())
+                window = Window(
+                    subject=message.subject,
+                    scope=message.scope,
+                    start=start,
+                    end=start + self.size,
+                    value=self.reducer.initial(),
+                )
+                self._windows[key] = window
+                heapq.heappush(self._heap, (window.end, next(self._seq), key))
+            window.value = self.reducer.add(window.value, message)
+            window.count += 1
+        return closed
+
+    def advance(self, now: t.Optional[float] = None) -> t.List[Window[ScopeT, AccT]]:
+        """Close windows ending at or before given time.
+
+        Returns:
+            Closed windows sorted by end time.
+        """
+        if now is None:
+            now = self.clock()
+        closed: t.List[Window[ScopeT, AccT]] = []
+        while self._heap and self._heap[0][0] <= now:
+            closed.append(self._close())
+        return closed
+
+    def flush(self) -> t.List[Window[ScopeT, AccT]]:
+        """Close all open windows."""
+        closed: t.List[Window[ScopeT, AccT]] = []
+        while self._heap:
+            closed.append(self._close())
+        return closed
+
+    def _close(self) -> Window[ScopeT, AccT]:
+        _, _, key = heapq.heappop(self._heap)
+        return self._windows.pop(key)
+
+
+@asynccontextmanager
+async def windowed(
+    source: t.AsyncIterator[Message[ScopeT, t.Any, t.Any, t.Any, t.Any]],
+    aggregator: WindowAggregator[ScopeT, AccT],
+    max_buffer: int = 100,
+) -> t.AsyncIterator[t.AsyncIterator[t.List[Window[ScopeT, AccT]]]]:
+    """Aggregate messages received from an async iterator into windows.
+
+    A background task reads messages from the source iterator into a buffer.
+    Messages are added to windows as they are taken from the buffer, and closed
+    windows are yielded in batches. When the source iterator is exhausted,
+    open windows are closed and yielded as a last batch.
+
+    Arguments:
+        source: The asynchronous iterator to read messages from.
+        aggregator: The aggregator holding open windows.
+        max_buffer: Maximum number of messages buffered.
+
+    Returns:
+        An asynchronous context manager yielding an asynchronous iterator of lists of windows.
+    """
+
+    async def iterator() -> t.AsyncIterator[t.List[Window[ScopeT, AccT]]]:
+        while True:
+            try:
+                item: t.Union[
+                    Message[ScopeT, t.Any, t.Any, t.Any, t.Any], EndOfStream, None
+                ] = buffer.get_nowait()
+            except asyncio.QueueEmpty:
+                deadline = aggregator.next_deadline()
+                timeout = (
+                    None if deadline is None else max(deadline - aggregator.clock(), 0)
+                )
+                try:
+                    item = await buffer.get(timeout)
+                except asyncio.TimeoutError:
+                    item = None
+            if isinstance(item, EndOfStream):
+                closed = aggregator.flush()
+                if closed:
+                    yield closed
+                if item.exc is not None:
+                    raise item.exc
+                return
+            # Close expired windows before opening new windows
+            closed = aggregator.advance()
+            if item is not None:
+                closed.extend(aggregator.add(item))
+            if closed:
+                yield closed
+
+    async with buffered(source, max_buffer) as buffer:
+        yield iterator()
@@ -1,13 +1,17 @@
 import typing as t
 
 from .aio.bus import EventBus
+from .aio.offload import DecodeOffloadPolicy
+from .aio.timers import PublishScheduler
+from .aio.tracing import Tracer
 from .defaults import DEFAULT_CODEC
 from .entities.events import Event
 from .entities.flows import Flow, ProducerFlow, ServiceFlow, SubscriptionFlow
 from .entities.syntax import SubjectSyntax
 from .interfaces.codec import CodecBackend
+from .interfaces.instrumentation import BusInstrumentation
 from .interfaces.pubsub import PubSubBackend
-from .operations.subjects import render_subject
+from .operations.subjects import merge_filter_subjects, render_subject
 from .types import NULL, DataT, MetaT, ReplyMetaT, ReplyT, ScopeT
 
 __all__ = ["create_event"]
@@ -664,7 +668,7 @@ def create_flow(
     event: Event[ScopeT, DataT, MetaT, ReplyT, ReplyMetaT],
     emits: t.Optional[t.List[Event[t.Any, t.Any, t.Any, t.Any, t.Any]]] = None,
     requests: t.Optional[t.List[Event[t.Any, t.Any, t.Any, t.Any, t.Any]]] = None,
-    scope: t.Optional[t.Dict[str, str]] = None,
+    scope: t.Union[t.Dict[str, str], t.Sequence[t.Dict[str, str]], None] = None,
 ) -> SubscriptionFlow[ScopeT, DataT, MetaT, ReplyT, ReplyMetaT]:
     ...  # pragma: no cover
 
@@ -676,7 +680,7 @@ def create_flow(
     command: Event[ScopeT, DataT, MetaT, ReplyT, ReplyMetaT],
     emits: t.Optional[t.List[Event[t.Any, t.Any, t.Any, t.Any, t.Any]]] = None,
     requests: t.Optional[t.List[Event[t.Any, t.Any, t.Any, t.Any, t.Any]]] = None,
-    scope: t.Optional[t.Dict[str, str]] = None,
+    scope: t.Union[t.Dict[str, str], t.Sequence[t.Dict[str, str]], None] = None,
 ) -> ServiceFlow[ScopeT, DataT, MetaT, ReplyT, ReplyMetaT]:
     ...  # pragma: no cover
 
@@ -701,18 +705,19 @@ def create_flow(
     command: t.Optional[Event[t.Any, t.Any, t.Any, t.Any, t.Any]] = None,
     emits: t.Optional[t.List[Event[t.Any, t.Any, t.Any, t.Any, t.Any]]] = None,
     requests: t.Optional[t.List[Event[t.Any, t.Any, t.Any, t.Any, t.Any]]] = None,
-    scope: t.Optional[t.Dict[str, str]] = None,
+    scope: t.Union[t.Dict[str, str], t.Sequence[t.Dict[str, str]], None] = None,
 ) -> Flow:
-    """Create a new flow for an event."""
+    """Create a new flow for an event.
+
+    When scope is provided, only messages matching the scope trigger the flow.
+    Scope may also be a list of scopes, in which case messages matching any
+    of the scopes trigger the flow, using a single subscription.
+    """
     emits = emits or []
     requests = requests or []
     if event and command:
         raise ValueError("A single event or command may be provided, but not both")
     if scope:
-        if event and command:
-            raise ValueError(
-                "scope can only be used when an event or a command is provided"
-            )
         if event:
             source = event
         elif command:
@@ -721,25 +726,17 @@ def create_flow(
             raise ValueError(
                 "Either command or source must be provided when scope is used"
             )
-        source_filter = Event(
-            source.name,
-            subject=render_subject(
-                tokens=source._tokens,
-                placeholders=source._placeholders,
-                context=scope,
-                syntax=source.syntax,
-                is_filter=True,
-            ),
-            schema=source.schema,
-            scope_schema=source.scope_schema,
-            reply_schema=source.reply_schema,
-            metadata_schema=source.metadata_schema,
-            reply_metadata_schema=source.reply_metadata_schema,
-            title=source.title,
-            description=source.description,
-            syntax=source.syntax,
-            is_filter=True,
-        )
+        scopes = [scope] if isinstance(scope, dict) else list(scope)
+        filters = [_create_filter(source, source_scope) for source_scope in scopes]
+        if len(filters) == 1:
+            source_filter = filters[0]
+        else:
+            source_filter = _create_filter(
+                source,
+                subject=merge_filter_subjects(
+                    [item.subject for item in filters], source.syntax
+                ),
+            )
         # Return a subscription flow for events
         if event:
             return SubscriptionFlow(
@@ -748,6 +745,7 @@ def create_flow(
                 requests=requests,
                 event=source,
                 filter=source_filter,
+                filters=filters,
             )
         # Return a service flow for commands
         return ServiceFlow(
@@ -756,6 +754,7 @@ def create_flow(
             requests=requests,
             command=source,
             filter=source_filter,
+            filters=filters,
         )
     elif event:
         return SubscriptionFlow(
@@ -772,13 +771,56 @@ def create_flow(
     return ProducerFlow(name=name, emits=emits, requests=requests)
 
 
+def _create_filter(
+    source: Event[t.Any, t.Any, t.Any, t.Any, t.Any],
+    scope: t.Optional[t.Dict[str, str]] = None,
+    subject: t.Optional[str] = None,
+) -> Event[t.Any, t.Any, t.Any, t.Any, t.Any]:
+    """Create an event matching the subset of source events within scope or subject."""
+    if subject is None:
+        subject = render_subject(
+            tokens=source._tokens,
+            placeholders=source._placeholders,
+            context=scope,
+            syntax=source.syntax,
+            is_filter=True,
+        )
+    return Event(
+        source.name,
+        subject=subject,
+        schema=source.schema,
+        scope_schema=source.scope_schema,
+        reply_schema=source.reply_schema,
+        metadata_schema=source.metadata_schema,
+        reply_metadata_schema=source.reply_metadata_schema,
+        title=source.title,
+        description=source.description,
+        syntax=source.syntax,
+        is_filter=True,
+    )
+
+
 def create_bus(
     pubsub: PubSubBackend,
     flow: t.Optional[Flow] = None,
     *,
     codec: CodecBackend = DEFAULT_CODEC,
+    offload: t.Optional[DecodeOffloadPolicy] = None,
+    instrumentation: t.Optional[BusInstrumentation] = None,
+    track_latency: bool = False,
+    tracer: t.Optional[Tracer] = None,
+    scheduler: t.Optional[PublishScheduler] = None,
 ) -> EventBus:
-    return EventBus(flow=flow, pubsub=pubsub, codec=codec)
+    return EventBus(
+        flow=flow,
+        pubsub=pubsub,
+        codec=codec,
+        offload=offload,
+        instrumentation=instrumentation,
+        track_latency=track_latency,
+        tracer=tracer,
+        scheduler=scheduler,
+    )
 
 
 def __test_annotations_create_event() -> None:  # pragma: no cover
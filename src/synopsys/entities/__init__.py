@@ -1,12 +1,15 @@
-from .actors import Actor, Producer, Service, Subscriber
+from .actors import Actor, BatchSubscriber, Producer, Service, Subscriber
 from .events import Event
 from .flows import Flow, SubscriptionFlow
 from .messages import Message, Reply, SimpleReply
+from .registry import EventRegistry
 from .syntax import SubjectSyntax
 
 __all__ = [
     "Actor",
+    "BatchSubscriber",
     "Event",
+    "EventRegistry",
     "Flow",
     "Message",
     "Reply",
@@ -38,6 +38,35 @@ class Subscriber(Actor, t.Generic[ScopeT, DataT, MetaT, ReplyT, ReplyMetaT]):
     queue: t.Optional[str] = None
     """A subscriber may belong to a queue"""
 
+    processes: t.Optional[int] = None
+    """When set, handler is executed within a pool of worker processes.
+
+    Raw messages are decoded within worker processes, so handler, event
+    schemas and codec must be picklable. Messages may be processed out of order.
+    """
+
+    header_predicate: t.Optional[t.Callable[[t.Dict[str, str]], bool]] = None
+    """When set, messages are dropped before payload is decoded unless predicate
+    returns True for raw message headers."""
+
+    metadata_predicate: t.Optional[t.Callable[[MetaT], bool]] = None
+    """When set, messages are dropped before payload is decoded unless predicate
+    returns True for decoded message metadata."""
+
+    partition_by: t.Optional[t.List[str]] = None
+    """When set, messages are delivered to members of the queue by consistent hash
+    of these scope fields instead of randomly, so that all messages of an entity
+    are delivered to the same member. Requires a queue."""
+
+    def __post_init__(self) -> None:
+        if self.partition_by:
+            if self.queue is None:
+                raise ValueError("A partitioned subscriber must belong to a queue")
+            if self.processes:
+                raise ValueError(
+                    "A partitioned subscriber cannot use a pool of worker processes"
+                )
+
 
 @dataclass
 class Service(Actor, t.Generic[ScopeT, DataT, MetaT, ReplyT, ReplyMetaT]):
@@ -53,3 +82,41 @@ class Service(Actor, t.Generic[ScopeT, DataT, MetaT, ReplyT, ReplyMetaT]):
 
     queue: t.Optional[str] = None
     """A service may belong to a queue."""
+
+    processes: t.Optional[int] = None
+    """When set, handler is executed within a pool of worker processes.
+
+    Raw messages are decoded and replies are encoded within worker processes,
+    so handler, event schemas and codec must be picklable. Requests may be
+    processed out of order.
+    """
+
+
+@dataclass
+class BatchSubscriber(Actor, t.Generic[ScopeT, DataT, MetaT, ReplyT, ReplyMetaT]):
+    """An actor which subscribes to events and processes them in batches."""
+
+    flow: SubscriptionFlow[ScopeT, DataT, MetaT, ReplyT, ReplyMetaT]
+
+    handler: t.Callable[
+        [t.List[Message[ScopeT, DataT, MetaT, ReplyT, ReplyMetaT]]],
+        t.Coroutine[t.Any, t.Any, None],
+    ]
+    """A batch subscriber handler receives a list of messages and must return None"""
+
+    queue: t.Optional[str] = None
+    """A batch subscriber may belong to a queue"""
+
+    max_batch: int = 100
+    """Maximum number of messages within a batch"""
+
+    max_wait: float = 0
+    """Maximum time in seconds to wait for a batch to be full"""
+
+    header_predicate: t.Optional[t.Callable[[t.Dict[str, str]], bool]] = None
+    """When set, messages are dropped before payload is decoded unless predicate
+    returns True for raw message headers."""
+
+    metadata_predicate: t.Optional[t.Callable[[MetaT], bool]] = None
+    """When set, messages are dropped before payload is decoded unless predicate
+    returns True for decoded message metadata."""
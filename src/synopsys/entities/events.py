@@ -17,9 +17,13 @@ This API has been designed in order to allow integration with messaging system a
 See ..interfaces subpackage in order to learn more about integration with messaging systems.
 """
 import typing as t
+from collections import OrderedDict
+from copy import copy
 
+from ..adapters.codec import PseudoJSONCodec
 from ..defaults import DEFAULT_CODEC, DEFAULT_SYNTAX
 from ..interfaces.codec import CodecBackend
+from ..operations.scopes import compile_scope_parser
 from ..operations.subjects import (
     extract_scope,
     match_subject,
@@ -83,6 +87,7 @@ class Event(t.Generic[ScopeT, DataT, MetaT, ReplyT, ReplyMetaT]):
         description: t.Optional[str] = None,
         syntax: t.Optional[SubjectSyntax] = None,
         is_filter: bool = False,
+        scope_cache_size: int = 1024,
     ) -> None:
         """Create a new event using a subjet and a schema."""
         if not name:
@@ -102,6 +107,15 @@ class Event(t.Generic[ScopeT, DataT, MetaT, ReplyT, ReplyMetaT]):
         # Save some attributes to easily match or extract subjects
         self._subject, self._placeholders = normalize_subject(self.subject, self.syntax)
         self._tokens = self._subject.split(self.syntax.match_sep)
+        # Save some attributes to avoid decoding the scope of known subjects
+        self.scope_cache_size = scope_cache_size
+        # Codecs may decode scopes differently, so scopes are cached by subject and codec
+        self._scope_cache: "OrderedDict[t.Tuple[str, CodecBackend], ScopeT]" = (
+            OrderedDict()
+        )
+        self._scope_parser = compile_scope_parser(
+            self.scope_schema, self._placeholders
+        )
         # Do not validate the subject if scope does not have annotations
         if not hasattr(self.scope_schema, "__annotations__"):
             return
@@ -124,6 +138,19 @@ class Event(t.Generic[ScopeT, DataT, MetaT, ReplyT, ReplyMetaT]):
                 f"Too many placeholders in subject or missing scope variables. Did not expect in subject: {unexpected}"
             )
 
+    def __getstate__(self) -> t.Dict[str, t.Any]:
+        """Do not pickle scope cache and compiled scope parser."""
+        state = self.__dict__.copy()
+        state["_scope_cache"] = OrderedDict()
+        state.pop("_scope_parser", None)
+        return state
+
+    def __setstate__(self, state: t.Dict[str, t.Any]) -> None:
+        self.__dict__.update(state)
+        self._scope_parser = compile_scope_parser(
+            self.scope_schema, self._placeholders
+        )
+
     def __repr__(self) -> str:
         return f"Event(name='{self.name}', subject='{self.subject}', schema={getattr(self.schema, '__name__', str(self.schema))})"
 
@@ -145,6 +172,29 @@ class Event(t.Generic[ScopeT, DataT, MetaT, ReplyT, ReplyMetaT]):
     def extract_scope(
         self, subject: str, codec: CodecBackend = DEFAULT_CODEC
     ) -> ScopeT:
-        """Extract placeholders from subject"""
+        """Extract placeholders from subject.
+
+        Scopes are cached by subject and codec, up to `scope_cache_size` entries.
+        A shallow copy of the cached scope is returned.
+        """
+        key = (subject, codec)
+        try:
+            scope = self._scope_cache[key]
+        except KeyError:
+            scope = self._decode_scope(subject, codec)
+            if self.scope_cache_size > 0:
+                self._scope_cache[key] = scope
+                if len(self._scope_cache) > self.scope_cache_size:
+                    self._scope_cache.popitem(last=False)
+        else:
+            self._scope_cache.move_to_end(key)
+        return copy(scope)
+
+    def _decode_scope(self, subject: str, codec: CodecBackend) -> ScopeT:
+        """Decode scope from subject without using cache."""
         scope_str = extract_scope(subject, self._placeholders, self.syntax)
+        # Parse simple scopes without pydantic when default codec is used.
+        # Subclasses may override how headers are decoded, so they are not eligible.
+        if self._scope_parser and type(codec) is PseudoJSONCodec:
+            return self._scope_parser(scope_str)  # type: ignore[no-any-return]
         return codec.decode_headers(scope_str, schema=self.scope_schema)
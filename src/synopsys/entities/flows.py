@@ -56,6 +56,12 @@ class SubscriptionFlow(Flow, t.Generic[ScopeT, DataT, MetaT, ReplyT, ReplyMetaT]
     filter: Event[ScopeT, DataT, MetaT, ReplyT, ReplyMetaT] = field(init=True)
     """The subset of events triggering the flow."""
 
+    filters: t.List[Event[ScopeT, DataT, MetaT, ReplyT, ReplyMetaT]] = field(
+        default_factory=list
+    )
+    """Scope filters of the flow. When there are several filters, `filter` matches all of them,
+    and messages which do not match any filter are dropped before being decoded."""
+
     kind: t.Literal[Kind.SUBSCRIPTION] = field(init=False, default=Kind.SUBSCRIPTION)
     """Flow kind"""
 
@@ -77,6 +83,12 @@ class ServiceFlow(Flow, t.Generic[ScopeT, DataT, MetaT, ReplyT, ReplyMetaT]):
     filter: Event[ScopeT, DataT, MetaT, ReplyT, ReplyMetaT] = field(init=True)
     """The subset of events triggering the flow."""
 
+    filters: t.List[Event[ScopeT, DataT, MetaT, ReplyT, ReplyMetaT]] = field(
+        default_factory=list
+    )
+    """Scope filters of the flow. When there are several filters, `filter` matches all of them,
+    and messages which do not match any filter are dropped before being decoded."""
+
     kind: t.Literal[Kind.SERVICE] = field(init=False, default=Kind.SERVICE)
     """Flow kind"""
 
@@ -1,5 +1,5 @@
 import typing as t
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
 from ..types import DataT, MetaT, ReplyMetaT, ReplyT, ScopeT
 from .events import Event
@@ -24,6 +24,15 @@ class Message(t.Generic[ScopeT, DataT, MetaT, ReplyT, ReplyMetaT]):
     event: Event[ScopeT, DataT, MetaT, ReplyT, ReplyMetaT]
     """Get event associated with the message."""
 
+    published_at: t.Optional[float] = field(default=None, compare=False)
+    """Get publish time (seconds since epoch) when publisher tracks delivery latency."""
+
+    message_id: t.Optional[str] = field(default=None, compare=False)
+    """Get unique message ID when publisher tracks delivery latency."""
+
+    traceparent: t.Optional[str] = field(default=None, compare=False)
+    """Get trace context of the message, as a W3C traceparent header value."""
+
 
 @dataclass
 class Reply(t.Generic[DataT, MetaT]):
@@ -0,0 +1,132 @@
+"""Index events by subject in order to dispatch messages received on a wildcard subscription.
+
+Events are stored within a trie, where each node holds a subject token.
+Finding the events matching a subject only visits the branches matching
+the subject tokens, so lookup time does not depend on the number of events.
+"""
+import typing as t
+
+from ..defaults import DEFAULT_SYNTAX
+from ..operations.subjects import merge_filter_subjects
+from .events import Event
+from .syntax import SubjectSyntax
+
+T = t.TypeVar("T")
+
+
+class _Node(t.Generic[T]):
+    """A node of the subject trie."""
+
+    __slots__ = ("children", "values", "tail_values")
+
+    def __init__(self) -> None:
+        self.children: t.Dict[str, _Node[T]] = {}
+        # Values of subjects ending on this node
+        self.values: t.List[t.Tuple[int, T]] = []
+        # Values of subjects ending with a match_all token after this node
+        self.tail_values: t.List[t.Tuple[int, T]] = []
+
+
+class EventRegistry(t.Generic[T]):
+    """Index values by event subject.
+
+    Event subjects may hold wildcards, for example the subject of an event with
+    placeholders, or the subject of a flow filter. Any value can be registered
+    for an event, such as the actor subscribed to the event.
+
+    Example:
+
+    ```python
+    registry = EventRegistry()
+    registry.register(ORDER_CREATED, "created")  # orders.{id}.created
+    registry.register(ORDER_SHIPPED, "shipped")  # orders.{id}.shipped
+    registry.match("orders.1.created")  # ["created"]
+    registry.get_subscriptions()  # ["orders.*.*"]
+    ```
+    """
+
+    def __init__(self, syntax: t.Optional[SubjectSyntax] = None) -> None:
+        """Create a new registry.
+
+        Arguments:
+            syntax: The syntax of registered subjects.
+        """
+        self.syntax = syntax or DEFAULT_SYNTAX
+        self.events: t.List[Event[t.Any, t.Any, t.Any, t.Any, t.Any]] = []
+        self._root: _Node[T] = _Node()
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def register(
+        self, event: Event[t.Any, t.Any, t.Any, t.Any, t.Any], value: T
+    ) -> None:
+        """Register a value for an event.
+
+        A value registered several times is returned once per registration.
+        """
+        if event.syntax != self.syntax:
+            raise ValueError("Event syntax does not match registry syntax")
+        node = self._root
+        tokens = event._subject.split(self.syntax.match_sep)
+        for idx, token in enumerate(tokens):
+            if token == self.syntax.match_all:
+                if idx != len(tokens) - 1:
+                    raise ValueError(
+                        f"Invalid subject: '{event.subject}'. '{token}' must be the last token"
+                    )
+                node.tail_values.append((self._count, value))
+                break
+            node = node.children.setdefault(token, _Node())
+        else:
+            node.values.append((self._count, value))
+        self._count += 1
+        if event not in self.events:
+            self.events.append(event)
+
+    def match(self, subject: str) -> t.List[T]:
+        """Get values registered for events matching a subject, in registration order."""
+        matches: t.List[t.Tuple[int, T]] = []
+        self._match(self._root, subject.split(self.syntax.match_sep), 0, matches)
+        if len(matches) > 1:
+            matches.sort(key=lambda item: item[0])
+        return [value for _, value in matches]
+
+    def _match(
+        self,
+        node: _Node[T],
+        tokens: t.List[str],
+        idx: int,
+        matches: t.List[t.Tuple[int, T]],
+    ) -> None:
+        if idx == len(tokens):
+            matches.extend(node.values)
+            return
+        # A match_all token matches one or more remaining tokens
+        matches.extend(node.tail_values)
+        child = node.children.get(tokens[idx])
+        if child is not None:
+            self._match(child, tokens, idx + 1, matches)
+        wildcard = node.children.get(self.syntax.match_one)
+        if wildcard is not None and wildcard is not child:
+            self._match(wildcard, tokens, idx + 1, matches)
+
+    def get_subscriptions(self) -> t.List[str]:
+        """Get the filter subjects which must be subscribed to in order to receive all registered events.
+
+        Events are grouped by the first token of their subject, and a single subject
+        is returned for each group. Subjects never overlap, so that a message is never
+        received twice. When a subject starts with a wildcard, a single subject is returned.
+        """
+        if not self.events:
+            return []
+        groups: t.Dict[str, t.List[str]] = {}
+        for event in self.events:
+            prefix = event._subject.split(self.syntax.match_sep, 1)[0]
+            groups.setdefault(prefix, []).append(event._subject)
+        if self.syntax.match_one in groups or self.syntax.match_all in groups:
+            groups = {"": [subject for group in groups.values() for subject in group]}
+        return [
+            merge_filter_subjects(subjects, self.syntax) for subjects in groups.values()
+        ]
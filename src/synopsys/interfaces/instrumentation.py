@@ -1,8 +1,10 @@
 import typing as t
+from traceback import StackSummary
 
-from ..entities import Actor, Message
+from ..entities import Actor, Event, Message
 
 if t.TYPE_CHECKING:
+    from ..aio.bus import EventBus  # pragma: no cover
     from ..aio.play import Play  # pragma: no cover
 
 
@@ -38,6 +40,18 @@ class PlayInstrumentation:
     ) -> None:
         """Observe a received message"""
 
+    def event_delivered(
+        self,
+        play: "Play",
+        actor: Actor,
+        msg: Message[t.Any, t.Any, t.Any, t.Any, t.Any],
+        delay: float,
+    ) -> None:
+        """Observe time in seconds elapsed between message publication and message processing start.
+
+        This hook is only called for messages published by a bus tracking latency.
+        """
+
     def event_processed(
         self,
         play: "Play",
@@ -46,6 +60,27 @@ class PlayInstrumentation:
     ) -> None:
         """Observe a successful event processed"""
 
+    def event_dropped(self, play: "Play", actor: Actor, subject: str) -> None:
+        """Observe a message dropped by actor predicates before payload is decoded."""
+
+    def event_loop_lag(self, play: "Play", lag: float) -> None:
+        """Observe event loop lag in seconds measured by play watchdog."""
+
+    def event_loop_blocked(
+        self,
+        play: "Play",
+        actor: t.Optional[Actor],
+        duration: float,
+        stack: StackSummary,
+    ) -> None:
+        """Observe event loop blocked for longer than play watchdog threshold.
+
+        Actor is the actor whose handler was running while event loop was blocked,
+        and stack is the stack of the event loop thread captured at that time.
+        Actor is None when blocking code does not belong to an actor.
+        Stack is empty when it could not be captured in time.
+        """
+
     def play_starting(self, play: "Play") -> None:
         """Observe play starting."""
 
@@ -60,3 +95,123 @@ class PlayInstrumentation:
 
     def play_stopped(self, play: "Play") -> None:
         """Observe play stopped."""
+
+
+Hook = t.Callable[..., None]
+
+
+class PlayHooks:
+    """Hooks of play instrumentations, resolved into one call list per hook.
+
+    A call list only holds the methods which instrumentations override, so that
+    a hook which no instrumentation overrides costs an iteration over an empty list.
+    """
+
+    actor_starting: t.List[Hook]
+    actor_started: t.List[Hook]
+    actor_cancelled: t.List[Hook]
+    event_processing_failed: t.List[Hook]
+    event_received: t.List[Hook]
+    event_delivered: t.List[Hook]
+    event_processed: t.List[Hook]
+    event_dropped: t.List[Hook]
+    event_loop_lag: t.List[Hook]
+    event_loop_blocked: t.List[Hook]
+    play_starting: t.List[Hook]
+    play_started: t.List[Hook]
+    play_stopping: t.List[Hook]
+    play_failed: t.List[Hook]
+    play_stopped: t.List[Hook]
+
+    def __init__(self, *instrumentations: PlayInstrumentation) -> None:
+        for name in self.__annotations__:
+            base = getattr(PlayInstrumentation, name)
+            calls = [
+                getattr(instrumentation, name)
+                for instrumentation in instrumentations
+                if getattr(type(instrumentation), name) is not base
+            ]
+            setattr(self, name, calls)
+
+
+class BusInstrumentation:
+    """Configure how an event bus should be instrumented.
+
+    All durations are measured in seconds, and all sizes in bytes.
+    Header size is the sum of the length of header keys and header values.
+    """
+
+    def message_encoded(
+        self,
+        bus: "EventBus",
+        event: Event[t.Any, t.Any, t.Any, t.Any, t.Any],
+        duration: float,
+        payload_size: int,
+        headers_size: int,
+    ) -> None:
+        """Observe a message encoded before being published or sent as a request."""
+
+    def message_decoded(
+        self,
+        bus: "EventBus",
+        event: Event[t.Any, t.Any, t.Any, t.Any, t.Any],
+        duration: float,
+        payload_size: int,
+        headers_size: int,
+    ) -> None:
+        """Observe a received message decoded."""
+
+    def reply_encoded(
+        self,
+        bus: "EventBus",
+        event: Event[t.Any, t.Any, t.Any, t.Any, t.Any],
+        duration: float,
+        payload_size: int,
+        headers_size: int,
+    ) -> None:
+        """Observe a reply encoded before being sent."""
+
+    def reply_decoded(
+        self,
+        bus: "EventBus",
+        event: Event[t.Any, t.Any, t.Any, t.Any, t.Any],
+        duration: float,
+        payload_size: int,
+        headers_size: int,
+    ) -> None:
+        """Observe a received reply decoded."""
+
+    def message_dropped(
+        self,
+        bus: "EventBus",
+        event: Event[t.Any, t.Any, t.Any, t.Any, t.Any],
+        subject: str,
+    ) -> None:
+        """Observe a received message dropped by predicates before payload is decoded."""
+
+    def message_published(
+        self,
+        bus: "EventBus",
+        event: Event[t.Any, t.Any, t.Any, t.Any, t.Any],
+        subject: str,
+        duration: float,
+    ) -> None:
+        """Observe time spent waiting for a message to be published by pubsub backend."""
+
+    def reply_published(
+        self,
+        bus: "EventBus",
+        event: Event[t.Any, t.Any, t.Any, t.Any, t.Any],
+        subject: str,
+        duration: float,
+    ) -> None:
+        """Observe time spent waiting for a reply to be published by pubsub backend."""
+
+    def request_completed(
+        self,
+        bus: "EventBus",
+        event: Event[t.Any, t.Any, t.Any, t.Any, t.Any],
+        subject: str,
+        duration: float,
+    ) -> None:
+        """Observe round-trip time of a request, excluding encode and decode time."""
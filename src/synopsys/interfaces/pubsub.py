@@ -54,6 +54,21 @@ class PubSubBackend(metaclass=abc.ABCMeta):
         """Send a request and wait for a reply."""
         raise NotImplementedError  # pragma: no cover
 
+    @abc.abstractmethod
+    def request_many(
+        self,
+        subject: str,
+        payload: bytes,
+        headers: t.Dict[str, str],
+        max_replies: t.Optional[int] = None,
+        timeout: t.Optional[float] = None,
+    ) -> t.AsyncContextManager[t.AsyncIterator[PubSubMsg]]:
+        """Send a request and iterate over replies received on a single inbox.
+
+        Iteration stops once max_replies replies are received or timeout expires.
+        """
+        raise NotImplementedError  # pragma: no cover
+
     @abc.abstractmethod
     def subscribe(
         self, subject: str, queue: t.Optional[str] = None, reply: bool = False
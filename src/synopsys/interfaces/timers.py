@@ -0,0 +1,31 @@
+import abc
+import typing as t
+
+if t.TYPE_CHECKING:
+    from ..aio.timers import ScheduledMessage  # pragma: no cover
+
+
+class TimerStore(metaclass=abc.ABCMeta):
+    """Store persisting messages scheduled to be published later, so that they survive restarts."""
+
+    @abc.abstractmethod
+    def add(self, message: "ScheduledMessage") -> None:
+        """Persist a scheduled message.
+
+        This method is called within the event loop thread, so it should not block
+        for long.
+        """
+        raise NotImplementedError  # pragma: no cover
+
+    @abc.abstractmethod
+    def remove(self, message_id: str) -> None:
+        """Remove a message once published or cancelled."""
+        raise NotImplementedError  # pragma: no cover
+
+    @abc.abstractmethod
+    def load(self) -> t.List["ScheduledMessage"]:
+        """Load all pending messages."""
+        raise NotImplementedError  # pragma: no cover
+
+    def close(self) -> None:
+        """Release resources held by store."""
@@ -0,0 +1,21 @@
+import abc
+import typing as t
+
+if t.TYPE_CHECKING:
+    from ..aio.tracing import Span  # pragma: no cover
+
+
+class SpanExporter(metaclass=abc.ABCMeta):
+    """Exporter used to send finished spans to a file or a collector."""
+
+    @abc.abstractmethod
+    def export(self, spans: t.List["Span"]) -> None:
+        """Export a batch of finished spans.
+
+        This method is called within the event loop thread, so it should not block
+        for long.
+        """
+        raise NotImplementedError  # pragma: no cover
+
+    def shutdown(self) -> None:
+        """Release resources held by exporter. Spans must not be exported after shutdown."""
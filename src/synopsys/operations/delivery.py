@@ -0,0 +1,63 @@
+import time
+import typing as t
+from uuid import uuid4
+
+PUBLISHED_AT_HEADER = "Synopsys-Published-At"
+"""Header holding publish time as an integer number of nanoseconds since epoch."""
+
+MESSAGE_ID_HEADER = "Synopsys-Msg-Id"
+"""Header holding a unique message ID."""
+
+TRACEPARENT_HEADER = "traceparent"
+"""Header holding trace context, as defined by W3C Trace Context."""
+
+TRACESTATE_HEADER = "tracestate"
+"""Header holding vendor-specific trace context, as defined by W3C Trace Context."""
+
+
+def stamp_headers(headers: t.Dict[str, str]) -> t.Dict[str, str]:
+    """Add publish time and a unique message ID to headers (in place).
+
+    Publish time is read from the wall clock, because it must be compared
+    with clocks of other processes and hosts.
+    """
+    headers[PUBLISHED_AT_HEADER] = str(time.time_ns())
+    headers[MESSAGE_ID_HEADER] = uuid4().hex
+    return headers
+
+
+def split_headers(
+    headers: t.Dict[str, str],
+) -> t.Tuple[t.Dict[str, str], t.Optional[float], t.Optional[str], t.Optional[str]]:
+    """Remove delivery and trace context headers from message headers.
+
+    Returns:
+        A tuple (headers, published_at, message_id, traceparent). Publish time is
+        a number of seconds since epoch. Headers are copied only when they hold
+        delivery or trace context headers.
+    """
+    if PUBLISHED_AT_HEADER not in headers and TRACEPARENT_HEADER not in headers:
+        return headers, None, None, None
+    headers = headers.copy()
+    published_at: t.Optional[float] = None
+    raw_published_at = headers.pop(PUBLISHED_AT_HEADER, None)
+    if raw_published_at is not None:
+        try:
+            published_at = int(raw_published_at) / 1e9
+        except ValueError:
+            pass
+    headers.pop(TRACESTATE_HEADER, None)
+    return (
+        headers,
+        published_at,
+        headers.pop(MESSAGE_ID_HEADER, None),
+        headers.pop(TRACEPARENT_HEADER, None),
+    )
+
+
+def get_delivery_delay(published_at: float) -> float:
+    """Get time in seconds elapsed since a message was published.
+
+    Clocks of publishers and consumers may drift, so delay is never negative.
+    """
+    return max(0.0, time.time() - published_at)
@@ -0,0 +1,95 @@
+import bisect
+import hashlib
+import typing as t
+
+
+def _hash(value: str) -> int:
+    """Hash a string consistently across processes, unlike the builtin hash()."""
+    digest = hashlib.blake2b(value.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big")
+
+
+class HashRing:
+    """A consistent hash ring.
+
+    Each member is placed on the ring at `replicas` points, and a key belongs
+    to the member owning the first point following the key hash. When a member
+    joins or leaves the ring, only the keys owned by this member move.
+    """
+
+    def __init__(self, members: t.Iterable[str] = (), replicas: int = 64) -> None:
+        """Create a new hash ring.
+
+        Arguments:
+            members: The initial members of the ring.
+            replicas: Number of points of each member on the ring. More points
+                spread keys more evenly across members.
+        """
+        if replicas < 1:
+            raise ValueError("replicas must be greater than 0")
+        self.replicas = replicas
+        self._members: t.Set[str] = set()
+        self._points: t.List[int] = []
+        self._owners: t.List[str] = []
+        for member in members:
+            self.add(member)
+
+    @property
+    def members(self) -> t.FrozenSet[str]:
+        """Members of the ring."""
+        return frozenset(self._members)
+
+    def __len__(self) -> int:
+        return len(self._members)
+
+    def __contains__(self, member: object) -> bool:
+        return member in self._members
+
+    def add(self, member: str) -> bool:
+        """Add a member to the ring. Return False if member was already present."""
+        if member in self._members:
+            return False
+        self._members.add(member)
+        for replica in range(self.replicas):
+            point = _hash(f"{member}#{replica}")
+            idx = bisect.bisect(self._points, point)
+            self._points.insert(idx, point)
+            self._owners.insert(idx, member)
+        return True
+
+    def remove(self, member: str) -> bool:
+        """Remove a member from the ring. Return False if member was not present."""
+        if member not in self._members:
+            return False
+        self._members.remove(member)
+        kept = [
+            (point, owner)
+            for point, owner in zip(self._points, self._owners)
+            if owner != member
+        ]
+        self._points = [point for point, _ in kept]
+        self._owners = [owner for _, owner in kept]
+        return True
+
+    def get(self, key: str) -> t.Optional[str]:
+        """Get the member owning a key, or None when ring is empty."""
+        if not self._points:
+            return None
+        idx = bisect.bisect(self._points, _hash(key))
+        if idx == len(self._points):
+            idx = 0
+        return self._owners[idx]
+
+
+def partition_key(values: t.Mapping[str, str], fields: t.Sequence[str]) -> str:
+    """Get the partition key of a scope from the values of some of its fields.
+
+    Arguments:
+        values: Scope values as strings, such as placeholders extracted from a subject.
+        fields: Names of the scope fields used as partition key.
+
+    Returns:
+        A string identifying the partition key.
+    """
+    # Subject tokens never contain the NUL character
+    return "\x00".join(values[name] for name in fields)
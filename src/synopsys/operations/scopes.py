@@ -0,0 +1,69 @@
+import typing as t
+from dataclasses import is_dataclass
+
+# Converters which can be applied on subject tokens without validation library
+SCALAR_CONVERTERS: t.Dict[t.Any, t.Callable[[str], t.Any]] = {
+    str: str,
+    int: int,
+    float: float,
+}
+
+
+def _is_typeddict(schema: t.Any) -> bool:
+    return (
+        isinstance(schema, type)
+        and issubclass(schema, dict)
+        and hasattr(schema, "__total__")
+    )
+
+
+def compile_scope_parser(
+    schema: t.Any,
+    placeholders: t.Iterable[str],
+) -> t.Optional[t.Callable[[t.Dict[str, str]], t.Any]]:
+    """Compile a function parsing subject tokens into a scope object.
+
+    A parser can only be compiled for string mappings, or for TypedDict
+    and dataclasses whose fields are all placeholders annotated with
+    `str`, `int` or `float`.
+
+    Arguments:
+        schema: the scope schema.
+        placeholders: the placeholders found in subject.
+
+    Returns:
+        A function accepting a mapping of placeholder values and returning a
+        scope object, or None when schema is not supported.
+    """
+    if schema is dict or schema == t.Dict[str, str]:
+        return dict
+    if _is_typeddict(schema):
+        factory: t.Callable[..., t.Any] = dict
+    elif (
+        isinstance(schema, type)
+        and is_dataclass(schema)
+        and not hasattr(schema, "__pydantic_model__")
+    ):
+        factory = schema
+    else:
+        return None
+    try:
+        annotations = t.get_type_hints(schema)
+    except Exception:
+        return None
+    # Filters may not declare all scope fields in subject
+    if set(annotations) != set(placeholders):
+        return None
+    converters: t.List[t.Tuple[str, t.Callable[[str], t.Any]]] = []
+    for name, annotation in annotations.items():
+        converter = SCALAR_CONVERTERS.get(annotation)
+        if converter is None:
+            return None
+        converters.append((name, converter))
+
+    def parse(values: t.Dict[str, str]) -> t.Any:
+        return factory(
+            **{name: converter(values[name]) for name, converter in converters}
+        )
+
+    return parse
@@ -0,0 +1,27 @@
+import typing as t
+
+T = t.TypeVar("T")
+
+
+async def iterate_until(
+    source: t.AsyncIterator[T], stopped: t.Callable[[], bool]
+) -> t.AsyncIterator[T]:
+    """Iterate over an async iterator until stopped returns True.
+
+    Receiving from an anyio memory stream swallows a cancellation when an item is
+    received at the same time, so a task consuming messages in background may keep
+    running once cancelled. Such tasks must iterate using this function, and must
+    be marked as stopped before being cancelled.
+
+    Arguments:
+        source: The asynchronous iterator to read items from.
+        stopped: A function returning True once iteration must stop. It is called
+            each time an item is received, before the item is yielded.
+
+    Returns:
+        An asynchronous iterator of items received until stopped.
+    """
+    async for item in source:
+        if stopped():
+            return
+        yield item
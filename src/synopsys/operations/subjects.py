@@ -144,3 +144,100 @@ def match_subject(
     if token == syntax.match_one and (total_tokens - idx) > 1:
         return False
     return matches
+
+
+def merge_filter_subjects(
+    filters: t.Sequence[str],
+    syntax: SubjectSyntax,
+) -> str:
+    """Get the narrowest filter subject matching all subjects matched by given filters.
+
+    Tokens shared by all filters are kept, and tokens which differ are replaced by
+    the match_one token. When filters do not have the same number of tokens, or hold
+    a match_all token, remaining tokens are replaced by a single match_all token.
+
+    Arguments:
+        filters: filter subjects to merge
+        syntax: subject syntax
+
+    Returns:
+        a filter subject
+    """
+    if not filters:
+        raise ValueError("At least one filter subject must be provided")
+    filters_tokens = [filter.split(syntax.match_sep) for filter in filters]
+    size = min(len(tokens) for tokens in filters_tokens)
+    same_size = all(len(tokens) == size for tokens in filters_tokens)
+    for idx in range(size):
+        if any(tokens[idx] == syntax.match_all for tokens in filters_tokens):
+            size, same_size = idx + 1, False
+            break
+    # Last token is replaced by match_all when filters do not have the same size
+    common = size if same_size else size - 1
+    merged: t.List[str] = []
+    for idx in range(common):
+        token = filters_tokens[0][idx]
+        if any(tokens[idx] != token for tokens in filters_tokens):
+            token = syntax.match_one
+        merged.append(token)
+    if not same_size:
+        merged.append(syntax.match_all)
+    return syntax.match_sep.join(merged)
+
+
+def compile_subject_rewrite(
+    filter: str,
+    target: str,
+    syntax: SubjectSyntax,
+) -> t.Callable[[str], str]:
+    """Compile a function rewriting subjects matched by a filter subject.
+
+    Wildcard tokens of target subject are replaced by the tokens matched by wildcard
+    tokens of filter subject, in order. For example, using filter "orders.*.>" and
+    target "legacy.*.>", subject "orders.1.created" is rewritten into "legacy.1.created".
+
+    Arguments:
+        filter: filter subject
+        target: target subject, holding as many match_one tokens as filter subject,
+            and a match_all token when filter subject ends with a match_all token.
+        syntax: subject syntax
+
+    Returns:
+        a function rewriting a subject matched by filter subject
+    """
+    filter_tokens = filter.split(syntax.match_sep)
+    target_tokens = target.split(syntax.match_sep)
+    for tokens, subject in ((filter_tokens, filter), (target_tokens, target)):
+        if syntax.match_all in tokens[:-1]:
+            raise ValueError(
+                f"Invalid subject: '{subject}'. '{syntax.match_all}' must be the last token"
+            )
+    if filter_tokens.count(syntax.match_one) != target_tokens.count(
+        syntax.match_one
+    ) or (filter_tokens[-1] == syntax.match_all) != (
+        target_tokens[-1] == syntax.match_all
+    ):
+        raise ValueError(
+            f"Cannot rewrite subject '{filter}' into '{target}'. Target subject must hold the same wildcards as filter subject"
+        )
+    wildcards = [
+        idx for idx, token in enumerate(filter_tokens) if token == syntax.match_one
+    ]
+    tail = len(filter_tokens) - 1 if filter_tokens[-1] == syntax.match_all else None
+    if not wildcards and tail is None:
+        return lambda subject: target
+
+    def rewrite(subject: str) -> str:
+        tokens = subject.split(syntax.match_sep)
+        matched = iter([tokens[idx] for idx in wildcards])
+        rewritten: t.List[str] = []
+        for token in target_tokens:
+            if token == syntax.match_one:
+                rewritten.append(next(matched))
+            elif token == syntax.match_all:
+                rewritten.extend(tokens[tail:])
+            else:
+                rewritten.append(token)
+        return syntax.match_sep.join(rewritten)
+
+    return rewrite
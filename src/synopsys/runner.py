@@ -0,0 +1,236 @@
+"""Run several copies of a play within worker processes.
+
+Each worker process runs its own copy of the play, with its own bus connection.
+Actors belonging to a queue group share the load between workers.
+"""
+
+import importlib
+import importlib.util
+import inspect
+import logging
+import multiprocessing
+import os
+import signal
+import threading
+import time
+import typing as t
+from multiprocessing.connection import wait
+from multiprocessing.context import BaseContext
+from multiprocessing.process import BaseProcess
+
+if t.TYPE_CHECKING:
+    from .aio.play import Play  # pragma: no cover
+    from .interfaces.pubsub import PubSubBackend  # pragma: no cover
+
+
+logger = logging.getLogger("synopsys.runner")
+
+
+LOOPS = ("auto", "asyncio", "uvloop")
+"""Event loops which can be used to run a play."""
+
+
+def has_uvloop() -> bool:
+    """Return True when uvloop is installed."""
+    return importlib.util.find_spec("uvloop") is not None
+
+
+def get_backend(loop: str = "auto") -> t.Tuple[str, t.Dict[str, t.Any]]:
+    """Get anyio backend name and backend options used to run a play.
+
+    Arguments:
+        loop: One of "auto", "asyncio" or "uvloop". When "auto" is used,
+            uvloop is selected if installed, else asyncio is selected.
+
+    Returns:
+        A tuple (backend, backend_options) which can be used with `anyio.run()`.
+    """
+    if loop == "auto":
+        loop = "uvloop" if has_uvloop() else "asyncio"
+    if loop == "asyncio":
+        return "asyncio", {}
+    if loop == "uvloop":
+        if not has_uvloop():
+            raise RuntimeError(
+                "uvloop is not installed. Install uvloop in order to fix this error."
+            )
+        return "asyncio", {"use_uvloop": True}
+    if loop == "trio":
+        raise ValueError(
+            "trio is not supported: pubsub backends, processes, timers and most "
+            f"features of the event bus require asyncio. Expected one of {list(LOOPS)}"
+        )
+    raise ValueError(f"Invalid loop: '{loop}'. Expected one of {list(LOOPS)}")
+
+
+def _get_context() -> BaseContext:
+    """Use fork start method when available, so that plays do not need to be picklable."""
+    if "fork" in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("fork")
+    return multiprocessing.get_context("spawn")  # pragma: no cover
+
+
+def _worker(target: t.Callable[[], t.Any]) -> None:
+    """Entrypoint of worker processes."""
+    # Supervisor owns signal handling, SIGTERM must lead to a graceful shutdown
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
+    signal.signal(signal.SIGINT, signal.default_int_handler)
+    try:
+        target()
+    except KeyboardInterrupt:
+        pass
+
+
+class Supervisor:
+    """Start worker processes, restart crashed workers, and forward signals."""
+
+    def __init__(
+        self,
+        target: t.Callable[[], t.Any],
+        workers: int,
+        restart_delay: float = 1.0,
+        shutdown_timeout: float = 10.0,
+    ) -> None:
+        """Create a new supervisor.
+
+        Arguments:
+            target: The function to run within each worker process.
+            workers: The number of worker processes.
+            restart_delay: Time in seconds to wait before restarting a crashed worker.
+            shutdown_timeout: Time in seconds to wait for workers to exit before killing them.
+        """
+        if workers < 1:
+            raise ValueError("workers must be greater than 0")
+        self.target = target
+        self.workers = workers
+        self.restart_delay = restart_delay
+        self.shutdown_timeout = shutdown_timeout
+        self.processes: t.List[BaseProcess] = []
+        self.restarts = 0
+        self._context = _get_context()
+        self._stopping = threading.Event()
+
+    def _spawn(self) -> BaseProcess:
+        process = self._context.Process(  # type: ignore[attr-defined]
+            target=_worker, args=(self.target,), daemon=False
+        )
+        process.start()
+        logger.info(f"Started worker process {process.pid}")
+        return process  # type: ignore[no-any-return]
+
+    def _handle_signal(self, signum: int, frame: t.Any) -> None:
+        logger.info(f"Received signal {signum}. Stopping workers.")
+        self.stop()
+
+    def stop(self) -> None:
+        """Request workers to stop. Can be called from any thread."""
+        self._stopping.set()
+
+    def _terminate(self) -> None:
+        """Forward shutdown to workers, then kill workers which did not exit in time."""
+        for process in self.processes:
+            if process.is_alive() and process.pid:
+                try:
+                    os.kill(process.pid, signal.SIGTERM)
+                except ProcessLookupError:  # pragma: no cover
+                    continue
+        deadline = time.monotonic() + self.shutdown_timeout
+        for process in self.processes:
+            process.join(max(0, deadline - time.monotonic()))
+            if process.is_alive():
+                logger.warning(f"Killing worker process {process.pid}")
+                process.kill()
+                process.join()
+
+    def run(self, install_signal_handlers: bool = True) -> None:
+        """Run workers until supervisor is stopped, or all workers exited cleanly.
+
+        Arguments:
+            install_signal_handlers: Stop on SIGINT and SIGTERM. Signal handlers
+                can only be installed from main thread.
+        """
+        if install_signal_handlers:
+            previous = {
+                signum: signal.signal(signum, self._handle_signal)
+                for signum in (signal.SIGINT, signal.SIGTERM)
+            }
+        try:
+            self.processes = [self._spawn() for _ in range(self.workers)]
+            exited: t.Set[int] = set()
+            while not self._stopping.is_set():
+                running = [
+                    process.sentinel
+                    for idx, process in enumerate(self.processes)
+                    if idx not in exited
+                ]
+                if not running:
+                    logger.info("All worker processes exited")
+                    break
+                # Use a short timeout to react to stop requests
+                wait(running, timeout=0.1)
+                for idx, process in enumerate(self.processes):
+                    if idx in exited or process.is_alive() or self._stopping.is_set():
+                        continue
+                    if process.exitcode == 0:
+                        logger.info(f"Worker process {process.pid} exited")
+                        exited.add(idx)
+                        continue
+                    logger.error(
+                        f"Worker process {process.pid} exited with code {process.exitcode}"
+                    )
+                    if self._stopping.wait(self.restart_delay):
+                        break
+                    self.restarts += 1
+                    self.processes[idx] = self._spawn()
+        finally:
+            self._terminate()
+            if install_signal_handlers:
+                for signum, handler in previous.items():
+                    signal.signal(signum, handler)
+
+
+def _load_object(path: str, kind: str) -> t.Any:
+    """Load an object from a string such as 'module:attribute'.
+
+    Attribute can be an object, or a function returning an object.
+    """
+    module_name, _, attribute = path.partition(":")
+    if not module_name or not attribute:
+        raise ValueError(
+            f"Invalid {kind} path: '{path}'. Expected format: 'module:attribute'"
+        )
+    obj: t.Any = importlib.import_module(module_name)
+    for name in attribute.split("."):
+        obj = getattr(obj, name)
+    return obj
+
+
+def load_play(path: str) -> "Play":
+    """Load a play from a string such as 'module:attribute'.
+
+    Attribute can be a play, or a function returning a play.
+    """
+    from .aio.play import Play
+
+    obj = _load_object(path, "play")
+    if inspect.isclass(obj) or inspect.isfunction(obj):
+        obj = obj()
+    if not isinstance(obj, Play):
+        raise TypeError(f"Expected a play, got {type(obj)}")
+    return obj
+
+
+def load_pubsub(path: str) -> "PubSubBackend":
+    """Load a pubsub backend from a string such as 'module:attribute'.
+
+    Attribute can be a pubsub backend, a pubsub backend class, or a function
+    returning a pubsub backend.
+    """
+    from .interfaces.pubsub import PubSubBackend
+
+    obj = _load_object(path, "pubsub")
+    if inspect.isclass(obj) or inspect.isfunction(obj):
+        obj = obj()
+    if not isinstance(obj, PubSubBackend):
+        raise TypeError(f"Expected a pubsub backend, got {type(obj)}")
+    return obj
@@ -1,4 +1,18 @@
-from synopsys.adapters.pubsub.redis import RedisMsg
+import asyncio
+import typing as t
+
+import pytest
+
+from synopsys.adapters.pubsub.redis import RedisMsg, RedisPubSub
+
+
+def create_reply(channel: str, data: bytes) -> t.Dict[str, bytes]:
+    return {
+        "type": b"pmessage",
+        "pattern": b"$REPLY.be2bc5c6e138f19f.*",
+        "channel": channel.encode("utf-8"),
+        "data": data,
+    }
 
 
 class TestRedisMsg:
@@ -13,3 +27,19 @@ class TestRedisMsg:
         assert msg.get_headers() == {}
         assert msg.get_payload() == b"13"
         assert msg.get_subject() == "$REPLY.be2bc5c6e138f19f.39ad9320b9225583ee19cc50"
+
+
+@pytest.mark.asyncio
+class TestRedisReplies:
+    async def test_late_reply_while_another_request_is_pending(self):
+        pubsub = RedisPubSub()
+        pending: "asyncio.Future[RedisMsg]" = asyncio.Future()
+        subject = f"{pubsub._reply_prefix}.pending"
+        pubsub._reply_map[subject] = pending
+        # Reply received after request_many stopped waiting for replies
+        pubsub._process_reply(create_reply(f"{pubsub._reply_prefix}.late", b"1"))
+        assert not pending.done()
+        assert subject in pubsub._reply_map
+        pubsub._process_reply(create_reply(subject, b"2"))
+        assert pending.result().get_payload() == b"2"
+        assert pubsub._reply_map == {}
@@ -0,0 +1,141 @@
+import asyncio
+import typing as t
+
+import pytest
+from anyio import fail_after
+
+from synopsys import Play, Subscriber, create_bus, create_event, create_flow
+from synopsys.adapters import InMemoryPubSub
+from synopsys.adapters.instrumentation import MetricsInstrumentation
+from synopsys.adapters.instrumentation.metrics import Histogram
+
+EVENT = create_event("test-event", "test", schema=int)
+
+
+class TestHistogram:
+    def test_histogram_observe(self):
+        histogram = Histogram((0.1, 1.0))
+        for value in (0.05, 0.1, 0.5, 2):
+            histogram.observe(value)
+        assert histogram.counts == [2, 1, 1]
+        assert histogram.count == 4
+        assert histogram.sum == pytest.approx(2.65)
+        assert histogram.cumulative() == [(0.1, 2), (1.0, 3), (float("inf"), 4)]
+
+    def test_histogram_quantile(self):
+        histogram = Histogram((0.1, 1.0))
+        assert histogram.quantile(0.5) == 0
+        for value in (0.05, 0.05, 0.5, 2):
+            histogram.observe(value)
+        assert histogram.quantile(0.5) == 0.1
+        assert histogram.quantile(0.75) == 1.0
+        assert histogram.quantile(1) == float("inf")
+        with pytest.raises(ValueError):
+            histogram.quantile(2)
+
+    def test_histogram_buckets_must_be_sorted(self):
+        with pytest.raises(ValueError, match="must be sorted"):
+            Histogram((1.0, 0.1))
+
+
+@pytest.mark.asyncio
+class TestMetricsInstrumentation:
+    async def test_metrics_collected_for_subscriber(self):
+        bus = create_bus(InMemoryPubSub())
+        metrics = MetricsInstrumentation()
+        done = asyncio.Event()
+        received = []
+
+        async def handler(msg):
+            received.append(msg.data)
+            if msg.data < 0:
+                raise ValueError("negative value")
+            if len(received) == 3:
+                done.set()
+
+        subscriber = Subscriber(
+            flow=create_flow("test-subscriber", event=EVENT), handler=handler
+        )
+        with fail_after(5):
+            async with Play(bus, [subscriber], metrics, auto_connect=True) as play:
+                await asyncio.sleep(0)
+                await bus.publish(EVENT, 1)
+                await bus.publish(EVENT, -1)
+                await bus.publish(EVENT, 2)
+                await done.wait()
+                play.cancel()
+        [snapshot] = metrics.snapshot()
+        assert snapshot.actor == "test-subscriber"
+        assert snapshot.kind == "subscriber"
+        assert snapshot.received == 3
+        assert snapshot.processed == 2
+        assert snapshot.failed == 1
+        assert snapshot.in_flight == 0
+        assert snapshot.latency.count == 3
+        # Snapshot is a copy
+        snapshot.received = 0
+        assert metrics.snapshot()[0].received == 3
+        text = metrics.render_prometheus()
+        labels = 'actor="test-subscriber",kind="subscriber"'
+        assert "# TYPE synopsys_messages_received_total counter" in text
+        assert f"synopsys_messages_received_total{{{labels}}} 3" in text
+        assert f"synopsys_messages_failed_total{{{labels}}} 1" in text
+        assert f"synopsys_messages_in_flight{{{labels}}} 0" in text
+        assert (
+            f'synopsys_handler_duration_seconds_bucket{{{labels},le="+Inf"}} 3' in text
+        )
+        assert f"synopsys_handler_duration_seconds_count{{{labels}}} 3" in text
+        metrics.reset()
+        assert metrics.snapshot() == []
+
+    async def test_delivery_delay_collected(self):
+        bus = create_bus(InMemoryPubSub(), track_latency=True)
+        metrics = MetricsInstrumentation()
+        done = asyncio.Event()
+
+        async def handler(msg):
+            done.set()
+
+        subscriber = Subscriber(
+            flow=create_flow("test-subscriber", event=EVENT), handler=handler
+        )
+        with fail_after(5):
+            async with Play(bus, [subscriber], metrics, auto_connect=True) as play:
+                await asyncio.sleep(0)
+                await bus.publish(EVENT, 1)
+                await done.wait()
+                play.cancel()
+        [snapshot] = metrics.snapshot()
+        assert snapshot.delivery_delay.count == 1
+        assert "synopsys_delivery_delay_seconds_count" in metrics.render_prometheus()
+
+    async def test_dropped_messages_collected(self):
+        bus = create_bus(InMemoryPubSub())
+        metrics = MetricsInstrumentation()
+        event = create_event(
+            "test-event", "test", schema=int, metadata_schema=t.Dict[str, str]
+        )
+        done = asyncio.Event()
+
+        async def handler(msg):
+            done.set()
+
+        subscriber = Subscriber(
+            flow=create_flow("test-subscriber", event=event),
+            handler=handler,
+            metadata_predicate=lambda metadata: metadata.get("tenant") == "a",
+        )
+        with fail_after(5):
+            async with Play(bus, [subscriber], metrics, auto_connect=True) as play:
+                await asyncio.sleep(0)
+                for tenant in ("b", "c", "a"):
+                    await bus.publish(event, 1, metadata={"tenant": tenant})
+                await done.wait()
+                play.cancel()
+        [snapshot] = metrics.snapshot()
+        assert snapshot.dropped == 2
+        assert snapshot.received == 1
+        labels = 'actor="test-subscriber",kind="subscriber"'
+        assert f"synopsys_messages_dropped_total{{{labels}}} 2" in (
+            metrics.render_prometheus()
+        )
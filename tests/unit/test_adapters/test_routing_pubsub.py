@@ -0,0 +1,241 @@
+import asyncio
+import typing as t
+from contextlib import asynccontextmanager
+
+import pytest
+
+from synopsys.adapters import InMemoryPubSub, Route, RoutingPubSub
+from synopsys.adapters.pubsub.routing import INTEREST_SUBJECT, _merge
+from synopsys.interfaces.pubsub import PubSubMsg
+
+
+class SpyPubSub(InMemoryPubSub):
+    """An in-memory pubsub standing for a remote broker shared by several processes."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.published: t.List[str] = []
+
+    async def publish(
+        self,
+        subject: str,
+        payload: bytes,
+        headers: t.Dict[str, str],
+        timeout: t.Optional[float] = None,
+    ) -> None:
+        if subject != INTEREST_SUBJECT:
+            self.published.append(subject)
+        await super().publish(subject, payload, headers, timeout)
+
+
+class ClosingPubSub(SpyPubSub):
+    """A broker whose subscriptions to announces can be closed or fail."""
+
+    def __init__(self, fail: bool = False) -> None:
+        super().__init__()
+        self.fail = fail
+        self.closed = asyncio.Event()
+
+    @asynccontextmanager
+    async def subscribe(
+        self, subject: str, queue: t.Optional[str] = None, reply: bool = False
+    ) -> t.AsyncIterator[t.AsyncIterator[PubSubMsg]]:
+        if subject != INTEREST_SUBJECT:
+            async with super().subscribe(subject, queue, reply) as subscription:
+                yield subscription
+            return
+        if self.fail:
+            raise ConnectionError("Subscription failed")
+
+        async def iterator() -> t.AsyncIterator[PubSubMsg]:
+            await self.closed.wait()
+            return
+            yield  # pragma: no cover
+
+        yield iterator()
+
+
+async def wait_for_interest(pubsub: RoutingPubSub, subject: str) -> None:
+    while not pubsub.has_interest(subject):
+        await asyncio.sleep(0.001)
+
+
+def test_invalid_route():
+    with pytest.raises(ValueError, match="Invalid remote mode"):
+        Route("test.", InMemoryPubSub(), remote="never")
+
+
+@pytest.mark.asyncio
+class TestRoutingPubSub:
+    async def test_local_delivery_does_not_leave_process(self):
+        broker = SpyPubSub()
+        pubsub = RoutingPubSub([Route("test.", broker)])
+        await pubsub.connect()
+        async with pubsub.subscribe("test.>") as subscription:
+            await pubsub.publish("test.a", b"1", {})
+            msg = await asyncio.wait_for(subscription.__anext__(), 1)
+            assert msg.get_payload() == b"1"
+        assert broker.published == []
+        await pubsub.disconnect()
+
+    async def test_publish_when_remote_interest_exists(self):
+        broker = SpyPubSub()
+        first = RoutingPubSub([Route("test.", broker)])
+        second = RoutingPubSub([Route("test.", broker)])
+        await first.connect()
+        await second.connect()
+        async with first.subscribe("test.a") as local:
+            async with second.subscribe("test.*") as remote:
+                await wait_for_interest(first, "test.a")
+                assert not first.has_interest("other.a")
+                await first.publish("test.a", b"1", {"key": "value"})
+                msg = await asyncio.wait_for(remote.__anext__(), 1)
+                assert msg.get_payload() == b"1"
+                # Origin header is removed
+                assert msg.get_headers() == {"key": "value"}
+                msg = await asyncio.wait_for(local.__anext__(), 1)
+                assert msg.get_payload() == b"1"
+                # Local subscriber receives message once
+                with pytest.raises(asyncio.TimeoutError):
+                    await asyncio.wait_for(local.__anext__(), 0.05)
+        assert broker.published == ["test.a"]
+        # Interest is removed once remote subscriber is closed
+        while first.has_interest("test.a"):
+            await asyncio.sleep(0.001)
+        await first.disconnect()
+        await second.disconnect()
+
+    async def test_existing_interest_is_learned_on_connect(self):
+        broker = SpyPubSub()
+        first = RoutingPubSub([Route("test.", broker)])
+        second = RoutingPubSub([Route("test.", broker)])
+        await first.connect()
+        async with first.subscribe("test.a"):
+            await second.connect()
+            await asyncio.wait_for(wait_for_interest(second, "test.a"), 1)
+        await first.disconnect()
+        while second.has_interest("test.a"):
+            await asyncio.sleep(0.001)
+        await second.disconnect()
+
+    async def test_route_always_sends_to_remote(self):
+        broker = SpyPubSub()
+        pubsub = RoutingPubSub([Route("", broker, remote="always"), Route("local.")])
+        await pubsub.connect()
+        await pubsub.publish("test.a", b"1", {})
+        await pubsub.publish("local.a", b"1", {})
+        assert broker.published == ["test.a"]
+        await pubsub.disconnect()
+
+    async def test_queue_subscribers_receive_from_remote(self):
+        broker = SpyPubSub()
+        pubsub = RoutingPubSub([Route("test.", broker)])
+        await pubsub.connect()
+        async with pubsub.subscribe("test.a", queue="workers") as subscription:
+            assert pubsub.has_interest("test.a")
+            await pubsub.publish("test.a", b"1", {})
+            msg = await asyncio.wait_for(subscription.__anext__(), 1)
+            assert msg.get_payload() == b"1"
+        assert broker.published == ["test.a"]
+        await pubsub.disconnect()
+
+    async def test_reply_to_remote_request(self):
+        broker = SpyPubSub()
+        requester = RoutingPubSub([Route("test.", broker)])
+        responder = RoutingPubSub([Route("test.", broker)])
+        await requester.connect()
+        await responder.connect()
+
+        async def respond() -> None:
+            async with responder.subscribe("test.cmd", reply=True) as subscription:
+                async for msg in subscription:
+                    reply_subject = msg.get_reply_subject()
+                    assert reply_subject is not None
+                    await responder.publish(reply_subject, msg.get_payload() * 2, {})
+
+        task = asyncio.create_task(respond())
+        await wait_for_interest(requester, "test.cmd")
+        reply = await asyncio.wait_for(requester.request("test.cmd", b"1", {}), 1)
+        assert reply.get_payload() == b"11"
+        task.cancel()
+        await requester.disconnect()
+        await responder.disconnect()
+
+    async def test_connect_fails_when_interest_cannot_be_tracked(self):
+        pubsub = RoutingPubSub([Route("test.", ClosingPubSub(fail=True))])
+        with pytest.raises(ConnectionError, match="Subscription failed"):
+            await asyncio.wait_for(pubsub.connect(), 1)
+        await pubsub.disconnect()
+
+    async def test_interest_is_assumed_once_tracking_stopped(self):
+        broker = ClosingPubSub()
+        pubsub = RoutingPubSub([Route("test.", broker)])
+        await pubsub.connect()
+        assert not pubsub.has_interest("test.a")
+        # Remote subscription is closed while backend is connected
+        broker.closed.set()
+        await wait_for_interest(pubsub, "test.a")
+        await pubsub.publish("test.a", b"1", {})
+        assert broker.published == ["test.a"]
+        await pubsub.disconnect()
+        # Interest is tracked again after reconnecting
+        broker.closed.clear()
+        await pubsub.connect()
+        assert not pubsub.has_interest("test.a")
+        await pubsub.disconnect()
+
+    async def test_interest_cache_is_bounded(self):
+        pubsub = RoutingPubSub([Route("test.", SpyPubSub())], max_interest_cache=2)
+        await pubsub.connect()
+        for subject in ("test.a", "test.b", "test.a", "test.c"):
+            assert not pubsub.has_interest(subject)
+        [link] = pubsub._links.values()
+        # Least recently used subject is evicted
+        assert list(link.cache) == ["test.a", "test.c"]
+        await pubsub.disconnect()
+
+    async def test_prefix_is_matched_token_by_token(self):
+        broker = SpyPubSub()
+        pubsub = RoutingPubSub([Route("test", broker, remote="always")])
+        await pubsub.connect()
+        for subject in ("test", "test.a", "testing.a"):
+            await pubsub.publish(subject, b"1", {})
+        assert broker.published == ["test", "test.a"]
+        await pubsub.disconnect()
+
+    async def test_wildcard_subscription_uses_all_matching_routes(self):
+        orders, users = SpyPubSub(), SpyPubSub()
+        routes = [Route("orders", orders), Route("users", users), Route("local")]
+        first = RoutingPubSub(routes)
+        second = RoutingPubSub(routes)
+        await first.connect()
+        await second.connect()
+        async with second.subscribe("*.created") as subscription:
+            await wait_for_interest(first, "orders.created")
+            await wait_for_interest(first, "users.created")
+            assert not first.has_interest("local.created")
+            await first.publish("orders.created", b"1", {})
+            await first.publish("users.created", b"2", {})
+            payloads = {
+                (await asyncio.wait_for(subscription.__anext__(), 1)).get_payload()
+                for _ in range(2)
+            }
+            assert payloads == {b"1", b"2"}
+        assert orders.published == ["orders.created"]
+        assert users.published == ["users.created"]
+        await first.disconnect()
+        await second.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_merge_ends_once_all_sources_ended():
+    async def source(*items: t.Any) -> t.AsyncIterator[t.Any]:
+        for item in items:
+            yield item
+
+    async def collect(iterator: t.AsyncIterator[t.Any]) -> t.List[t.Any]:
+        return [item async for item in iterator]
+
+    async with _merge(source(1, 2), source(), source(3)) as merged:
+        items = await asyncio.wait_for(collect(merged), 1)
+    assert sorted(items) == [1, 2, 3]
@@ -0,0 +1,174 @@
+import asyncio
+import typing as t
+from contextlib import asynccontextmanager
+
+import pytest
+
+from synopsys import Play, create_bus
+from synopsys.__main__ import main
+from synopsys.adapters import InMemoryPubSub
+from synopsys.aio import Bridge, BridgeRule
+from synopsys.interfaces.pubsub import PubSubMsg
+
+
+class SlowPubSub(InMemoryPubSub):
+    """An in-memory pubsub recording published messages, and waiting on each publish."""
+
+    def __init__(self, delay: float = 0, fail_on: t.Optional[str] = None) -> None:
+        super().__init__()
+        self.delay = delay
+        self.fail_on = fail_on
+        self.published: t.List[t.Tuple[str, bytes, t.Dict[str, str]]] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def publish(
+        self,
+        subject: str,
+        payload: bytes,
+        headers: t.Dict[str, str],
+        timeout: t.Optional[float] = None,
+    ) -> None:
+        if subject == self.fail_on:
+            raise RuntimeError("publish failed")
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.in_flight -= 1
+        self.published.append((subject, payload, headers))
+
+
+async def wait_for(condition: t.Callable[[], bool]) -> None:
+    while not condition():
+        await asyncio.sleep(0.001)
+
+
+async def wait_for_subscriptions(pubsub: InMemoryPubSub, count: int) -> None:
+    await wait_for(lambda: len(pubsub.observers) >= count)
+
+
+def test_bridge_invalid_arguments():
+    source, target = InMemoryPubSub(), InMemoryPubSub()
+    with pytest.raises(ValueError, match="rule"):
+        Bridge(source, target, [])
+    with pytest.raises(ValueError, match="max_batch"):
+        Bridge(source, target, [BridgeRule("a")], max_batch=0)
+    with pytest.raises(ValueError, match="max_in_flight"):
+        Bridge(source, target, [BridgeRule("a")], max_in_flight=0)
+    with pytest.raises(ValueError, match="Cannot rewrite"):
+        Bridge(source, target, [BridgeRule("a.*", "b")])
+
+
+def test_bridge_cli(monkeypatch: pytest.MonkeyPatch):
+    bridges: t.List[t.Tuple[Bridge, str]] = []
+
+    def run(self: Bridge, loop: str, report_interval: float) -> None:
+        bridges.append((self, loop))
+
+    monkeypatch.setattr(Bridge, "main", run)
+    main(
+        [
+            "bridge",
+            "synopsys.adapters:InMemoryPubSub",
+            "synopsys.adapters:InMemoryPubSub",
+            "-r",
+            "orders.>",
+            "-r",
+            "devices.*=legacy.*",
+            "--max-in-flight",
+            "10",
+            "--loop",
+            "asyncio",
+        ]
+    )
+    [(bridge, loop)] = bridges
+    assert loop == "asyncio"
+    assert bridge.rules == [BridgeRule("orders.>"), BridgeRule("devices.*", "legacy.*")]
+    assert bridge.max_in_flight == 10
+
+
+@pytest.mark.asyncio
+class TestBridge:
+    async def test_bridge_raw_messages(self):
+        source, target = InMemoryPubSub(), SlowPubSub()
+        bridge = Bridge(
+            source,
+            target,
+            [BridgeRule("orders.>"), BridgeRule("devices.*.status", "legacy.*")],
+        )
+        task = asyncio.create_task(bridge.run())
+        await wait_for_subscriptions(source, 2)
+        await source.publish("orders.1.created", b"\x00", {"key": "value"})
+        await source.publish("devices.a.status", b"ok", {})
+        await source.publish("other", b"ignored", {})
+        await wait_for(lambda: len(target.published) == 2)
+        assert sorted(target.published) == [
+            ("legacy.a", b"ok", {}),
+            ("orders.1.created", b"\x00", {"key": "value"}),
+        ]
+        assert bridge.metrics.received == 2
+        assert bridge.metrics.published == 2
+        assert bridge.metrics.bytes == 3
+        assert "synopsys_bridge_messages_published_total 2" in (
+            bridge.metrics.render_prometheus()
+        )
+        task.cancel()
+
+    async def test_in_flight_window(self):
+        source, target = InMemoryPubSub(), SlowPubSub(delay=0.005)
+        bridge = Bridge(
+            source, target, [BridgeRule("test")], max_batch=2, max_in_flight=4
+        )
+        task = asyncio.create_task(bridge.run())
+        await wait_for_subscriptions(source, 1)
+        for idx in range(20):
+            await source.publish("test", str(idx).encode(), {})
+            assert bridge.metrics.in_flight <= 4
+        await wait_for(lambda: len(target.published) == 20)
+        assert bridge.metrics.in_flight == 0
+        # Batches are published concurrently, within the in-flight window
+        assert 1 < target.max_in_flight <= 4
+        task.cancel()
+
+    async def test_publish_errors_are_counted(self):
+        source, target = InMemoryPubSub(), SlowPubSub(fail_on="fail")
+        bridge = Bridge(source, target, [BridgeRule("*")])
+        task = asyncio.create_task(bridge.run())
+        await wait_for_subscriptions(source, 1)
+        await source.publish("fail", b"", {})
+        await source.publish("ok", b"", {})
+        await wait_for(lambda: bridge.metrics.published == 1)
+        assert bridge.metrics.failed == 1
+        assert bridge.metrics.in_flight == 0
+        task.cancel()
+
+    async def test_failed_rule_stops_other_rules(self):
+        class FailingPubSub(InMemoryPubSub):
+            @asynccontextmanager
+            async def subscribe(
+                self, subject: str, queue: t.Optional[str] = None, reply: bool = False
+            ) -> t.AsyncIterator[t.AsyncIterator[PubSubMsg]]:
+                if subject == "fail":
+                    # Let other rules subscribe before failing
+                    await asyncio.sleep(0.01)
+                    raise ConnectionError("subscribe failed")
+                async with super().subscribe(subject, queue, reply) as subscription:
+                    yield subscription
+
+        source = FailingPubSub()
+        bridge = Bridge(source, SlowPubSub(), [BridgeRule("ok"), BridgeRule("fail")])
+        with pytest.raises(ConnectionError, match="subscribe failed"):
+            await asyncio.wait_for(bridge.run(), 1)
+        assert source.observers == []
+        assert bridge._window is None
+
+    async def test_bridge_actor(self):
+        pubsub, target = InMemoryPubSub(), SlowPubSub()
+        bridge = Bridge(pubsub, target, [BridgeRule("test")])
+        async with Play(create_bus(pubsub), [bridge.actor()]) as play:
+            await wait_for_subscriptions(pubsub, 1)
+            await play.bus.pubsub.publish("test", b"1", {})
+            await wait_for(lambda: len(target.published) == 1)
+            play.cancel()
@@ -0,0 +1,483 @@
+import asyncio
+import threading
+import typing as t
+
+import pytest
+import pytest_asyncio
+
+from synopsys import EventBus, Message, Reply, create_bus, create_event, create_flow
+from synopsys.adapters import InMemoryPubSub, PseudoJSONCodec
+from synopsys.aio import DecodeOffloadPolicy
+from synopsys.aio.batch import BufferReader
+from synopsys.interfaces.instrumentation import BusInstrumentation
+
+
+@pytest_asyncio.fixture
+async def bus() -> t.AsyncIterator[EventBus]:
+    """A fixture which returns an in-memory event bus."""
+    bus = create_bus(InMemoryPubSub())
+    try:
+        yield bus
+    finally:
+        await bus.disconnect()
+
+
+@pytest.mark.asyncio
+class TestEventBusPublisher:
+    async def test_publisher_renders_subject_once(self, bus: EventBus):
+        event = create_event(
+            "test-event",
+            "test.{device}",
+            schema=int,
+            scope_schema=t.Dict[str, str],
+            metadata_schema=t.Dict[str, str],
+        )
+        publisher = bus.publisher(
+            event, scope={"device": "XXX"}, metadata={"test": "somemeta"}
+        )
+        assert publisher.subject == "test.XXX"
+        assert publisher.headers == {"test": "somemeta"}
+        waiter = await bus.wait_in_background(event)
+        await publisher.publish(12)
+        assert await waiter.wait(timeout=0.1) == Message(
+            subject="test.XXX",
+            scope={"device": "XXX"},
+            data=12,
+            metadata={"test": "somemeta"},
+            event=event,
+        )
+
+    async def test_publisher_metadata_override(self, bus: EventBus):
+        event = create_event(
+            "test-event", "test", schema=int, metadata_schema=t.Dict[str, str]
+        )
+        publisher = bus.publisher(event, metadata={"test": "default"})
+        waiter = await bus.wait_in_background(event)
+        await publisher.publish(12, metadata={"test": "override"})
+        received = await waiter.wait(timeout=0.1)
+        assert received.metadata == {"test": "override"}
+        assert publisher.headers == {"test": "default"}
+
+    async def test_publisher_missing_placeholder(self, bus: EventBus):
+        event = create_event(
+            "test-event", "test.{device}", scope_schema=t.Dict[str, str]
+        )
+        with pytest.raises(ValueError, match="Cannot render subject"):
+            bus.publisher(event)
+
+    async def test_publisher_event_not_declared_in_flow(self, bus: EventBus):
+        event = create_event("test-event", "test")
+        other_event = create_event("other-event", "other")
+        flow_bus = bus.bind_flow(create_flow("test-flow", emits=[other_event]))
+        with pytest.raises(ValueError, match="Cannot publish an event not declared"):
+            flow_bus.publisher(event)
+
+
+async def _respond(bus: EventBus, event: t.Any, offset: int) -> None:
+    async with bus.subscribe(event) as subscription:
+        async for msg in subscription:
+            await bus.reply(msg, data=msg.data + offset)
+
+
+@pytest.mark.asyncio
+class TestEventBusRequestMany:
+    async def test_request_many_gathers_replies(self, bus: EventBus):
+        event = create_event("test-event", "test", schema=int, reply_schema=int)
+        responders = [
+            asyncio.create_task(_respond(bus, event, offset)) for offset in range(3)
+        ]
+        await asyncio.sleep(0)
+        try:
+            async with bus.request_many(event, 10, max_replies=3, timeout=1) as replies:
+                received = [reply async for reply in replies]
+        finally:
+            for responder in responders:
+                responder.cancel()
+        assert sorted(reply.data for reply in received) == [10, 11, 12]
+        assert received[0] == Reply(data=received[0].data, metadata=None)
+
+    async def test_request_many_stops_on_timeout(self, bus: EventBus):
+        event = create_event("test-event", "test", schema=int, reply_schema=int)
+        responder = asyncio.create_task(_respond(bus, event, 1))
+        await asyncio.sleep(0)
+        try:
+            async with bus.request_many(event, 10, timeout=0.05) as replies:
+                received = [reply.data async for reply in replies]
+        finally:
+            responder.cancel()
+        assert received == [11]
+
+    async def test_request_many_early_termination(self, bus: EventBus):
+        event = create_event("test-event", "test", schema=int, reply_schema=int)
+        responders = [
+            asyncio.create_task(_respond(bus, event, offset)) for offset in range(3)
+        ]
+        await asyncio.sleep(0)
+        try:
+            async with bus.request_many(event, 10) as replies:
+                async for reply in replies:
+                    break
+        finally:
+            for responder in responders:
+                responder.cancel()
+        assert reply.data in (10, 11, 12)
+        # Reply observer must be removed on exit
+        assert len(bus.pubsub.observers) == 3  # type: ignore[attr-defined]
+
+    async def test_request_many_event_not_declared_in_flow(self, bus: EventBus):
+        event = create_event("test-event", "test", reply_schema=int)
+        flow_bus = bus.bind_flow(create_flow("test-flow"))
+        with pytest.raises(ValueError, match="Cannot request an event not declared"):
+            async with flow_bus.request_many(event, None):
+                pass  # pragma: no cover
+
+
+@pytest.mark.asyncio
+class TestEventBusWaiters:
+    async def test_waiters_share_a_single_subscription(self, bus: EventBus):
+        event = create_event(
+            "test-event",
+            "test.{device}",
+            schema=int,
+            scope_schema=t.Dict[str, str],
+        )
+        waiters = [
+            await bus.wait_in_background(event, scope={"device": str(idx)})
+            for idx in range(100)
+        ]
+        assert len(bus.pubsub.observers) == 1  # type: ignore[attr-defined]
+        await bus.publish(event, 42, scope={"device": "42"})
+        received = await waiters[42].wait(timeout=0.1)
+        assert received.scope == {"device": "42"}
+        assert not any(waiter.task.done() for waiter in waiters[:42])
+        # Cancel remaining waiters
+        for waiter in waiters:
+            waiter.task.cancel()
+        await asyncio.sleep(0)
+        # Subscription is closed once all waiters are done
+        assert bus._dispatchers == {}
+        await asyncio.sleep(0)
+        assert len(bus.pubsub.observers) == 0  # type: ignore[attr-defined]
+
+    async def test_waiter_with_predicate(self, bus: EventBus):
+        event = create_event("test-event", "test", schema=int)
+        waiter = await bus.wait_in_background(event, predicate=lambda m: m.data > 1)
+        await bus.publish(event, 1)
+        assert not waiter.task.done()
+        await bus.publish(event, 2)
+        assert (await waiter.wait(timeout=0.1)).data == 2
+
+    async def test_waiter_with_partial_scope(self, bus: EventBus):
+        event = create_event(
+            "test-event",
+            "test.{device}.{location}",
+            schema=int,
+            scope_schema=t.Dict[str, str],
+        )
+        waiter = await bus.wait_in_background(event, scope={"location": "westus"})
+        await bus.publish(event, 1, scope={"device": "XXX", "location": "eastus"})
+        assert not waiter.task.done()
+        await bus.publish(event, 2, scope={"device": "XXX", "location": "westus"})
+        assert (await waiter.wait(timeout=0.1)).data == 2
+
+    async def test_next_event(self, bus: EventBus):
+        event = create_event("test-event", "test", schema=int)
+        task = asyncio.create_task(bus.next_event(event))
+        await asyncio.sleep(0.01)
+        await bus.publish(event, 1)
+        assert (await asyncio.wait_for(task, 0.1)).data == 1
+
+
+@pytest.mark.asyncio
+class TestEventBusSubscribeBatch:
+    async def test_subscribe_batch_takes_buffered_messages(self, bus: EventBus):
+        event = create_event("test-event", "test", schema=int)
+        async with bus.subscribe_batch(event, max_batch=3, max_wait=0.05) as batches:
+            for idx in range(5):
+                await bus.publish(event, idx)
+            first = await batches.__anext__()
+            second = await batches.__anext__()
+        assert [msg.data for msg in first] == [0, 1, 2]
+        assert [msg.data for msg in second] == [3, 4]
+
+    async def test_subscribe_batch_does_not_wait_by_default(self, bus: EventBus):
+        event = create_event("test-event", "test", schema=int)
+        async with bus.subscribe_batch(event) as batches:
+            await bus.publish(event, 1)
+            batch = await asyncio.wait_for(batches.__anext__(), 0.1)
+        assert [msg.data for msg in batch] == [1]
+
+    async def test_buffer_reader_keeps_pending_read_across_timeouts(self):
+        buffer: "asyncio.Queue[int]" = asyncio.Queue()
+        reader = BufferReader(buffer)
+        with pytest.raises(asyncio.TimeoutError):
+            await reader.get(0.01)
+        # Item taken by the read pending since timeout is not lost
+        buffer.put_nowait(1)
+        buffer.put_nowait(2)
+        await asyncio.sleep(0)
+        assert buffer.qsize() == 1
+        assert await reader.get(0) == 1
+        assert reader.get_nowait() == 2
+        with pytest.raises(asyncio.QueueEmpty):
+            reader.get_nowait()
+        reader.close()
+
+    async def test_subscribe_batch_invalid_max_batch(self, bus: EventBus):
+        event = create_event("test-event", "test", schema=int)
+        with pytest.raises(ValueError, match="max_batch must be greater than 0"):
+            async with bus.subscribe_batch(event, max_batch=0):
+                pass  # pragma: no cover
+
+
+@pytest.mark.asyncio
+class TestEventBusDecodeOffload:
+    async def test_large_payloads_are_decoded_in_thread(self):
+        event = create_event("test-event", "test", schema=t.List[int])
+        small_event = create_event("small-event", "small", schema=t.List[int])
+        threads: t.List[str] = []
+
+        class Codec(PseudoJSONCodec):
+            def decode_payload(self, raw: bytes, schema: t.Type[t.Any]) -> t.Any:
+                threads.append(threading.current_thread().name)
+                return super().decode_payload(raw, schema)
+
+        policy = DecodeOffloadPolicy(threshold=100, overrides={small_event: None})
+        bus = create_bus(InMemoryPubSub(), codec=Codec(), offload=policy)
+        main_thread = threading.current_thread().name
+        async with bus:
+            for evt in (event, small_event):
+                async with bus.subscribe(evt) as subscription:
+                    await bus.publish(evt, [1])
+                    await subscription.__anext__()
+                    await bus.publish(evt, list(range(100)))
+                    msg = await subscription.__anext__()
+                    assert msg.data == list(range(100))
+        assert threads[0] == main_thread
+        assert threads[1] != main_thread
+        assert threads[2:] == [main_thread, main_thread]
+
+
+def test_offload_policy_bound_to_flow():
+    policy = DecodeOffloadPolicy()
+    bus = create_bus(InMemoryPubSub(), offload=policy)
+    assert bus.bind_flow(create_flow("test-flow")).offload is policy
+
+
+class _RecordingInstrumentation(BusInstrumentation):
+    def __init__(self) -> None:
+        self.calls: t.List[t.Tuple[t.Any, ...]] = []
+
+    def message_encoded(self, bus, event, duration, payload_size, headers_size):
+        self.calls.append(("message_encoded", event.name, payload_size, headers_size))
+
+    def message_decoded(self, bus, event, duration, payload_size, headers_size):
+        self.calls.append(("message_decoded", event.name, payload_size, headers_size))
+
+    def reply_encoded(self, bus, event, duration, payload_size, headers_size):
+        self.calls.append(("reply_encoded", event.name, payload_size, headers_size))
+
+    def reply_decoded(self, bus, event, duration, payload_size, headers_size):
+        self.calls.append(("reply_decoded", event.name, payload_size, headers_size))
+
+    def message_published(self, bus, event, subject, duration):
+        assert duration >= 0
+        self.calls.append(("message_published", event.name, subject))
+
+    def reply_published(self, bus, event, subject, duration):
+        assert duration >= 0
+        self.calls.append(("reply_published", event.name))
+
+    def request_completed(self, bus, event, subject, duration):
+        assert duration >= 0
+        self.calls.append(("request_completed", event.name, subject))
+
+    def message_dropped(self, bus, event, subject):
+        self.calls.append(("message_dropped", event.name, subject))
+
+
+@pytest.mark.asyncio
+class TestEventBusInstrumentation:
+    async def test_publish_and_subscribe_are_observed(self):
+        instrumentation = _RecordingInstrumentation()
+        bus = create_bus(InMemoryPubSub(), instrumentation=instrumentation)
+        event = create_event(
+            "test-event", "test", schema=int, metadata_schema=t.Dict[str, str]
+        )
+        async with bus.subscribe(event) as subscription:
+            await bus.publish(event, 1234, metadata={"key": "value"})
+            await subscription.__anext__()
+        assert instrumentation.calls == [
+            ("message_encoded", "test-event", 4, 8),
+            ("message_published", "test-event", "test"),
+            ("message_decoded", "test-event", 4, 8),
+        ]
+
+    async def test_request_and_reply_are_observed(self):
+        instrumentation = _RecordingInstrumentation()
+        bus = create_bus(InMemoryPubSub(), instrumentation=instrumentation)
+        event = create_event("test-event", "test", schema=int, reply_schema=int)
+        responder = asyncio.create_task(_respond(bus, event, 100))
+        await asyncio.sleep(0)
+        try:
+            reply = await bus.request(event, 1, timeout=1)
+        finally:
+            responder.cancel()
+        assert reply.data == 101
+        assert instrumentation.calls == [
+            ("message_encoded", "test-event", 1, 0),
+            ("message_decoded", "test-event", 1, 0),
+            ("reply_encoded", "test-event", 3, 0),
+            ("reply_published", "test-event"),
+            ("request_completed", "test-event", "test"),
+            ("reply_decoded", "test-event", 3, 0),
+        ]
+
+    async def test_publisher_and_bound_flow_are_observed(self):
+        instrumentation = _RecordingInstrumentation()
+        event = create_event("test-event", "test", schema=int)
+        bus = create_bus(InMemoryPubSub(), instrumentation=instrumentation)
+        flow_bus = bus.bind_flow(create_flow("test-flow", emits=[event]))
+        assert flow_bus.instrumentation is instrumentation
+        await flow_bus.publisher(event).publish(12)
+        assert instrumentation.calls == [
+            ("message_encoded", "test-event", 2, 0),
+            ("message_published", "test-event", "test"),
+        ]
+
+
+@pytest.mark.asyncio
+class TestEventBusTrackLatency:
+    async def test_messages_are_stamped(self):
+        bus = create_bus(InMemoryPubSub(), track_latency=True)
+        event = create_event(
+            "test-event", "test", schema=int, metadata_schema=t.Dict[str, str]
+        )
+        waiter = await bus.wait_in_background(event)
+        await bus.publish(event, 1, metadata={"key": "value"})
+        msg = await waiter.wait(timeout=0.1)
+        # Delivery headers are not decoded as metadata
+        assert msg.metadata == {"key": "value"}
+        assert msg.published_at is not None
+        assert msg.message_id is not None
+        assert bus.bind_flow(create_flow("test-flow")).track_latency
+
+    async def test_messages_are_not_stamped_by_default(self, bus: EventBus):
+        event = create_event("test-event", "test", schema=int)
+        waiter = await bus.wait_in_background(event)
+        await bus.publish(event, 1)
+        msg = await waiter.wait(timeout=0.1)
+        assert msg.published_at is None
+        assert msg.message_id is None
+
+
+@pytest.mark.asyncio
+class TestEventBusSubscribeFilters:
+    async def test_single_filter_is_used_as_subject(self, bus: EventBus):
+        event = create_event(
+            "test-event",
+            "test.{device}.{location}",
+            schema=int,
+            scope_schema=t.Dict[str, str],
+        )
+        flow = create_flow("test-flow", event=event, scope={"location": "westus"})
+        async with bus.bind_flow(flow).subscribe(event) as subscription:
+            [observer] = bus.pubsub.observers  # type: ignore[attr-defined]
+            assert observer.subject == "test.*.westus"
+            await bus.publish(event, 1, scope={"device": "a", "location": "westus"})
+            msg = await asyncio.wait_for(subscription.__anext__(), 0.1)
+        assert msg.scope == {"device": "a", "location": "westus"}
+
+    async def test_several_filters_share_a_subscription(self, bus: EventBus):
+        event = create_event(
+            "test-event",
+            "test.{device}.{location}",
+            schema=int,
+            scope_schema=t.Dict[str, str],
+        )
+        flow = create_flow(
+            "test-flow",
+            event=event,
+            scope=[
+                {"device": "a", "location": "westus"},
+                {"device": "b", "location": "eastus"},
+            ],
+        )
+        assert flow.filter.subject == "test.*.*"
+        received: t.List[int] = []
+
+        async def consume(subscription: t.AsyncIterator[t.Any]) -> None:
+            async for msg in subscription:
+                received.append(msg.data)
+
+        async with bus.subscribe(event, filters=flow.filters) as subscription:
+            assert len(bus.pubsub.observers) == 1  # type: ignore[attr-defined]
+            task = asyncio.create_task(consume(subscription))
+            for idx, (device, location) in enumerate(
+                [("a", "westus"), ("a", "eastus"), ("b", "westus"), ("b", "eastus")]
+            ):
+                await bus.publish(
+                    event, idx, scope={"device": device, "location": location}
+                )
+            await asyncio.sleep(0.01)
+            task.cancel()
+        assert received == [0, 3]
+
+    async def test_subscribe_without_filters(self, bus: EventBus):
+        event = create_event(
+            "test-event", "test.{device}", schema=int, scope_schema=t.Dict[str, str]
+        )
+        flow = create_flow("test-flow", event=event)
+        assert flow.filters == []
+        async with bus.bind_flow(flow).subscribe(event):
+            [observer] = bus.pubsub.observers  # type: ignore[attr-defined]
+            assert observer.subject == "test.*"
+
+
+@pytest.mark.asyncio
+class TestEventBusSubscribePredicates:
+    async def test_messages_dropped_before_payload_is_decoded(self):
+        instrumentation = _RecordingInstrumentation()
+        bus = create_bus(InMemoryPubSub(), instrumentation=instrumentation)
+        event = create_event(
+            "test-event", "test", schema=int, metadata_schema=t.Dict[str, str]
+        )
+        dropped: t.List[str] = []
+        received: t.List[int] = []
+
+        async def consume(subscription: t.AsyncIterator[t.Any]) -> None:
+            async for msg in subscription:
+                received.append(msg.data)
+
+        async with bus.subscribe(
+            event,
+            header_predicate=lambda headers: headers.get("tenant") == "a",
+            metadata_predicate=lambda metadata: metadata["priority"] == "high",
+            on_dropped=lambda msg: dropped.append(msg.get_subject()),
+        ) as subscription:
+            task = asyncio.create_task(consume(subscription))
+            for idx, (tenant, priority) in enumerate(
+                [("a", "high"), ("b", "high"), ("a", "low")]
+            ):
+                await bus.publish(
+                    event, idx, metadata={"tenant": tenant, "priority": priority}
+                )
+            await asyncio.sleep(0.01)
+            task.cancel()
+        assert received == [0]
+        assert dropped == ["test", "test"]
+        assert [call[0] for call in instrumentation.calls].count("message_decoded") == 1
+        assert ("message_dropped", "test-event", "test") in instrumentation.calls
+
+    async def test_predicate_error_skips_message(self, bus: EventBus):
+        event = create_event("test-event", "test", schema=int)
+
+        def predicate(headers: t.Dict[str, str]) -> bool:
+            raise ValueError("boom")
+
+        async with bus.subscribe(event, header_predicate=predicate) as subscription:
+            task = asyncio.create_task(subscription.__anext__())
+            await bus.publish(event, 1)
+            await asyncio.sleep(0.01)
+            assert not task.done()
+            task.cancel()
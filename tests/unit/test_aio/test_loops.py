@@ -0,0 +1,75 @@
+import typing as t
+
+import anyio
+import pytest
+
+from synopsys import EventBus, Play, Subscriber, create_bus, create_event, create_flow
+from synopsys.adapters import InMemoryPubSub
+from synopsys.runner import LOOPS, get_backend, has_uvloop
+
+AVAILABLE_LOOPS = [
+    loop for loop in LOOPS if loop != "auto" and (loop != "uvloop" or has_uvloop())
+]
+
+
+def test_get_backend_auto():
+    if has_uvloop():
+        assert get_backend("auto") == ("asyncio", {"use_uvloop": True})
+    else:
+        assert get_backend("auto") == ("asyncio", {})
+
+
+def test_get_backend_invalid_loop():
+    with pytest.raises(ValueError, match="Invalid loop: 'other'"):
+        get_backend("other")
+
+
+def test_get_backend_trio_is_rejected():
+    with pytest.raises(ValueError, match="trio is not supported"):
+        get_backend("trio")
+
+
+def test_play_main_uses_selected_loop(monkeypatch: pytest.MonkeyPatch):
+    calls: t.List[t.Tuple[str, t.Dict[str, t.Any]]] = []
+
+    def run(func: t.Any, backend: str, backend_options: t.Dict[str, t.Any]) -> None:
+        calls.append((backend, backend_options))
+
+    monkeypatch.setattr("synopsys.aio.play.run", run)
+    Play(create_bus(InMemoryPubSub())).main(loop="asyncio")
+    assert calls == [("asyncio", {})]
+
+
+@pytest.mark.parametrize("loop", AVAILABLE_LOOPS)
+def test_play_runs_on_loop(loop: str):
+    EVENT = create_event("test-event", "test.event", schema=int)
+    received: t.List[int] = []
+
+    async def produce(bus: EventBus) -> None:
+        for idx in range(10):
+            await bus.publish(EVENT, idx)
+
+    async def handle(msg: t.Any) -> None:
+        received.append(msg.data)
+
+    async def main() -> None:
+        pubsub = InMemoryPubSub()
+        with anyio.fail_after(1):
+            async with Play(
+                create_bus(pubsub),
+                [
+                    Subscriber(
+                        flow=create_flow("test-subscriber", event=EVENT), handler=handle
+                    )
+                ],
+            ) as play:
+                while not pubsub.observers:
+                    await anyio.sleep(0.001)
+                await produce(play.bus)
+                while len(received) < 10:
+                    await anyio.sleep(0.001)
+                play.cancel()
+
+    backend, backend_options = get_backend(loop)
+    anyio.run(main, backend=backend, backend_options=backend_options)
+    assert received == list(range(10))
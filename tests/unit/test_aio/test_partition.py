@@ -0,0 +1,200 @@
+import asyncio
+import typing as t
+from contextlib import AsyncExitStack, asynccontextmanager
+
+import pytest
+
+from synopsys import Play, Subscriber, create_bus, create_event, create_flow
+from synopsys.adapters import InMemoryPubSub
+from synopsys.aio import PartitionGroup, run_virtual
+from synopsys.aio.partition import PARTITIONS_SUBJECT
+from synopsys.entities import Message
+from synopsys.interfaces.pubsub import PubSubMsg
+
+EVENT = create_event(
+    "test-event",
+    "test.{region}.{device}",
+    schema=int,
+    scope_schema=t.Dict[str, str],
+)
+
+DEVICES = [f"device-{idx}" for idx in range(20)]
+
+
+async def wait_for(condition: t.Callable[[], bool]) -> None:
+    while not condition():
+        await asyncio.sleep(0.001)
+
+
+def test_invalid_partition_group():
+    with pytest.raises(ValueError, match="heartbeat"):
+        PartitionGroup(InMemoryPubSub(), "test", heartbeat=0)
+    with pytest.raises(ValueError, match="ttl"):
+        PartitionGroup(InMemoryPubSub(), "test", heartbeat=1, ttl=0.5)
+
+
+def test_invalid_partitioned_subscriber():
+    async def handler(msg: t.Any) -> None:
+        pass
+
+    flow = create_flow("test-flow", event=EVENT)
+    with pytest.raises(ValueError, match="queue"):
+        Subscriber(flow=flow, handler=handler, partition_by=["device"])
+    with pytest.raises(ValueError, match="processes"):
+        Subscriber(
+            flow=flow,
+            handler=handler,
+            queue="workers",
+            processes=2,
+            partition_by=["device"],
+        )
+
+
+def test_expired_members_are_removed():
+    async def main() -> t.List[t.FrozenSet[str]]:
+        pubsub = InMemoryPubSub()
+        members: t.List[t.FrozenSet[str]] = []
+        async with PartitionGroup(pubsub, "test", member="a", heartbeat=1) as first:
+            second = PartitionGroup(pubsub, "test", member="b", heartbeat=1)
+            await second.__aenter__()
+            await wait_for(lambda: len(first.members) == 2)
+            members.append(first.members)
+            # Member stops sending heartbeats without leaving the group
+            assert second._heartbeat is not None
+            second._heartbeat.cancel()
+            await asyncio.sleep(2.5)
+            members.append(first.members)
+            await asyncio.sleep(2)
+            members.append(first.members)
+            await second.__aexit__()
+        return members
+
+    assert run_virtual(main) == [
+        frozenset({"a", "b"}),
+        frozenset({"a", "b"}),
+        frozenset({"a"}),
+    ]
+
+
+@pytest.mark.asyncio
+class TestPartitionGroup:
+    async def test_members_join_and_leave(self):
+        pubsub = InMemoryPubSub()
+        async with PartitionGroup(pubsub, "test", member="a") as first:
+            assert first.members == {"a"}
+            assert all(first.owns(device) for device in DEVICES)
+            async with PartitionGroup(pubsub, "test", member="b") as second:
+                await wait_for(lambda: len(first.members) == len(second.members) == 2)
+                # Each key is owned by a single member
+                for device in DEVICES:
+                    assert first.owns(device) != second.owns(device)
+                # Other groups are ignored
+                async with PartitionGroup(pubsub, "other", member="c"):
+                    await asyncio.sleep(0.01)
+                    assert first.members == {"a", "b"}
+            await wait_for(lambda: len(first.members) == 1)
+            assert all(first.owns(device) for device in DEVICES)
+
+    async def test_join_fails_when_subscription_fails(self):
+        class FailingPubSub(InMemoryPubSub):
+            @asynccontextmanager
+            async def subscribe(
+                self, subject: str, queue: t.Optional[str] = None, reply: bool = False
+            ) -> t.AsyncIterator[t.AsyncIterator[PubSubMsg]]:
+                raise ConnectionError("subscribe failed")
+                yield  # pragma: no cover
+
+        group = PartitionGroup(FailingPubSub(), "test", member="a")
+        with pytest.raises(ConnectionError, match="subscribe failed"):
+            await asyncio.wait_for(group.__aenter__(), 1)
+
+    async def test_invalid_announces_are_ignored(self):
+        pubsub = InMemoryPubSub()
+        async with PartitionGroup(pubsub, "test", member="a") as group:
+            await pubsub.publish(PARTITIONS_SUBJECT, b"invalid", {})
+            await pubsub.publish(PARTITIONS_SUBJECT, b"{}", {})
+            await asyncio.sleep(0.01)
+            assert group.members == {"a"}
+
+
+@pytest.mark.asyncio
+class TestSubscribePartitioned:
+    async def test_invalid_keys(self):
+        bus = create_bus(InMemoryPubSub())
+        with pytest.raises(ValueError, match="At least one partition key"):
+            async with bus.subscribe_partitioned(EVENT, "workers", keys=[]):
+                pass
+        with pytest.raises(ValueError, match="Unknown keys"):
+            async with bus.subscribe_partitioned(EVENT, "workers", keys=["unknown"]):
+                pass
+
+    async def test_messages_are_partitioned_by_scope(self):
+        pubsub = InMemoryPubSub()
+        received: t.Dict[str, t.List[t.Tuple[str, str]]] = {"a": [], "b": []}
+
+        async def consume(member: str, messages: t.AsyncIterator[t.Any]) -> None:
+            async for msg in messages:
+                received[member].append((msg.scope["device"], msg.scope["region"]))
+
+        async with AsyncExitStack() as stack:
+            tasks: t.List["asyncio.Task[None]"] = []
+            for member in ("a", "b"):
+                bus = create_bus(pubsub)
+                messages = await stack.enter_async_context(
+                    bus.subscribe_partitioned(
+                        EVENT, "workers", keys=["device"], member=member
+                    )
+                )
+                tasks.append(asyncio.create_task(consume(member, messages)))
+            await wait_for(lambda: len(pubsub.observers) == 4)
+            await asyncio.sleep(0.01)
+            publisher = create_bus(pubsub)
+            for region in ("eu", "us"):
+                for device in DEVICES:
+                    await publisher.publish(
+                        EVENT, 1, scope={"region": region, "device": device}
+                    )
+            await wait_for(lambda: len(received["a"]) + len(received["b"]) == 40)
+            for task in tasks:
+                task.cancel()
+        first = {device for device, _ in received["a"]}
+        second = {device for device, _ in received["b"]}
+        # Each device is delivered to a single member, whatever the region
+        assert first and second
+        assert first.isdisjoint(second)
+        assert first | second == set(DEVICES)
+        assert len(received["a"]) == 2 * len(first)
+
+    async def test_play_partitioned_subscribers(self):
+        pubsub = InMemoryPubSub()
+        received: t.Dict[str, t.Set[str]] = {"a": set(), "b": set()}
+        count = 0
+
+        def handler(name: str) -> t.Any:
+            async def handle(msg: Message[t.Any, t.Any, t.Any, t.Any, t.Any]) -> None:
+                nonlocal count
+                received[name].add(msg.scope["device"])
+                count += 1
+
+            return handle
+
+        actors = [
+            Subscriber(
+                flow=create_flow(f"test-flow-{name}", event=EVENT),
+                handler=handler(name),
+                queue="workers",
+                partition_by=["device"],
+            )
+            for name in ("a", "b")
+        ]
+        async with Play(create_bus(pubsub), actors) as play:
+            await wait_for(lambda: len(pubsub.observers) == 4)
+            await asyncio.sleep(0.01)
+            for device in DEVICES:
+                await play.bus.publish(
+                    EVENT, 1, scope={"region": "eu", "device": device}
+                )
+            await wait_for(lambda: count == len(DEVICES))
+            play.cancel()
+        assert received["a"] and received["b"]
+        assert received["a"].isdisjoint(received["b"])
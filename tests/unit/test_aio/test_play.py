@@ -1,4 +1,7 @@
 import asyncio
+import os
+import threading
+import time
 import typing as t
 
 import pytest
@@ -6,8 +9,26 @@ import pytest_asyncio
 from _pytest.fixtures import SubRequest
 from anyio import fail_after
 
-from synopsys import EventBus, Play, Producer, create_bus, create_event, create_flow
+from synopsys import (
+    BatchSubscriber,
+    EventBus,
+    Play,
+    Producer,
+    Reply,
+    Service,
+    SimpleReply,
+    Subscriber,
+    create_bus,
+    create_event,
+    create_flow,
+)
 from synopsys.adapters import InMemoryPubSub, NATSPubSub
+from synopsys.aio import LoopWatchdog
+from synopsys.interfaces.instrumentation import (
+    BusInstrumentation,
+    PlayHooks,
+    PlayInstrumentation,
+)
 
 
 @pytest_asyncio.fixture
@@ -156,3 +177,441 @@ class TestPlayProducers:
                                 break
                         # Cancel play
                         play.cancel()
+
+
+@pytest.mark.asyncio
+class TestPlayScopedSubscribers:
+    async def test_play_subscribes_using_flow_filters(self, bus: EventBus):
+        EVENT = create_event(
+            "test-event",
+            "test.{device}.{location}",
+            schema=int,
+            scope_schema=t.Dict[str, str],
+        )
+        received: t.List[int] = []
+        done = asyncio.Event()
+
+        async def handler(msg: t.Any) -> None:
+            received.append(msg.data)
+            if len(received) == 2:
+                done.set()
+
+        subscriber = Subscriber(
+            flow=create_flow(
+                "test-subscriber",
+                event=EVENT,
+                scope=[{"device": "a"}, {"location": "eastus"}],
+            ),
+            handler=handler,
+        )
+        with fail_after(1):
+            async with Play(bus, [subscriber]) as play:
+                await asyncio.sleep(0)
+                [observer] = bus.pubsub.observers  # type: ignore[attr-defined]
+                assert observer.subject == "test.*.*"
+                for idx, (device, location) in enumerate(
+                    [("a", "westus"), ("b", "westus"), ("b", "eastus")]
+                ):
+                    await bus.publish(
+                        EVENT, idx, scope={"device": device, "location": location}
+                    )
+                await done.wait()
+                play.cancel()
+        assert received == [0, 2]
+
+    async def test_play_service_subscribes_using_flow_filter(self, bus: EventBus):
+        COMMAND = create_event(
+            "test-command",
+            "test.{device}",
+            schema=int,
+            scope_schema=t.Dict[str, str],
+            reply_schema=int,
+        )
+        service = Service(
+            flow=create_flow("test-service", command=COMMAND, scope={"device": "a"}),
+            handler=_square,
+        )
+        with fail_after(1):
+            async with Play(bus, [service]) as play:
+                await asyncio.sleep(0)
+                [observer] = bus.pubsub.observers  # type: ignore[attr-defined]
+                assert observer.subject == "test.a"
+                reply = await bus.request(COMMAND, 3, scope={"device": "a"})
+                play.cancel()
+        assert reply.data == 9
+
+
+@pytest.mark.asyncio
+class TestPlaySharedSubscriptions:
+    async def test_play_subscribers_share_subscriptions(self, bus: EventBus):
+        CREATED = create_event(
+            "order-created",
+            "orders.{id}.created",
+            schema=int,
+            scope_schema=t.Dict[str, str],
+        )
+        SHIPPED = create_event(
+            "order-shipped",
+            "orders.{id}.shipped",
+            schema=int,
+            scope_schema=t.Dict[str, str],
+        )
+        USER = create_event("user", "users.created", schema=int)
+        received: t.List[t.Tuple[str, int]] = []
+        done = asyncio.Event()
+
+        def handler(name: str) -> t.Callable[[t.Any], t.Awaitable[None]]:
+            async def handle(msg: t.Any) -> None:
+                received.append((name, msg.data))
+                if len(received) == 6:
+                    done.set()
+
+            return handle
+
+        actors: t.List[t.Any] = [
+            Subscriber(
+                flow=create_flow("created", event=CREATED), handler=handler("created")
+            ),
+            Subscriber(
+                flow=create_flow("shipped", event=SHIPPED), handler=handler("shipped")
+            ),
+            Subscriber(
+                flow=create_flow("first", event=CREATED, scope={"id": "1"}),
+                handler=handler("first"),
+            ),
+            Subscriber(flow=create_flow("user", event=USER), handler=handler("user")),
+            # Subscribers within a queue group keep their own subscription
+            Subscriber(
+                flow=create_flow("queue", event=USER),
+                handler=handler("queue"),
+                queue="test",
+            ),
+        ]
+        with fail_after(1):
+            async with Play(bus, actors, share_subscriptions=True) as play:
+                await asyncio.sleep(0)
+                subjects = [
+                    observer.subject
+                    for observer in bus.pubsub.observers  # type: ignore[attr-defined]
+                ]
+                assert sorted(subjects) == [
+                    "orders.*.*",
+                    "users.created",
+                    "users.created",
+                ]
+                await bus.publish(CREATED, 1, scope={"id": "1"})
+                await bus.publish(SHIPPED, 2, scope={"id": "1"})
+                await bus.publish(CREATED, 3, scope={"id": "2"})
+                await bus.publish(USER, 4)
+                await done.wait()
+                play.cancel()
+        assert sorted(received) == [
+            ("created", 1),
+            ("created", 3),
+            ("first", 1),
+            ("queue", 4),
+            ("shipped", 2),
+            ("user", 4),
+        ]
+
+    async def test_play_slow_shared_subscriber_loses_no_message(
+        self, bus: EventBus, monkeypatch: pytest.MonkeyPatch
+    ):
+        monkeypatch.setattr("synopsys.aio.play._SHARED_BUFFER_SIZE", 1)
+        EVENT = create_event("test-event", "test.event", schema=int)
+        received: t.Dict[str, t.List[int]] = {"slow": [], "fast": []}
+        done = asyncio.Event()
+        release = asyncio.Event()
+
+        async def slow_handler(msg: t.Any) -> None:
+            await release.wait()
+            received["slow"].append(msg.data)
+            if len(received["slow"]) == 5:
+                done.set()
+
+        async def handler(msg: t.Any) -> None:
+            received["fast"].append(msg.data)
+
+        actors: t.List[t.Any] = [
+            Subscriber(flow=create_flow("slow", event=EVENT), handler=slow_handler),
+            Subscriber(flow=create_flow("fast", event=EVENT), handler=handler),
+        ]
+        with fail_after(1):
+            async with Play(bus, actors, share_subscriptions=True) as play:
+                await asyncio.sleep(0)
+
+                async def publish() -> None:
+                    for idx in range(5):
+                        await bus.publish(EVENT, idx)
+
+                # Publishing waits for the slow subscriber to catch up
+                task = asyncio.create_task(publish())
+                await asyncio.sleep(0.05)
+                assert not task.done()
+                release.set()
+                await task
+                await done.wait()
+                play.cancel()
+        assert received == {"slow": [0, 1, 2, 3, 4], "fast": [0, 1, 2, 3, 4]}
+
+
+@pytest.mark.asyncio
+class TestPlayBatchSubscribers:
+    async def test_play_start_with_a_batch_subscriber(self, bus: EventBus):
+        EVENT = create_event("test-event", "test.event", schema=int)
+        received: t.List[t.List[int]] = []
+        done = asyncio.Event()
+
+        async def handler(batch: t.List[t.Any]) -> None:
+            received.append([msg.data for msg in batch])
+            if sum(len(items) for items in received) == 10:
+                done.set()
+
+        subscriber = BatchSubscriber(
+            flow=create_flow("test-subscriber", event=EVENT),
+            handler=handler,
+            max_batch=4,
+            max_wait=0.05,
+        )
+        with fail_after(1):
+            async with Play(bus, [subscriber]) as play:
+                await asyncio.sleep(0)
+                for idx in range(10):
+                    await bus.publish(EVENT, idx)
+                await done.wait()
+                play.cancel()
+        assert [item for items in received for item in items] == list(range(10))
+        assert all(len(items) <= 4 for items in received)
+
+
+async def _square(msg: t.Any) -> Reply[int, None]:
+    # Executed within a worker process
+    return SimpleReply(data=msg.data * msg.data)
+
+
+async def _fail(msg: t.Any) -> None:
+    raise ValueError(os.getpid())
+
+
+@pytest.mark.asyncio
+class TestPlayProcessPool:
+    async def test_play_service_in_process_pool(self, bus: EventBus):
+        COMMAND = create_event(
+            "test-command", "test.command", schema=int, reply_schema=int
+        )
+        service = Service(
+            flow=create_flow("test-service", command=COMMAND),
+            handler=_square,
+            processes=2,
+        )
+        with fail_after(10):
+            async with Play(bus, [service]) as play:
+                await asyncio.sleep(0)
+                replies = await asyncio.gather(
+                    *(bus.request(COMMAND, idx) for idx in range(4))
+                )
+                play.cancel()
+        assert [reply.data for reply in replies] == [0, 1, 4, 9]
+
+    async def test_play_service_in_process_pool_reply_is_instrumented(self):
+        COMMAND = create_event(
+            "test-command", "test.command", schema=int, reply_schema=int
+        )
+        published: t.List[str] = []
+
+        class Instrumentation(BusInstrumentation):
+            def reply_published(self, bus, event, subject, duration) -> None:
+                published.append(event.name)
+
+        bus = create_bus(InMemoryPubSub(), instrumentation=Instrumentation())
+        service = Service(
+            flow=create_flow("test-service", command=COMMAND),
+            handler=_square,
+            processes=1,
+        )
+        with fail_after(10):
+            async with Play(bus, [service]) as play:
+                await asyncio.sleep(0)
+                reply = await bus.request(COMMAND, 3)
+                play.cancel()
+        assert reply.data == 9
+        assert published == ["test-command"]
+
+    async def test_play_subscriber_in_process_pool_failure(self, bus: EventBus):
+        EVENT = create_event("test-event", "test.event", schema=int)
+        failed = asyncio.Event()
+        errors: t.List[BaseException] = []
+
+        class Instrumentation(PlayInstrumentation):
+            def event_processing_failed(self, play, actor, msg, exc) -> None:
+                errors.append(exc)
+                failed.set()
+
+        subscriber = Subscriber(
+            flow=create_flow("test-subscriber", event=EVENT),
+            handler=_fail,
+            processes=1,
+        )
+        with fail_after(10):
+            async with Play(bus, [subscriber], Instrumentation()) as play:
+                await asyncio.sleep(0)
+                await bus.publish(EVENT, 1)
+                await failed.wait()
+                play.cancel()
+        assert isinstance(errors[0], ValueError)
+        # Handler was executed in another process
+        assert errors[0].args[0] != os.getpid()
+
+    async def test_play_process_pool_instrumentation_receives_scope(
+        self, bus: EventBus
+    ):
+        EVENT = create_event(
+            "test-event",
+            "test.{device}",
+            schema=int,
+            scope_schema=t.Dict[str, str],
+            metadata_schema=t.Dict[str, str],
+        )
+        failed = asyncio.Event()
+        received: t.List[t.Any] = []
+
+        class Instrumentation(PlayInstrumentation):
+            def event_received(self, play, actor, msg) -> None:
+                received.append((msg.scope, msg.metadata))
+
+            def event_processing_failed(self, play, actor, msg, exc) -> None:
+                failed.set()
+
+        subscriber = Subscriber(
+            flow=create_flow("test-subscriber", event=EVENT),
+            handler=_fail,
+            processes=1,
+        )
+        with fail_after(10):
+            async with Play(bus, [subscriber], Instrumentation()) as play:
+                await asyncio.sleep(0)
+                await bus.publish(
+                    EVENT, 1, scope={"device": "a"}, metadata={"key": "value"}
+                )
+                await failed.wait()
+                play.cancel()
+        assert received == [({"device": "a"}, {"key": "value"})]
+
+
+@pytest.mark.asyncio
+class TestPlayWatchdog:
+    async def test_play_watchdog_attributes_blocking_to_actor(self, bus: EventBus):
+        EVENT = create_event("test-event", "test.event", schema=int)
+        blocked = asyncio.Event()
+        lags: t.List[float] = []
+        reports: t.List[t.Tuple[t.Any, float, t.Any]] = []
+
+        class Instrumentation(PlayInstrumentation):
+            def event_loop_lag(self, play, lag) -> None:
+                lags.append(lag)
+
+            def event_loop_blocked(self, play, actor, duration, stack) -> None:
+                reports.append((actor, duration, stack))
+                blocked.set()
+
+        async def blocking_handler(msg: t.Any) -> None:
+            time.sleep(0.3)
+
+        subscriber = Subscriber(
+            flow=create_flow("test-subscriber", event=EVENT),
+            handler=blocking_handler,
+        )
+        play = Play(
+            bus,
+            [subscriber],
+            Instrumentation(),
+            watchdog=LoopWatchdog(threshold=0.1, interval=0.02),
+        )
+        with fail_after(5):
+            async with play:
+                await asyncio.sleep(0.05)
+                await bus.publish(EVENT, 1)
+                await blocked.wait()
+                play.cancel()
+        assert lags
+        actor, duration, stack = reports[0]
+        assert actor is subscriber
+        assert duration >= 0.2
+        assert "blocking_handler" in [frame.name for frame in stack]
+
+    async def test_play_watchdog_thread_is_stopped(self, bus: EventBus):
+        play = Play(bus, watchdog=LoopWatchdog(threshold=0.1, interval=0.02))
+        with fail_after(5):
+            async with play:
+                await asyncio.sleep(0.05)
+                assert "synopsys-watchdog" in [
+                    thread.name for thread in threading.enumerate()
+                ]
+                play.cancel()
+        assert "synopsys-watchdog" not in [
+            thread.name for thread in threading.enumerate()
+        ]
+
+
+def test_play_watchdog_invalid_threshold():
+    with pytest.raises(ValueError, match="greater than 0"):
+        LoopWatchdog(threshold=0)
+
+
+class TestPlayHooks:
+    def test_hooks_only_hold_overridden_methods(self):
+        class Received(PlayInstrumentation):
+            def event_received(self, play, actor, msg) -> None:
+                pass  # pragma: no cover
+
+        class ReceivedAndProcessed(Received):
+            def event_processed(self, play, actor, msg) -> None:
+                pass  # pragma: no cover
+
+        first, second = Received(), ReceivedAndProcessed()
+        hooks = PlayHooks(first, PlayInstrumentation(), second)
+        assert hooks.event_received == [first.event_received, second.event_received]
+        assert hooks.event_processed == [second.event_processed]
+        assert hooks.event_processing_failed == []
+        assert hooks.play_started == []
+
+    def test_play_accepts_several_instrumentations(self):
+        class Instrumentation(PlayInstrumentation):
+            def play_starting(self, play) -> None:
+                pass  # pragma: no cover
+
+        first, second = Instrumentation(), Instrumentation()
+        play = Play(create_bus(InMemoryPubSub()), [], [first, second])
+        assert play.hooks.play_starting == [first.play_starting, second.play_starting]
+        assert Play(create_bus(InMemoryPubSub())).hooks.play_starting == []
+
+
+@pytest.mark.asyncio
+class TestPlayInstrumentations:
+    async def test_play_calls_all_instrumentations(self, bus: EventBus):
+        EVENT = create_event("test-event", "test.event", schema=int)
+        calls: t.List[t.Tuple[str, int]] = []
+        processed = asyncio.Event()
+
+        class Instrumentation(PlayInstrumentation):
+            def __init__(self, name: str) -> None:
+                self.name = name
+
+            def event_processed(self, play, actor, msg) -> None:
+                calls.append((self.name, msg.data))
+                processed.set()
+
+        async def handler(msg: t.Any) -> None:
+            pass
+
+        subscriber = Subscriber(
+            flow=create_flow("test-subscriber", event=EVENT), handler=handler
+        )
+        instrumentations = [Instrumentation("metrics"), Instrumentation("tracing")]
+        with fail_after(5):
+            async with Play(bus, [subscriber], instrumentations) as play:
+                await asyncio.sleep(0)
+                await bus.publish(EVENT, 1)
+                await processed.wait()
+                play.cancel()
+        assert calls == [("metrics", 1), ("tracing", 1)]
@@ -0,0 +1,186 @@
+import asyncio
+import time
+import typing as t
+from pathlib import Path
+
+import pytest
+
+from synopsys import create_bus, create_event, create_flow
+from synopsys.adapters import InMemoryPubSub
+from synopsys.adapters.timers import FileTimerStore
+from synopsys.aio import PublishScheduler, TimingWheel, run_virtual
+from synopsys.aio.timers import ScheduledMessage
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestTimingWheel:
+    def test_timers_fire_in_deadline_order(self):
+        clock = FakeClock()
+        wheel: TimingWheel[str] = TimingWheel(tick=0.1, size=8, clock=clock)
+        wheel.schedule(0.35, "second")
+        wheel.schedule(0.3, "first")
+        wheel.schedule(0.5, "third")
+        assert len(wheel) == 3
+        clock.now = 0.3
+        assert wheel.advance() == []
+        clock.now = 0.4
+        assert [timer.item for timer in wheel.advance()] == ["first", "second"]
+        clock.now = 1.0
+        assert [timer.item for timer in wheel.advance()] == ["third"]
+        assert len(wheel) == 0
+
+    def test_timers_never_fire_early(self):
+        clock = FakeClock()
+        wheel: TimingWheel[int] = TimingWheel(tick=0.1, size=4, clock=clock)
+        timers = [wheel.schedule(idx * 0.07, idx) for idx in range(100)]
+        fired: t.List[int] = []
+        for step in range(1, 80):
+            clock.now = step * 0.1
+            for timer in wheel.advance():
+                # Ignore floating point rounding errors
+                assert timer.deadline <= clock.now + 1e-9
+                assert not timer.pending
+                fired.append(timer.item)
+        assert fired == list(range(100))
+        assert not any(timer.pending for timer in timers)
+
+    def test_timers_beyond_wheel_size(self):
+        clock = FakeClock()
+        wheel: TimingWheel[str] = TimingWheel(tick=0.1, size=4, clock=clock)
+        wheel.schedule(1.05, "late")
+        wheel.schedule(0.1, "early")
+        clock.now = 0.5
+        assert [timer.item for timer in wheel.advance()] == ["early"]
+        clock.now = 1.0
+        assert wheel.advance() == []
+        # Wheel goes round several times at once
+        clock.now = 10.0
+        assert [timer.item for timer in wheel.advance()] == ["late"]
+
+    def test_cancel(self):
+        clock = FakeClock()
+        wheel: TimingWheel[str] = TimingWheel(tick=0.1, size=4, clock=clock)
+        timer = wheel.schedule(0.2, "cancelled")
+        assert timer.cancel()
+        assert not timer.cancel()
+        assert len(wheel) == 0
+        clock.now = 1.0
+        assert wheel.advance() == []
+
+    def test_invalid_arguments(self):
+        with pytest.raises(ValueError, match="tick"):
+            TimingWheel(tick=0)
+        with pytest.raises(ValueError, match="size"):
+            TimingWheel(size=0)
+
+    def test_run_uses_event_loop_clock(self):
+        # Wheel is created before virtual event loop is started
+        wheel: TimingWheel[float] = TimingWheel(tick=0.1)
+        fired: t.List[t.Tuple[float, float]] = []
+
+        async def main() -> None:
+            loop = asyncio.get_running_loop()
+            done = asyncio.Event()
+
+            async def callback(timers: t.List[t.Any]) -> None:
+                fired.extend((timer.item, loop.time()) for timer in timers)
+                if len(fired) == 3:
+                    done.set()
+
+            task = asyncio.create_task(wheel.run(callback))
+            for delay in (30, 0.05, 3600):
+                wheel.schedule(delay, loop.time() + delay)
+            await asyncio.wait_for(done.wait(), 7200)
+            task.cancel()
+
+        run_virtual(main, start=100)
+        assert [deadline for deadline, _ in fired] == [100.05, 130, 3700]
+        for deadline, fired_at in fired:
+            assert deadline <= fired_at < deadline + 0.2
+
+
+@pytest.mark.asyncio
+class TestEventBusPublishLater:
+    async def test_publish_later(self):
+        bus = create_bus(InMemoryPubSub(), scheduler=PublishScheduler(tick=0.005))
+        event = create_event("test-event", "test", schema=int)
+        waiter = await bus.wait_in_background(event)
+        await bus.publish_later(event, 1, delay=0.02)
+        cancelled = await bus.publish_later(event, 2, delay=0.01)
+        assert cancelled.cancel()
+        msg = await waiter.wait(timeout=1)
+        assert msg.data == 1
+        await bus.disconnect()
+
+    async def test_publish_at_batch(self):
+        bus = create_bus(InMemoryPubSub(), scheduler=PublishScheduler(tick=0.005))
+        event = create_event(
+            "test-event", "test.{idx}", schema=int, scope_schema=t.Dict[str, str]
+        )
+        received: t.List[int] = []
+        done = asyncio.Event()
+
+        async def consume() -> None:
+            async with bus.subscribe(event) as subscription:
+                async for msg in subscription:
+                    received.append(msg.data)
+                    if len(received) == 100:
+                        done.set()
+
+        task = asyncio.create_task(consume())
+        await asyncio.sleep(0.01)
+        at = time.time() + 0.02
+        for idx in range(100):
+            await bus.publish_at(event, idx, at=at, scope={"idx": str(idx)})
+        await asyncio.wait_for(done.wait(), 1)
+        assert received == list(range(100))
+        task.cancel()
+        await bus.disconnect()
+
+    async def test_publish_later_event_not_declared_in_flow(self):
+        event = create_event("test-event", "test", schema=int)
+        bus = create_bus(InMemoryPubSub()).bind_flow(create_flow("test-flow"))
+        with pytest.raises(ValueError, match="not declared in flow"):
+            await bus.publish_later(event, 1, delay=1)
+
+    async def test_pending_messages_are_restored(self, tmp_path: Path):
+        path = tmp_path / "timers.jsonl"
+        event = create_event("test-event", "test", schema=int)
+        pubsub = InMemoryPubSub()
+        bus = create_bus(pubsub, scheduler=PublishScheduler(store=FileTimerStore(path)))
+        await bus.publish_later(event, 1, delay=0.05)
+        timer = await bus.publish_later(event, 2, delay=0.05)
+        timer.cancel()
+        # Stop scheduler before messages are published
+        await bus.scheduler.stop()
+        # A new scheduler restores pending messages
+        scheduler = PublishScheduler(tick=0.005, store=FileTimerStore(path))
+        assert len(scheduler) == 1
+        restored = create_bus(pubsub, scheduler=scheduler)
+        waiter = await restored.wait_in_background(event)
+        await restored.connect()
+        msg = await waiter.wait(timeout=1)
+        assert msg.data == 1
+        await restored.disconnect()
+        assert FileTimerStore(path).load() == []
+
+
+def test_file_timer_store(tmp_path: Path):
+    store = FileTimerStore(tmp_path / "timers.jsonl")
+    assert store.load() == []
+    first = ScheduledMessage("a", b"\x00\x01", {"key": "value"}, deadline=1.0)
+    second = ScheduledMessage("b", b"", {}, deadline=2.0)
+    store.add(first)
+    store.add(second)
+    store.remove(first.id)
+    assert store.load() == [second]
+    # File was compacted
+    assert len(store.path.read_text().splitlines()) == 1
+    store.close()
@@ -0,0 +1,201 @@
+import asyncio
+import json
+import threading
+import typing as t
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from pathlib import Path
+
+import pytest
+from anyio import fail_after
+
+from synopsys import (
+    Play,
+    Service,
+    SimpleReply,
+    Subscriber,
+    create_bus,
+    create_event,
+    create_flow,
+)
+from synopsys.adapters import InMemoryPubSub
+from synopsys.adapters.tracing import FileSpanExporter, OTLPHTTPSpanExporter
+from synopsys.aio.tracing import Span, Tracer, get_current_span, parse_traceparent
+from synopsys.interfaces.tracing import SpanExporter
+
+
+class MemoryExporter(SpanExporter):
+    def __init__(self) -> None:
+        self.spans: t.List[Span] = []
+
+    def export(self, spans: t.List[Span]) -> None:
+        self.spans.extend(spans)
+
+
+def _by_name(spans: t.List[Span]) -> t.Dict[str, Span]:
+    return {span.name: span for span in spans}
+
+
+class TestTracer:
+    def test_parse_traceparent(self):
+        assert parse_traceparent(
+            "00-0af7651916cd43dd8448eb211c80319c-b7ad6b7169203331-01"
+        ) == ("0af7651916cd43dd8448eb211c80319c", "b7ad6b7169203331")
+        assert parse_traceparent(None) is None
+        assert parse_traceparent("00-invalid-b7ad6b7169203331-01") is None
+        assert parse_traceparent("00-" + "z" * 32 + "-b7ad6b7169203331-01") is None
+
+    def test_nested_spans(self):
+        exporter = MemoryExporter()
+        tracer = Tracer(exporter, max_batch=2)
+        with tracer.start_span("parent", activate=True) as parent:
+            assert get_current_span() is parent
+            with pytest.raises(ValueError):
+                with tracer.start_span("child") as child:
+                    raise ValueError("boom")
+        assert get_current_span() is None
+        # Buffer was full, so spans were exported
+        assert exporter.spans == [child, parent]
+        assert child.trace_id == parent.trace_id
+        assert child.parent_id == parent.span_id
+        assert parent.parent_id is None
+        assert child.error == "ValueError('boom')"
+        assert child.duration is not None and child.duration >= 0
+
+    def test_invalid_span_kind(self):
+        tracer = Tracer(MemoryExporter())
+        with pytest.raises(ValueError, match="Invalid span kind"):
+            with tracer.start_span("test", "unknown"):
+                pass  # pragma: no cover
+
+    def test_file_exporter(self, tmp_path: Path):
+        path = tmp_path / "spans.jsonl"
+        tracer = Tracer(FileSpanExporter(path))
+        with tracer.start_span("first"):
+            pass
+        with tracer.start_span("second"):
+            pass
+        tracer.shutdown()
+        lines = [json.loads(line) for line in path.read_text().splitlines()]
+        assert [line["name"] for line in lines] == ["first", "second"]
+
+    def test_otlp_exporter(self):
+        received: t.List[t.Dict[str, t.Any]] = []
+
+        class Collector(BaseHTTPRequestHandler):
+            def do_POST(self) -> None:
+                length = int(self.headers["Content-Length"])
+                received.append(json.loads(self.rfile.read(length)))
+                self.send_response(200)
+                self.end_headers()
+
+            def log_message(self, *args: t.Any) -> None:
+                pass
+
+        server = HTTPServer(("127.0.0.1", 0), Collector)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            exporter = OTLPHTTPSpanExporter(
+                f"http://127.0.0.1:{server.server_port}/v1/traces",
+                service_name="test-service",
+            )
+            tracer = Tracer(exporter)
+            with tracer.start_span(
+                "parent", "producer", attributes={"count": 1}, activate=True
+            ):
+                with tracer.start_span("child"):
+                    pass
+            tracer.shutdown()
+        finally:
+            server.shutdown()
+        [request] = received
+        [resource_spans] = request["resourceSpans"]
+        assert resource_spans["resource"]["attributes"] == [
+            {"key": "service.name", "value": {"stringValue": "test-service"}}
+        ]
+        child, parent = resource_spans["scopeSpans"][0]["spans"]
+        assert parent["kind"] == 4
+        assert parent["attributes"] == [{"key": "count", "value": {"intValue": "1"}}]
+        assert child["parentSpanId"] == parent["spanId"]
+        assert "parentSpanId" not in parent
+
+
+@pytest.mark.asyncio
+class TestEventBusTracing:
+    async def test_request_reply_trace(self):
+        exporter = MemoryExporter()
+        bus = create_bus(InMemoryPubSub(), tracer=Tracer(exporter))
+        COMMAND = create_event(
+            "test-command", "test.command", schema=int, reply_schema=int
+        )
+
+        async def handler(msg: t.Any) -> SimpleReply[int]:
+            return SimpleReply(data=msg.data * 2)
+
+        service = Service(
+            flow=create_flow("test-service", command=COMMAND), handler=handler
+        )
+        with fail_after(5):
+            async with Play(bus, [service]) as play:
+                await asyncio.sleep(0)
+                reply = await bus.request(COMMAND, 2)
+                play.cancel()
+        assert reply.data == 4
+        spans = _by_name(exporter.spans)
+        request = spans["test-command request"]
+        receive = spans["test-command receive"]
+        handle = spans["test-service handle"]
+        reply_span = spans["test-command reply"]
+        assert request.kind == "client"
+        assert request.parent_id is None
+        assert receive.parent_id == request.span_id
+        assert handle.parent_id == receive.span_id
+        assert reply_span.parent_id == handle.span_id
+        assert {span.trace_id for span in exporter.spans} == {request.trace_id}
+
+    async def test_chained_flows_share_trace(self):
+        exporter = MemoryExporter()
+        bus = create_bus(InMemoryPubSub(), tracer=Tracer(exporter))
+        FIRST = create_event("first-event", "first", schema=int)
+        SECOND = create_event("second-event", "second", schema=int)
+        done = asyncio.Event()
+
+        async def forward(msg: t.Any) -> None:
+            await bus.publish(SECOND, msg.data)
+
+        async def receive(msg: t.Any) -> None:
+            done.set()
+
+        actors = [
+            Subscriber(
+                flow=create_flow("forward", event=FIRST, emits=[SECOND]),
+                handler=forward,
+            ),
+            Subscriber(flow=create_flow("receive", event=SECOND), handler=receive),
+        ]
+        with fail_after(5):
+            async with Play(bus, actors) as play:
+                await asyncio.sleep(0)
+                await bus.publish(FIRST, 1)
+                await done.wait()
+                play.cancel()
+        spans = _by_name(exporter.spans)
+        assert (
+            spans["second-event publish"].parent_id == spans["forward handle"].span_id
+        )
+        assert (
+            spans["receive handle"].parent_id == spans["second-event receive"].span_id
+        )
+        assert {span.trace_id for span in exporter.spans} == {
+            spans["first-event publish"].trace_id
+        }
+
+    async def test_untraced_consumer_ignores_trace_context(self):
+        traced = create_bus(InMemoryPubSub(), tracer=Tracer(MemoryExporter()))
+        untraced = create_bus(traced.pubsub)
+        event = create_event("test-event", "test", schema=int)
+        waiter = await untraced.wait_in_background(event)
+        await traced.publish(event, 1)
+        msg = await waiter.wait(timeout=0.1)
+        assert msg.metadata is None
+        assert parse_traceparent(msg.traceparent) is not None
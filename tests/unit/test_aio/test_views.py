@@ -0,0 +1,184 @@
+import asyncio
+import typing as t
+from contextlib import asynccontextmanager
+
+import pytest
+import pytest_asyncio
+
+from synopsys import EventBus, Message, create_bus, create_event
+from synopsys.adapters import InMemoryPubSub
+from synopsys.aio import MaterializedView
+from synopsys.interfaces.pubsub import PubSubMsg
+
+EVENT = create_event(
+    "test-state", "test.{device}", schema=int, scope_schema=t.Dict[str, str]
+)
+
+SNAPSHOT = create_event(
+    "test-snapshot", "test-snapshot", schema=type(None), reply_schema=t.Dict[str, int]
+)
+
+
+def create_message(device: str, data: int) -> Message[t.Any, int, t.Any, t.Any, t.Any]:
+    return Message(
+        subject=f"test.{device}",
+        scope={"device": device},
+        data=data,
+        metadata=None,
+        event=EVENT,
+    )
+
+
+def device_key(msg: Message[t.Any, t.Any, t.Any, t.Any, t.Any]) -> str:
+    return msg.scope["device"]  # type: ignore[no-any-return]
+
+
+async def wait_for(condition: t.Callable[[], bool]) -> None:
+    while not condition():
+        await asyncio.sleep(0.001)
+
+
+class TestMaterializedView:
+    def test_invalid_arguments(self):
+        with pytest.raises(ValueError, match="max_size"):
+            MaterializedView(device_key, max_size=0)
+        with pytest.raises(ValueError, match="ttl"):
+            MaterializedView(device_key, ttl=0)
+
+    def test_latest_data_is_kept(self):
+        view: MaterializedView[str, int] = MaterializedView(device_key)
+        view.update(create_message("a", 1))
+        view.update(create_message("b", 2))
+        view.update(create_message("a", 3))
+        assert len(view) == 2
+        assert view["a"] == 3
+        assert view.get("b") == 2
+        assert view.get("c") is None
+        assert view.get("c", 0) == 0
+        assert "c" not in view
+        with pytest.raises(KeyError):
+            view["c"]
+        assert (view.hits, view.misses) == (2, 4)
+
+    def test_least_recently_used_entries_are_evicted(self):
+        view: MaterializedView[str, int] = MaterializedView(device_key, max_size=2)
+        view.update(create_message("a", 1))
+        view.update(create_message("b", 2))
+        # Reading an entry makes it the most recently used
+        assert view["a"] == 1
+        view.update(create_message("c", 3))
+        assert view.keys() == ["a", "c"]
+        view.discard("a")
+        view.discard("unknown")
+        assert view.keys() == ["c"]
+
+    def test_entries_expire(self):
+        now = 0.0
+        view: MaterializedView[str, int] = MaterializedView(
+            device_key, ttl=10, clock=lambda: now
+        )
+        view.update(create_message("a", 1))
+        now = 5
+        view.update(create_message("b", 2))
+        now = 9
+        assert view.get("a") == 1
+        now = 10
+        assert view.get("a") is None
+        assert len(view) == 1
+        assert view.keys() == ["b"]
+        now = 15
+        assert view.keys() == []
+
+    def test_snapshot_does_not_overwrite_messages(self):
+        view: MaterializedView[str, int] = MaterializedView(device_key)
+        view.update(create_message("a", 2))
+        view.load([("a", 1), ("b", 1)])
+        assert view["a"] == 2
+        assert view["b"] == 1
+
+
+@pytest_asyncio.fixture
+async def bus() -> t.AsyncIterator[EventBus]:
+    """A fixture which returns an in-memory event bus."""
+    bus = create_bus(InMemoryPubSub())
+    try:
+        yield bus
+    finally:
+        await bus.disconnect()
+
+
+class FailingPubSub(InMemoryPubSub):
+    """An in-memory pubsub whose subscriptions fail after the first message."""
+
+    @asynccontextmanager
+    async def subscribe(
+        self, subject: str, queue: t.Optional[str] = None, reply: bool = False
+    ) -> t.AsyncIterator[t.AsyncIterator[PubSubMsg]]:
+        async with super().subscribe(subject, queue, reply) as subscription:
+
+            async def iterator() -> t.AsyncIterator[PubSubMsg]:
+                async for msg in subscription:
+                    yield msg
+                    raise ConnectionError("connection lost")
+
+            yield iterator()
+
+
+async def _respond_snapshot(bus: EventBus, state: t.Dict[str, int]) -> None:
+    async with bus.subscribe(SNAPSHOT) as subscription:
+        async for msg in subscription:
+            await bus.reply(msg, data=state)
+
+
+@pytest.mark.asyncio
+class TestEventBusMaterialize:
+    async def test_view_is_updated_by_messages(self, bus: EventBus):
+        async with bus.materialize(EVENT, key=device_key) as view:
+            await bus.publish(EVENT, 1, scope={"device": "a"})
+            await bus.publish(EVENT, 2, scope={"device": "b"})
+            await bus.publish(EVENT, 3, scope={"device": "a"})
+            await wait_for(lambda: view.get("a") == 3)
+            assert view["b"] == 2
+        # View is not updated anymore once context is exited
+        await bus.publish(EVENT, 4, scope={"device": "a"})
+        assert view["a"] == 3
+        assert bus.pubsub.observers == []  # type: ignore[attr-defined]
+
+    async def test_view_is_bootstrapped_using_snapshot(self, bus: EventBus):
+        responder = asyncio.create_task(_respond_snapshot(bus, {"a": 1, "b": 2}))
+        await asyncio.sleep(0)
+        try:
+            async with bus.materialize(
+                EVENT, key=device_key, snapshot=SNAPSHOT, snapshot_timeout=1
+            ) as view:
+                assert view.keys() == ["a", "b"]
+                await bus.publish(EVENT, 3, scope={"device": "b"})
+                await wait_for(lambda: view.get("b") == 3)
+        finally:
+            responder.cancel()
+
+    async def test_snapshot_items(self, bus: EventBus):
+        responder = asyncio.create_task(_respond_snapshot(bus, {"a": 1}))
+        await asyncio.sleep(0)
+        try:
+            async with bus.materialize(
+                EVENT,
+                key=device_key,
+                snapshot=SNAPSHOT,
+                snapshot_items=lambda reply: [
+                    (f"device-{key}", value) for key, value in reply.data.items()
+                ],
+            ) as view:
+                assert view.keys() == ["device-a"]
+        finally:
+            responder.cancel()
+
+    async def test_failure_is_raised_on_exit(self):
+        bus = create_bus(FailingPubSub())
+        with pytest.raises(ConnectionError, match="connection lost"):
+            async with bus.materialize(EVENT, key=device_key) as view:
+                await bus.publish(EVENT, 1, scope={"device": "a"})
+                await asyncio.wait_for(wait_for(lambda: view.error is not None), 1)
+                assert view["a"] == 1
+        assert isinstance(view.error, ConnectionError)
+        await bus.disconnect()
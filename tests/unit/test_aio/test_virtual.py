@@ -0,0 +1,174 @@
+import asyncio
+import random
+import time
+import typing as t
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from anyio import fail_after
+
+from synopsys import (
+    EventBus,
+    Play,
+    Producer,
+    Subscriber,
+    create_bus,
+    create_event,
+    create_flow,
+)
+from synopsys.adapters import InMemoryPubSub
+from synopsys.aio import PublishScheduler, VirtualClockLoop, run_virtual
+
+
+def test_sleep_advances_virtual_clock():
+    async def main() -> t.Tuple[float, float]:
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        await asyncio.sleep(3600)
+        return start, loop.time()
+
+    started = time.monotonic()
+    start, end = run_virtual(main, start=100)
+    assert start == 100
+    assert end == pytest.approx(3700)
+    assert time.monotonic() - started < 1
+
+
+def test_waiter_timeout():
+    event = create_event("test-event", "test", schema=int)
+
+    async def main() -> float:
+        bus = create_bus(InMemoryPubSub())
+        waiter = await bus.wait_in_background(event)
+        with pytest.raises(asyncio.TimeoutError):
+            await waiter.wait(timeout=5)
+        await bus.disconnect()
+        return asyncio.get_running_loop().time()
+
+    started = time.monotonic()
+    assert run_virtual(main) == pytest.approx(5)
+    assert time.monotonic() - started < 1
+
+
+def test_request_waiter_timeout():
+    command = create_event("test-command", "test", schema=int, reply_schema=int)
+
+    async def main() -> None:
+        bus = create_bus(InMemoryPubSub())
+        waiter = await bus.request_in_background(command, 1)
+        with pytest.raises(asyncio.TimeoutError):
+            await waiter.wait(timeout=30)
+        await bus.disconnect()
+
+    started = time.monotonic()
+    run_virtual(main)
+    assert time.monotonic() - started < 1
+
+
+def test_executor_threads_take_real_time():
+    async def main() -> float:
+        loop = asyncio.get_running_loop()
+        # Timeout must not expire while thread is running
+        await asyncio.wait_for(loop.run_in_executor(None, time.sleep, 0.05), 5)
+        return loop.time()
+
+    elapsed = run_virtual(main)
+    assert 0.05 <= elapsed < 5
+
+
+def test_executor_threads_take_real_time_with_custom_executor():
+    async def main() -> float:
+        loop = asyncio.get_running_loop()
+        with ThreadPoolExecutor(1) as executor:
+            await asyncio.wait_for(loop.run_in_executor(executor, time.sleep, 0.05), 5)
+        return loop.time()
+
+    elapsed = run_virtual(main)
+    assert 0.05 <= elapsed < 5
+
+
+def test_wrapped_executor_futures_do_not_take_real_time():
+    async def main() -> None:
+        with ThreadPoolExecutor(1) as executor:
+            future = asyncio.wrap_future(executor.submit(time.sleep, 0.05))
+            # Loop does not know about the thread, timeout expires instantly
+            with pytest.raises(asyncio.TimeoutError):
+                await asyncio.wait_for(asyncio.shield(future), 5)
+            await future
+
+    run_virtual(main)
+
+
+def test_scheduler_using_virtual_clock():
+    event = create_event("test-event", "test", schema=int)
+
+    async def main() -> float:
+        loop = asyncio.get_running_loop()
+        bus = create_bus(InMemoryPubSub(), scheduler=PublishScheduler(clock=loop.time))
+        waiter = await bus.wait_in_background(event)
+        await bus.publish_later(event, 1, delay=60)
+        msg = await waiter.wait(timeout=120)
+        assert msg.data == 1
+        await bus.disconnect()
+        return loop.time()
+
+    started = time.monotonic()
+    assert 60 <= run_virtual(main) < 61
+    assert time.monotonic() - started < 1
+
+
+def test_play_deliveries_are_replayed_in_same_order():
+    EVENT = create_event(
+        "test-event", "test.{producer}", schema=int, scope_schema=t.Dict[str, str]
+    )
+
+    def run() -> t.List[t.Tuple[str, int]]:
+        received: t.List[t.Tuple[str, int]] = []
+
+        def producer(name: str) -> Producer:
+            async def task(bus: EventBus) -> None:
+                for idx in range(5):
+                    await asyncio.sleep(random.random())
+                    await bus.publish(EVENT, idx, scope={"producer": name})
+
+            return Producer(
+                flow=create_flow(f"test-producer-{name}", emits=[EVENT]),
+                task_factory=task,
+            )
+
+        async def handle(msg: t.Any) -> None:
+            received.append((msg.scope["producer"], msg.data))
+
+        async def main() -> None:
+            with fail_after(60):
+                async with Play(
+                    create_bus(InMemoryPubSub()),
+                    [
+                        Subscriber(
+                            flow=create_flow("test-subscriber", event=EVENT),
+                            handler=handle,
+                        ),
+                        producer("a"),
+                        producer("b"),
+                        producer("c"),
+                    ],
+                ) as play:
+                    while len(received) < 15:
+                        await asyncio.sleep(0.1)
+                    play.cancel()
+
+        run_virtual(main, seed=42)
+        return received
+
+    first = run()
+    assert len(first) == 15
+    assert run() == first
+
+
+def test_virtual_clock_loop():
+    loop = VirtualClockLoop(start=10)
+    try:
+        loop.run_until_complete(asyncio.sleep(5))
+        assert loop.time() == pytest.approx(15)
+    finally:
+        loop.close()
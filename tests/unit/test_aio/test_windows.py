@@ -0,0 +1,120 @@
+import asyncio
+import typing as t
+
+import pytest
+
+from synopsys import create_bus, create_event, create_flow
+from synopsys.adapters import InMemoryPubSub
+from synopsys.aio import WindowAggregator
+from synopsys.aio.windows import collect, count, sum_by
+from synopsys.entities import Message
+
+EVENT = create_event(
+    "test-event", "test.{device}", schema=int, scope_schema=t.Dict[str, str]
+)
+
+
+def create_message(device: str, data: int) -> Message[t.Any, int, t.Any, t.Any, t.Any]:
+    return Message(
+        subject=f"test.{device}",
+        scope={"device": device},
+        data=data,
+        metadata=None,
+        event=EVENT,
+    )
+
+
+class TestWindowAggregator:
+    def test_tumbling_windows(self):
+        aggregator: WindowAggregator[t.Any, float] = WindowAggregator(
+            size=10, reducer=sum_by(lambda msg: msg.data)
+        )
+        aggregator.add(create_message("a", 1), now=1)
+        aggregator.add(create_message("b", 2), now=2)
+        aggregator.add(create_message("a", 3), now=9)
+        aggregator.add(create_message("a", 4), now=10)
+        assert len(aggregator) == 3
+        assert aggregator.advance(now=9.5) == []
+        closed = aggregator.advance(now=10)
+        assert [(w.scope, w.start, w.end, w.value, w.count) for w in closed] == [
+            ({"device": "a"}, 0, 10, 4, 2),
+            ({"device": "b"}, 0, 10, 2, 1),
+        ]
+        assert [w.value for w in aggregator.flush()] == [4]
+        assert len(aggregator) == 0
+
+    def test_sliding_windows(self):
+        aggregator: WindowAggregator[t.Any, int] = WindowAggregator(
+            size=10, step=5, reducer=count()
+        )
+        aggregator.add(create_message("a", 1), now=7)
+        aggregator.add(create_message("a", 1), now=12)
+        assert aggregator.next_deadline() == 10
+        closed = aggregator.advance(now=20)
+        assert [(w.start, w.end, w.value) for w in closed] == [
+            (0, 10, 1),
+            (5, 15, 2),
+            (10, 20, 1),
+        ]
+
+    def test_max_windows(self):
+        aggregator: WindowAggregator[t.Any, t.List[int]] = WindowAggregator(
+            size=10, reducer=collect(lambda msg: msg.data), max_windows=2
+        )
+        assert aggregator.add(create_message("a", 1), now=1) == []
+        assert aggregator.add(create_message("b", 2), now=1) == []
+        # Oldest window is closed early
+        closed = aggregator.add(create_message("c", 3), now=1)
+        assert [(w.subject, w.value) for w in closed] == [("test.a", [1])]
+        assert len(aggregator) == 2
+
+    def test_invalid_arguments(self):
+        with pytest.raises(ValueError, match="size"):
+            WindowAggregator(size=0, reducer=count())
+        with pytest.raises(ValueError, match="step"):
+            WindowAggregator(size=1, step=2, reducer=count())
+        with pytest.raises(ValueError, match="max_windows"):
+            WindowAggregator(size=1, reducer=count(), max_windows=0)
+
+
+@pytest.mark.asyncio
+class TestEventBusWindows:
+    async def test_subscribe_window(self):
+        bus = create_bus(InMemoryPubSub())
+        async with bus.subscribe_window(EVENT, size=0.05, reducer=count()) as windows:
+            for idx in range(3):
+                await bus.publish(EVENT, idx, scope={"device": "a"})
+            await bus.publish(EVENT, 3, scope={"device": "b"})
+            # Messages may be split across two windows
+            counts: t.Dict[str, int] = {}
+            while sum(counts.values()) < 4:
+                batch = await asyncio.wait_for(windows.__anext__(), 1)
+                for window in batch:
+                    assert window.end - window.start == pytest.approx(0.05)
+                    device = window.scope["device"]
+                    counts[device] = counts.get(device, 0) + window.value
+            assert counts == {"a": 3, "b": 1}
+
+    async def test_aggregate(self):
+        total = create_event(
+            "test-total", "total.{device}", schema=float, scope_schema=t.Dict[str, str]
+        )
+        bus = create_bus(InMemoryPubSub())
+        waiter = await bus.wait_in_background(total)
+        task = asyncio.create_task(
+            bus.aggregate(EVENT, total, size=0.05, reducer=sum_by(lambda m: m.data))
+        )
+        await asyncio.sleep(0.01)
+        await bus.publish(EVENT, 2, scope={"device": "a"})
+        msg = await waiter.wait(timeout=1)
+        assert msg.scope == {"device": "a"}
+        assert msg.data == 2
+        task.cancel()
+        await bus.disconnect()
+
+    async def test_aggregate_event_not_declared_in_flow(self):
+        bus = create_bus(InMemoryPubSub()).bind_flow(
+            create_flow("test-flow", event=EVENT)
+        )
+        with pytest.raises(ValueError, match="not declared in flow"):
+            await bus.aggregate(EVENT, EVENT, size=1, reducer=count())
@@ -3,6 +3,7 @@ from re import escape
 
 import pytest
 
+from synopsys.adapters import PseudoJSONCodec
 from synopsys.api import Event, create_event
 
 
@@ -45,3 +46,43 @@ def test_extract_subject_placeholders_missing():
         match=escape("Invalid subject. Missing placeholder: location (index: 2)"),
     ):
         other_event.extract_scope("other.device")
+
+
+def test_extract_scope_is_cached():
+    event = create_event("test", "test.{device}", scope_schema=t.Dict[str, str])
+    first = event.extract_scope("test.XXX")
+    second = event.extract_scope("test.XXX")
+    assert first == second == {"device": "XXX"}
+    # Cached scopes are copied so that they can be mutated safely
+    assert first is not second
+    assert [subject for subject, _ in event._scope_cache] == ["test.XXX"]
+
+
+def test_extract_scope_cache_is_bounded():
+    event = create_event("test", "test.{device}", scope_schema=t.Dict[str, str])
+    event.scope_cache_size = 2
+    event.extract_scope("test.1")
+    event.extract_scope("test.2")
+    # Move first subject to the end
+    event.extract_scope("test.1")
+    event.extract_scope("test.3")
+    assert [subject for subject, _ in event._scope_cache] == ["test.1", "test.3"]
+
+
+def test_extract_scope_cache_is_kept_across_codecs():
+    first, second = PseudoJSONCodec(), PseudoJSONCodec()
+    event = create_event("test", "test.{device}", scope_schema=t.Dict[str, str])
+    event.extract_scope("test.1", first)
+    event.extract_scope("test.1", second)
+    event.extract_scope("test.1", first)
+    assert list(event._scope_cache) == [("test.1", second), ("test.1", first)]
+
+
+def test_extract_scope_codec_subclass_decodes_headers():
+    class Codec(PseudoJSONCodec):
+        def decode_headers(self, raw: t.Dict[str, str], schema: t.Any) -> t.Any:
+            return {key: value.upper() for key, value in raw.items()}
+
+    event = create_event("test", "test.{device}", scope_schema=t.Dict[str, str])
+    assert event.extract_scope("test.abc", Codec()) == {"device": "ABC"}
+    assert event.extract_scope("test.abc") == {"device": "abc"}
@@ -0,0 +1,57 @@
+import typing as t
+
+import pytest
+
+from synopsys import create_event
+from synopsys.entities import EventRegistry, SubjectSyntax
+
+CREATED = create_event(
+    "order-created", "orders.{id}.created", scope_schema=t.Dict[str, str]
+)
+SHIPPED = create_event(
+    "order-shipped", "orders.{id}.shipped", scope_schema=t.Dict[str, str]
+)
+ORDERS = create_event("orders", "orders.>")
+USER = create_event("user", "users.{id}", scope_schema=t.Dict[str, str])
+
+
+def test_registry_match():
+    registry: EventRegistry[str] = EventRegistry()
+    for event in (ORDERS, CREATED, SHIPPED, USER):
+        registry.register(event, event.name)
+    assert len(registry) == 4
+    assert registry.match("orders.1.created") == ["orders", "order-created"]
+    assert registry.match("orders.1.shipped") == ["orders", "order-shipped"]
+    assert registry.match("orders.1") == ["orders"]
+    assert registry.match("orders") == []
+    assert registry.match("users.1") == ["user"]
+    assert registry.match("users.1.created") == []
+    assert registry.match("unknown") == []
+
+
+def test_registry_match_literal_and_wildcard_tokens():
+    registry: EventRegistry[str] = EventRegistry()
+    registry.register(create_event("any", "orders.*.created"), "any")
+    registry.register(create_event("first", "orders.1.created"), "first")
+    registry.register(create_event("first-again", "orders.1.created"), "again")
+    assert registry.match("orders.1.created") == ["any", "first", "again"]
+    assert registry.match("orders.2.created") == ["any"]
+
+
+def test_registry_subscriptions():
+    registry: EventRegistry[str] = EventRegistry()
+    assert registry.get_subscriptions() == []
+    for event in (CREATED, SHIPPED, USER):
+        registry.register(event, event.name)
+    assert registry.get_subscriptions() == ["orders.*.*", "users.*"]
+    registry.register(ORDERS, "orders")
+    assert registry.get_subscriptions() == ["orders.>", "users.*"]
+    # Subjects starting with a wildcard would overlap other subscriptions
+    registry.register(create_event("any", "*.{id}", scope_schema=t.Dict[str, str]), "")
+    assert registry.get_subscriptions() == ["*.>"]
+
+
+def test_registry_invalid_syntax():
+    registry: EventRegistry[str] = EventRegistry(SubjectSyntax(match_sep="/"))
+    with pytest.raises(ValueError, match="syntax"):
+        registry.register(CREATED, "created")
@@ -0,0 +1,66 @@
+import typing as t
+from dataclasses import dataclass
+
+import pytest
+from pydantic import BaseModel, parse_obj_as
+
+from synopsys.operations.scopes import compile_scope_parser
+
+
+class DeviceScope(t.TypedDict):
+    device: str
+    index: int
+
+
+@dataclass
+class DeviceDataclass:
+    device: str
+    ratio: float
+
+
+class DeviceModel(BaseModel):
+    device: str
+
+
+class NestedScope(t.TypedDict):
+    device: t.List[str]
+
+
+@pytest.mark.parametrize(
+    "schema,values",
+    [
+        (dict, {"device": "XXX"}),
+        (t.Dict[str, str], {"device": "XXX"}),
+        (DeviceScope, {"device": "XXX", "index": "12"}),
+        (DeviceDataclass, {"device": "XXX", "ratio": "0.5"}),
+    ],
+)
+def test_compiled_parser_is_equivalent_to_pydantic(
+    schema: t.Any, values: t.Dict[str, str]
+):
+    parser = compile_scope_parser(schema, values)
+    assert parser is not None
+    assert parser(values) == parse_obj_as(schema, values)
+
+
+@pytest.mark.parametrize(
+    "schema,placeholders",
+    [
+        (None, []),
+        (DeviceModel, ["device"]),
+        (NestedScope, ["device"]),
+        # Placeholders do not match scope fields (filter events)
+        (DeviceScope, ["device"]),
+    ],
+)
+def test_parser_not_compiled_for_unsupported_schema(
+    schema: t.Any, placeholders: t.List[str]
+):
+    assert compile_scope_parser(schema, placeholders) is None
+
+
+def test_compiled_parser_invalid_value():
+    parser = compile_scope_parser(DeviceScope, ["device", "index"])
+    assert parser is not None
+    with pytest.raises(ValueError):
+        parser({"device": "XXX", "index": "notanint"})
@@ -0,0 +1,45 @@
+import time
+
+from synopsys.operations.delivery import (
+    MESSAGE_ID_HEADER,
+    PUBLISHED_AT_HEADER,
+    TRACEPARENT_HEADER,
+    get_delivery_delay,
+    split_headers,
+    stamp_headers,
+)
+
+
+def test_stamp_and_split_headers():
+    before = time.time()
+    headers = stamp_headers({"key": "value"})
+    assert set(headers) == {"key", PUBLISHED_AT_HEADER, MESSAGE_ID_HEADER}
+    original = headers.copy()
+    stripped, published_at, message_id, traceparent = split_headers(headers)
+    assert stripped == {"key": "value"}
+    assert published_at is not None and before <= published_at <= time.time()
+    assert message_id == original[MESSAGE_ID_HEADER]
+    assert traceparent is None
+    # Original headers are not modified
+    assert headers == original
+
+
+def test_split_headers_without_delivery_headers():
+    headers = {"key": "value"}
+    assert split_headers(headers) == (headers, None, None, None)
+
+
+def test_split_headers_invalid_publish_time():
+    headers = {PUBLISHED_AT_HEADER: "invalid"}
+    assert split_headers(headers) == ({}, None, None, None)
+
+
+def test_delivery_delay_is_never_negative():
+    assert get_delivery_delay(time.time() + 60) == 0
+    assert get_delivery_delay(time.time() - 60) >= 60
+
+
+def test_split_headers_trace_context():
+    traceparent = "00-0af7651916cd43dd8448eb211c80319c-b7ad6b7169203331-01"
+    headers = {TRACEPARENT_HEADER: traceparent, "tracestate": "x=1", "key": "value"}
+    assert split_headers(headers) == ({"key": "value"}, None, None, traceparent)
@@ -0,0 +1,32 @@
+import pytest
+
+from synopsys.defaults import DEFAULT_SYNTAX
+from synopsys.operations.subjects import match_subject, merge_filter_subjects
+
+
+@pytest.mark.parametrize(
+    "filters,expected",
+    [
+        (["a.b.c"], "a.b.c"),
+        (["a.b.c", "a.b.c"], "a.b.c"),
+        (["a.1.c", "a.2.c"], "a.*.c"),
+        (["a.1.c", "a.2.d"], "a.*.*"),
+        (["a.*.c", "a.2.c"], "a.*.c"),
+        (["a.b", "a.b.c"], "a.>"),
+        (["a", "a.b"], ">"),
+        (["a.b.>", "a.c.d"], "a.*.>"),
+        (["a.>", "a.b.c"], "a.>"),
+        ([">", "a.b"], ">"),
+    ],
+)
+def test_merge_filter_subjects(filters, expected):
+    merged = merge_filter_subjects(filters, DEFAULT_SYNTAX)
+    assert merged == expected
+    for filter in filters:
+        subject = filter.replace("*", "x").replace(">", "x.y")
+        assert match_subject(merged, subject, DEFAULT_SYNTAX)
+
+
+def test_merge_filter_subjects_error_no_filter():
+    with pytest.raises(ValueError, match="At least one filter subject"):
+        merge_filter_subjects([], DEFAULT_SYNTAX)
@@ -0,0 +1,64 @@
+import pytest
+
+from synopsys.operations.partitions import HashRing, partition_key
+
+KEYS = [f"device-{idx}" for idx in range(2000)]
+
+
+def test_empty_ring():
+    assert HashRing().get("key") is None
+
+
+def test_invalid_replicas():
+    with pytest.raises(ValueError, match="replicas"):
+        HashRing(replicas=0)
+
+
+def test_ring_is_consistent_across_instances():
+    first = HashRing(["a", "b", "c"])
+    second = HashRing(["c", "a", "b"])
+    assert [first.get(key) for key in KEYS] == [second.get(key) for key in KEYS]
+
+
+def test_keys_are_spread_across_members():
+    ring = HashRing(["a", "b", "c", "d"])
+    owners = [ring.get(key) for key in KEYS]
+    for member in "abcd":
+        # Each member owns a quarter of keys, give or take
+        assert 300 < owners.count(member) < 700
+
+
+def test_add_member_only_moves_keys_to_new_member():
+    ring = HashRing(["a", "b", "c"])
+    before = {key: ring.get(key) for key in KEYS}
+    assert ring.add("d")
+    assert not ring.add("d")
+    after = {key: ring.get(key) for key in KEYS}
+    moved = [key for key in KEYS if before[key] != after[key]]
+    assert moved
+    assert all(after[key] == "d" for key in moved)
+    assert len(moved) < len(KEYS) / 2
+
+
+def test_remove_member_only_moves_keys_of_removed_member():
+    ring = HashRing(["a", "b", "c", "d"])
+    before = {key: ring.get(key) for key in KEYS}
+    assert ring.remove("b")
+    assert not ring.remove("b")
+    assert ring.members == {"a", "c", "d"}
+    assert "b" not in ring
+    assert len(ring) == 3
+    after = {key: ring.get(key) for key in KEYS}
+    for key in KEYS:
+        if before[key] != "b":
+            assert after[key] == before[key]
+        else:
+            assert after[key] != "b"
+
+
+def test_partition_key():
+    values = {"region": "eu", "device": "a"}
+    assert partition_key(values, ["device"]) == "a"
+    assert partition_key(values, ["region", "device"]) != partition_key(
+        {"region": "e", "device": "ua"}, ["region", "device"]
+    )
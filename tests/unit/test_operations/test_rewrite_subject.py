@@ -0,0 +1,34 @@
+import pytest
+
+from synopsys.defaults import DEFAULT_SYNTAX
+from synopsys.operations.subjects import compile_subject_rewrite
+
+
+@pytest.mark.parametrize(
+    "filter,target,subject,expected",
+    [
+        ("a.b", "c.d", "a.b", "c.d"),
+        ("a.*", "b.*", "a.1", "b.1"),
+        ("a.*.*", "b.*.c.*", "a.1.2", "b.1.c.2"),
+        ("a.>", "b.>", "a.1.2.3", "b.1.2.3"),
+        ("a.*.>", "*.b.>", "a.1.2.3", "1.b.2.3"),
+        (">", "legacy.>", "a.b", "legacy.a.b"),
+    ],
+)
+def test_rewrite_subject(filter, target, subject, expected):
+    rewrite = compile_subject_rewrite(filter, target, DEFAULT_SYNTAX)
+    assert rewrite(subject) == expected
+
+
+@pytest.mark.parametrize(
+    "filter,target",
+    [
+        ("a.*", "b"),
+        ("a.>", "b.*"),
+        ("a.*", "b.>"),
+        ("a.>.b", "c.>"),
+    ],
+)
+def test_rewrite_subject_error_wildcards_mismatch(filter, target):
+    with pytest.raises(ValueError):
+        compile_subject_rewrite(filter, target, DEFAULT_SYNTAX)
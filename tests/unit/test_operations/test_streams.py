@@ -0,0 +1,24 @@
+import typing as t
+
+import pytest
+
+from synopsys.operations.streams import iterate_until
+
+
+async def numbers() -> t.AsyncIterator[int]:
+    for idx in range(5):
+        yield idx
+
+
+@pytest.mark.asyncio
+async def test_iterate_until_stopped():
+    received: t.List[int] = []
+    async for item in iterate_until(numbers(), lambda: len(received) == 3):
+        received.append(item)
+    assert received == [0, 1, 2]
+
+
+@pytest.mark.asyncio
+async def test_iterate_until_source_is_exhausted():
+    received = [item async for item in iterate_until(numbers(), lambda: False)]
+    assert received == [0, 1, 2, 3, 4]
@@ -0,0 +1,136 @@
+import os
+import threading
+import time
+import typing as t
+from pathlib import Path
+
+import pytest
+
+from synopsys import Play, create_bus
+from synopsys.adapters import InMemoryPubSub
+from synopsys.runner import Supervisor, load_play, load_pubsub
+
+PLAY = Play(create_bus(InMemoryPubSub()))
+
+
+def create_play() -> Play:
+    return PLAY
+
+
+class _Callable:
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def __call__(self) -> Play:
+        self.calls += 1
+        return PLAY
+
+
+CALLABLE = _Callable()
+
+
+def _run_in_thread(supervisor: Supervisor) -> threading.Thread:
+    thread = threading.Thread(
+        target=supervisor.run, kwargs={"install_signal_handlers": False}
+    )
+    thread.start()
+    return thread
+
+
+def _wait_for(condition: t.Callable[[], bool], timeout: float = 5) -> None:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise TimeoutError()
+        time.sleep(0.01)
+
+
+class TestSupervisor:
+    def test_supervisor_invalid_workers(self):
+        with pytest.raises(ValueError, match="workers must be greater than 0"):
+            Supervisor(lambda: None, workers=0)
+
+    def test_supervisor_restarts_crashed_workers(self, tmp_path: Path):
+        def crash() -> None:
+            tmp_path.joinpath(str(os.getpid())).touch()
+            os._exit(1)
+
+        supervisor = Supervisor(crash, workers=2, restart_delay=0)
+        thread = _run_in_thread(supervisor)
+        try:
+            _wait_for(lambda: len(list(tmp_path.iterdir())) >= 4)
+        finally:
+            supervisor.stop()
+            thread.join(5)
+        assert not thread.is_alive()
+        assert supervisor.restarts >= 2
+
+    def test_supervisor_does_not_restart_workers_exiting_cleanly(self, tmp_path: Path):
+        def done() -> None:
+            tmp_path.joinpath(str(os.getpid())).touch()
+
+        supervisor = Supervisor(done, workers=2, restart_delay=0)
+        thread = _run_in_thread(supervisor)
+        # Supervisor returns once all workers exited
+        thread.join(5)
+        assert not thread.is_alive()
+        assert supervisor.restarts == 0
+        assert all(process.exitcode == 0 for process in supervisor.processes)
+        assert len(list(tmp_path.iterdir())) == 2
+
+    def test_supervisor_stops_workers_gracefully(self, tmp_path: Path):
+        def serve() -> None:
+            try:
+                while True:
+                    time.sleep(0.01)
+            except KeyboardInterrupt:
+                tmp_path.joinpath(str(os.getpid())).touch()
+                raise
+
+        supervisor = Supervisor(serve, workers=3)
+        thread = _run_in_thread(supervisor)
+        _wait_for(lambda: len(supervisor.processes) == 3)
+        supervisor.stop()
+        thread.join(5)
+        assert not thread.is_alive()
+        assert supervisor.restarts == 0
+        assert all(process.exitcode == 0 for process in supervisor.processes)
+        assert sorted(path.name for path in tmp_path.iterdir()) == sorted(
+            str(process.pid) for process in supervisor.processes
+        )
+
+
+class TestLoadPlay:
+    def test_load_play_instance(self):
+        assert load_play(f"{__name__}:PLAY") is PLAY
+
+    def test_load_play_factory(self):
+        assert load_play(f"{__name__}:create_play") is PLAY
+
+    def test_load_play_invalid_path(self):
+        with pytest.raises(ValueError, match="Invalid play path"):
+            load_play(__name__)
+
+    def test_load_play_invalid_type(self):
+        with pytest.raises(TypeError, match="Expected a play"):
+            load_play(f"{__name__}:pytest")
+
+    def test_load_play_does_not_call_instances(self):
+        with pytest.raises(TypeError, match="Expected a play"):
+            load_play(f"{__name__}:CALLABLE")
+        assert CALLABLE.calls == 0
+
+
+class TestLoadPubSub:
+    def test_load_pubsub_class(self):
+        assert isinstance(
+            load_pubsub("synopsys.adapters:InMemoryPubSub"), InMemoryPubSub
+        )
+
+    def test_load_pubsub_invalid_path(self):
+        with pytest.raises(ValueError, match="Invalid pubsub path"):
+            load_pubsub("synopsys.adapters")
+
+    def test_load_pubsub_invalid_type(self):
+        with pytest.raises(TypeError, match="Expected a pubsub backend"):
+            load_pubsub(f"{__name__}:PLAY")